@@ -0,0 +1,58 @@
+"""base schema from before migrations
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Tables created by later revisions
+LATER_TABLES = {
+    "stats_rollups", "stats_rollups_monthly", "import_jobs", "import_row_errors", "project_documents",
+    "report_photos", "firm_scorecards", "accountability_edges", "disbursements", "project_ledgers",
+    "spend_monthly", "project_points", "map_clusters", "upvote_flushes",
+}
+# Columns added to base tables by later revisions
+LATER_COLUMNS = {
+    "road_segments": {"geometry_lod0", "geometry_lod1", "geometry_lod2"},
+    "public_reports": {"photo_id", "submission_id", "location", "road_segment_id"},
+}
+
+
+def base_tables() -> sa.MetaData:
+    """
+    The tables that predate Alembic, as the models declared them then.
+
+    Unlike later revisions this reads the models: the base schema was only
+    ever defined there. Everything added since is left to the revision that
+    added it, so a fresh database runs the same DDL as an upgraded one.
+    """
+    from app.database import Base
+    from app import models  # noqa: F401  (register models on Base)
+
+    metadata = sa.MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name in LATER_TABLES:
+            continue
+        later = LATER_COLUMNS.get(table.name)
+        if later is None:
+            table.to_metadata(metadata)
+        else:
+            sa.Table(table.name, metadata, *(column._copy() for column in table.columns if column.name not in later))
+    return metadata
+
+
+def upgrade() -> None:
+    # Databases created before Alembic already have these
+    base_tables().create_all(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    base_tables().drop_all(bind=op.get_bind(), checkfirst=True)
@@ -0,0 +1,40 @@
+"""add level-of-detail geometries to road_segments
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+revision = '0001'
+down_revision = '0000'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.utils.geojson.LOD_LEVELS tolerances at the time of this migration
+LOD_TOLERANCES = (0.01, 0.001, 0.0001)
+
+
+def upgrade() -> None:
+    for level, tolerance in enumerate(LOD_TOLERANCES):
+        column = f"geometry_lod{level}"
+        op.add_column(
+            "road_segments",
+            sa.Column(column, Geometry(geometry_type="LINESTRING", srid=4326, spatial_index=False), nullable=True)
+        )
+        op.execute(
+            f"UPDATE road_segments SET {column} = ST_SimplifyPreserveTopology(geometry, {tolerance})"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_road_segments_{column} ON road_segments USING GIST ({column})"
+        )
+
+
+def downgrade() -> None:
+    for level in reversed(range(len(LOD_TOLERANCES))):
+        column = f"geometry_lod{level}"
+        op.execute(f"DROP INDEX IF EXISTS idx_road_segments_{column}")
+        op.drop_column("road_segments", column)
@@ -0,0 +1,52 @@
+"""add full-text and trigram search indexes to projects
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+SEARCH_SOURCE = (
+    "coalesce(name, '') || ' ' || coalesce(district, '') || ' ' || "
+    "coalesce(city, '') || ' ' || coalesce(state, '') || ' ' || coalesce(pincode, '')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute(
+        "ALTER TABLE projects ADD COLUMN search_document tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {SEARCH_SOURCE})) STORED"
+    )
+    op.execute(
+        "ALTER TABLE projects ADD COLUMN search_text text "
+        f"GENERATED ALWAYS AS (lower({SEARCH_SOURCE})) STORED"
+    )
+
+    op.execute("CREATE INDEX ix_projects_search_document ON projects USING GIN (search_document)")
+    op.execute("CREATE INDEX ix_projects_search_text_trgm ON projects USING GIN (search_text gin_trgm_ops)")
+
+    # Location filters are substring ILIKE matches, which trigram indexes can serve
+    for column in ("name", "district", "city", "state"):
+        op.execute(f"CREATE INDEX ix_projects_{column}_trgm ON projects USING GIN ({column} gin_trgm_ops)")
+
+    op.execute("CREATE INDEX ix_projects_pincode_prefix ON projects (pincode text_pattern_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_projects_status ON projects (status)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_projects_road_type ON projects (road_type)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_projects_pincode_prefix")
+    for column in ("name", "district", "city", "state"):
+        op.execute(f"DROP INDEX IF EXISTS ix_projects_{column}_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_projects_search_text_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_projects_search_document")
+    op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS search_text")
+    op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS search_document")
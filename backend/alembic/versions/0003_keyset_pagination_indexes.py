@@ -0,0 +1,36 @@
+"""add (created_at, id) indexes for keyset pagination
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# (index name, table, leading filter column or None)
+INDEXES = [
+    ("ix_projects_created_id", "projects", None),
+    ("ix_projects_status_created_id", "projects", "status"),
+    ("ix_projects_road_type_created_id", "projects", "road_type"),
+    ("ix_firms_created_id", "firms", None),
+    ("ix_officials_created_id", "officials", None),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so listing traffic is not blocked on large tables
+    with op.get_context().autocommit_block():
+        for name, table, prefix in INDEXES:
+            columns = f"{prefix}, created_at DESC, id DESC" if prefix else "created_at DESC, id DESC"
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,83 @@
+"""add stats rollup tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stats_rollups",
+        sa.Column("state", sa.String(100), nullable=False, server_default=""),
+        sa.Column("district", sa.String(100), nullable=False, server_default=""),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("road_type", sa.String(30), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sanctioned_cost", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("total_disbursed", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("state", "district", "status", "road_type"),
+    )
+    op.create_table(
+        "stats_rollups_monthly",
+        sa.Column("state", sa.String(100), nullable=False, server_default=""),
+        sa.Column("district", sa.String(100), nullable=False, server_default=""),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("road_type", sa.String(30), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sanctioned_cost", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("state", "district", "month", "status", "road_type"),
+    )
+
+    # Incremental refreshes rebuild one district at a time from projects
+    op.execute("CREATE INDEX IF NOT EXISTS ix_projects_state_district ON projects (state, district)")
+
+    # Initial fill; afterwards kept current by app.core.stats_rollup
+    op.execute("""
+        INSERT INTO stats_rollups (state, district, status, road_type, project_count, sanctioned_cost, total_disbursed, report_count)
+        SELECT p.state, p.district, lower(p.status::text), lower(p.road_type::text), count(*),
+               coalesce(sum(p.sanctioned_cost), 0), coalesce(sum(p.total_disbursed), 0),
+               coalesce(sum((SELECT count(*) FROM public_reports r WHERE r.project_id = p.id)), 0)
+        FROM projects p
+        GROUP BY p.state, p.district, lower(p.status::text), lower(p.road_type::text)
+    """)
+    op.execute("""
+        INSERT INTO stats_rollups_monthly (state, district, month, status, road_type, project_count, sanctioned_cost)
+        SELECT p.state, p.district, date_trunc('month', coalesce(p.approval_date, p.created_at))::date,
+               lower(p.status::text), lower(p.road_type::text), count(*), coalesce(sum(p.sanctioned_cost), 0)
+        FROM projects p
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+    for table, dimensions, measures in (
+        ("stats_rollups", "status, road_type", "sum(project_count), sum(sanctioned_cost), sum(total_disbursed), sum(report_count)"),
+        ("stats_rollups_monthly", "month, status, road_type", "sum(project_count), sum(sanctioned_cost)"),
+    ):
+        columns = "project_count, sanctioned_cost" + (", total_disbursed, report_count" if table == "stats_rollups" else "")
+        op.execute(f"""
+            INSERT INTO {table} (state, district, {dimensions}, {columns})
+            SELECT state, '', {dimensions}, {measures} FROM {table}
+            WHERE district <> '' GROUP BY state, {dimensions}
+        """)
+        op.execute(f"""
+            INSERT INTO {table} (state, district, {dimensions}, {columns})
+            SELECT '', '', {dimensions}, {measures} FROM {table}
+            WHERE state <> '' AND district = '' GROUP BY {dimensions}
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("stats_rollups_monthly")
+    op.drop_table("stats_rollups")
+    op.execute("DROP INDEX IF EXISTS ix_projects_state_district")
@@ -0,0 +1,63 @@
+"""add bulk import job tracking
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("file_type", sa.String(10), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "RUNNING", "COMPLETED", "FAILED", name="importjobstatus"),
+            nullable=False,
+            server_default="PENDING",
+        ),
+        sa.Column("total_rows", sa.Integer()),
+        sa.Column("processed_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("inserted_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("created_by_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_import_jobs_id", "import_jobs", ["id"])
+
+    op.create_table(
+        "import_row_errors",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("import_jobs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON(), nullable=False),
+        sa.Column("raw", sa.JSON()),
+    )
+    # Error reports are paged by row number within a job
+    op.create_index("ix_import_row_errors_job_id", "import_row_errors", ["job_id", "row_number"])
+
+    # Imports upsert on these keys and replace segments per project
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_projects_slug ON projects (slug)")
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_firms_registration_id ON firms (registration_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_road_segments_project_id ON road_segments (project_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_road_segments_project_id")
+    op.drop_table("import_row_errors")
+    op.drop_table("import_jobs")
+    op.execute("DROP TYPE IF EXISTS importjobstatus")
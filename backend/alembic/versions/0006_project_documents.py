@@ -0,0 +1,45 @@
+"""add object storage project documents
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_documents",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("document_type", sa.String(50)),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("content_type", sa.String(100), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("storage_key", sa.String(500), nullable=False, unique=True),
+        sa.Column("upload_id", sa.String(1024)),
+        sa.Column(
+            "status",
+            sa.Enum("UPLOADING", "AVAILABLE", name="documentstatus"),
+            nullable=False,
+            server_default="UPLOADING",
+        ),
+        sa.Column("uploaded_by_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("uploaded_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_project_documents_id", "project_documents", ["id"])
+    op.create_index("ix_project_documents_project_id", "project_documents", ["project_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("project_documents")
+    op.execute("DROP TYPE IF EXISTS documentstatus")
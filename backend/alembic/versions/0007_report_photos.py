@@ -0,0 +1,56 @@
+"""add deduplicated report photos with derivatives
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_photos",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False, unique=True),
+        sa.Column(
+            "status",
+            sa.Enum("PROCESSING", "READY", "FAILED", name="photostatus"),
+            nullable=False,
+            server_default="PROCESSING",
+        ),
+        sa.Column("original_key", sa.String(500)),
+        sa.Column("thumbnail_key", sa.String(500)),
+        sa.Column("medium_key", sa.String(500)),
+        sa.Column("width", sa.Integer()),
+        sa.Column("height", sa.Integer()),
+        sa.Column("error", sa.String(500)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("processed_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_report_photos_id", "report_photos", ["id"])
+
+    op.add_column("public_reports", sa.Column("photo_id", sa.Integer(), sa.ForeignKey("report_photos.id")))
+    op.create_index("ix_public_reports_photo_id", "public_reports", ["photo_id"])
+
+    # Report listings are keyset-paginated newest first, optionally per project
+    op.execute("CREATE INDEX IF NOT EXISTS ix_public_reports_created ON public_reports (created_at DESC, id DESC)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_public_reports_project_created "
+        "ON public_reports (project_id, created_at DESC, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_public_reports_project_created")
+    op.execute("DROP INDEX IF EXISTS ix_public_reports_created")
+    op.drop_index("ix_public_reports_photo_id", "public_reports")
+    op.drop_column("public_reports", "photo_id")
+    op.drop_table("report_photos")
+    op.execute("DROP TYPE IF EXISTS photostatus")
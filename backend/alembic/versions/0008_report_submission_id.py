@@ -0,0 +1,25 @@
+"""add submission id for batched report inserts
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("public_reports", sa.Column("submission_id", sa.String(36)))
+    # Conflict target that makes re-flushing a queued batch a no-op
+    op.create_unique_constraint("uq_public_reports_submission_id", "public_reports", ["submission_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_public_reports_submission_id", "public_reports")
+    op.drop_column("public_reports", "submission_id")
@@ -0,0 +1,39 @@
+"""add report location and spatial index for nearest-road lookup
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # KNN (<->) ordering walks this index; GeoAlchemy2 creates it for new
+    # databases, older ones may predate it
+    op.execute("CREATE INDEX IF NOT EXISTS idx_road_segments_geometry ON road_segments USING gist (geometry)")
+
+    op.add_column(
+        "public_reports",
+        sa.Column("location", Geometry(geometry_type="POINT", srid=4326, spatial_index=False))
+    )
+    op.add_column(
+        "public_reports",
+        sa.Column("road_segment_id", sa.Integer(), sa.ForeignKey("road_segments.id", ondelete="SET NULL"))
+    )
+    op.create_index("idx_public_reports_location", "public_reports", ["location"], postgresql_using="gist")
+    op.create_index("ix_public_reports_road_segment_id", "public_reports", ["road_segment_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_public_reports_road_segment_id", table_name="public_reports")
+    op.drop_index("idx_public_reports_location", table_name="public_reports")
+    op.drop_column("public_reports", "road_segment_id")
+    op.drop_column("public_reports", "location")
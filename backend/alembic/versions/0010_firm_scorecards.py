@@ -0,0 +1,99 @@
+"""add firm scorecards
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+# Frozen SQL copy of app.core.scorecards._scorecard_source, since migrations
+# don't import app code; tests/test_scorecard_migration.py checks they agree
+SCORECARD_SELECT = """
+    SELECT f.id, s.project_count, s.active, s.completed, s.delayed, s.late, s.avg_delay_days,
+           s.on_time::float / nullif(s.due, 0), s.sanctioned, s.disbursed, s.overrun_projects,
+           s.overrun_amount, s.overrun_amount::float / nullif(s.sanctioned, 0)::float,
+           s.reports, s.open_reports, s.reports::float / nullif(s.project_count, 0)
+    FROM firms f
+    CROSS JOIN LATERAL (
+        SELECT count(p.id) AS project_count,
+               count(*) FILTER (WHERE p.status = 'ACTIVE') AS active,
+               count(*) FILTER (WHERE p.status = 'COMPLETED') AS completed,
+               count(*) FILTER (WHERE p.status = 'DELAYED') AS delayed,
+               count(*) FILTER (WHERE p.late) AS late,
+               avg(coalesce(p.actual_end_date, current_date) - p.proposed_end_date) FILTER (WHERE p.late) AS avg_delay_days,
+               count(*) FILTER (WHERE p.due AND NOT p.late) AS on_time,
+               count(*) FILTER (WHERE p.due) AS due,
+               coalesce(sum(p.sanctioned_cost), 0) AS sanctioned,
+               coalesce(sum(p.total_disbursed), 0) AS disbursed,
+               count(*) FILTER (WHERE p.total_disbursed > p.sanctioned_cost) AS overrun_projects,
+               coalesce(sum(greatest(p.total_disbursed - p.sanctioned_cost, 0)), 0) AS overrun_amount,
+               coalesce(sum(p.reports), 0) AS reports,
+               coalesce(sum(p.open_reports), 0) AS open_reports
+        FROM (
+            SELECT p.*,
+                   coalesce(p.status <> 'CANCELLED' AND (
+                       p.actual_end_date > p.proposed_end_date
+                       OR (p.actual_end_date IS NULL AND p.status NOT IN ('COMPLETED', 'CANCELLED')
+                           AND p.proposed_end_date < current_date)
+                   ), false) AS late,
+                   coalesce(p.status <> 'CANCELLED' AND p.proposed_end_date <= current_date, false) AS due,
+                   (SELECT count(*) FROM public_reports r WHERE r.project_id = p.id) AS reports,
+                   (SELECT count(*) FROM public_reports r WHERE r.project_id = p.id
+                      AND r.status NOT IN ('RESOLVED', 'REJECTED')) AS open_reports
+            FROM projects p
+            WHERE p.contractor_id = f.id
+        ) p
+    ) s
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "firm_scorecards",
+        sa.Column("firm_id", sa.Integer(), sa.ForeignKey("firms.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("active_projects", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_projects", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("delayed_projects", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("late_projects", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("avg_delay_days", sa.Float()),
+        sa.Column("on_time_rate", sa.Float()),
+        sa.Column("sanctioned_cost", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("total_disbursed", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("overrun_projects", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("overrun_amount", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("overrun_rate", sa.Float()),
+        sa.Column("report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("open_report_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reports_per_project", sa.Float()),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # Leaderboard orderings
+    for column in ("project_count", "on_time_rate", "overrun_rate", "reports_per_project"):
+        op.create_index(f"ix_firm_scorecards_{column}", "firm_scorecards", [column])
+
+    # Scorecard refreshes aggregate one firm's contracts
+    op.execute("CREATE INDEX IF NOT EXISTS ix_projects_contractor_id ON projects (contractor_id)")
+
+    # Initial fill; afterwards kept current by app.core.scorecards
+    op.execute(f"""
+        INSERT INTO firm_scorecards (
+            firm_id, project_count, active_projects, completed_projects, delayed_projects,
+            late_projects, avg_delay_days, on_time_rate, sanctioned_cost, total_disbursed,
+            overrun_projects, overrun_amount, overrun_rate, report_count, open_report_count,
+            reports_per_project
+        )
+        {SCORECARD_SELECT}
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("firm_scorecards")
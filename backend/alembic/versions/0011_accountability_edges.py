@@ -0,0 +1,64 @@
+"""add accountability graph edges
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+ROLE_COLUMNS = {
+    "minister": "minister_id",
+    "official": "approving_official_id",
+    "contractor": "contractor_id",
+    "maintenance_firm": "maintenance_firm_id",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "accountability_edges",
+        sa.Column("source_kind", sa.String(20), nullable=False),
+        sa.Column("source_id", sa.Integer(), nullable=False),
+        sa.Column("target_kind", sa.String(20), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sanctioned_cost", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("source_kind", "source_id", "target_kind", "target_id"),
+    )
+    op.execute("""
+        CREATE INDEX ix_accountability_edges_neighbours
+        ON accountability_edges (source_kind, source_id, target_kind, project_count DESC, target_id)
+    """)
+
+    # Newest projects per party, read a bounded number at a time
+    for column in ROLE_COLUMNS.values():
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_projects_{column}_id ON projects ({column}, id)")
+
+    # Initial fill; afterwards kept current by app.core.accountability
+    roles = " UNION ALL ".join(
+        f"SELECT id AS project_id, '{kind}' AS kind, {column} AS node_id, coalesce(sanctioned_cost, 0) AS cost "
+        f"FROM projects WHERE {column} IS NOT NULL"
+        for kind, column in ROLE_COLUMNS.items()
+    )
+    op.execute(f"""
+        WITH roles AS ({roles})
+        INSERT INTO accountability_edges (source_kind, source_id, target_kind, target_id, project_count, sanctioned_cost)
+        SELECT a.kind, a.node_id, b.kind, b.node_id, count(*), sum(a.cost)
+        FROM roles a
+        JOIN roles b ON b.project_id = a.project_id AND b.kind <> a.kind
+        GROUP BY a.kind, a.node_id, b.kind, b.node_id
+    """)
+
+
+def downgrade() -> None:
+    for column in ROLE_COLUMNS.values():
+        op.execute(f"DROP INDEX IF EXISTS ix_projects_{column}_id")
+    op.drop_table("accountability_edges")
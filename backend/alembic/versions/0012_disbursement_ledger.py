@@ -0,0 +1,152 @@
+"""partition disbursements into an append-only ledger with running totals
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# Indian fiscal years, April to March (see app.core.ledger)
+FISCAL_YEAR_START_MONTH = 4
+
+
+def fiscal_year(day: date) -> int:
+    return day.year if day.month >= FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    legacy = sa.inspect(conn).has_table("disbursements")
+    if legacy:
+        op.execute("ALTER TABLE disbursements RENAME TO disbursements_legacy")
+        op.execute("ALTER INDEX IF EXISTS disbursements_pkey RENAME TO disbursements_legacy_pkey")
+
+    op.execute("CREATE SEQUENCE disbursements_ledger_id_seq")
+    op.execute("""
+        CREATE TABLE disbursements (
+            id bigint NOT NULL DEFAULT nextval('disbursements_ledger_id_seq'),
+            disbursement_date date NOT NULL,
+            project_id integer NOT NULL REFERENCES projects (id),
+            amount numeric(18, 2) NOT NULL,
+            reference varchar(100),
+            description text,
+            reverses_id bigint,
+            recorded_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, disbursement_date)
+        ) PARTITION BY RANGE (disbursement_date)
+    """)
+    op.execute("ALTER SEQUENCE disbursements_ledger_id_seq OWNED BY disbursements.id")
+    op.execute("CREATE INDEX ix_disbursements_project_date ON disbursements (project_id, disbursement_date)")
+
+    # One partition per fiscal year with entries, through next year; anything else lands in the default
+    first = current = fiscal_year(date.today())
+    if legacy:
+        oldest = conn.execute(sa.text("SELECT min(disbursement_date) FROM disbursements_legacy")).scalar()
+        if oldest:
+            first = min(first, fiscal_year(oldest))
+    for year in range(first, current + 2):
+        op.execute(
+            f"CREATE TABLE disbursements_fy{year} PARTITION OF disbursements "
+            f"FOR VALUES FROM ('{year}-{FISCAL_YEAR_START_MONTH:02d}-01') "
+            f"TO ('{year + 1}-{FISCAL_YEAR_START_MONTH:02d}-01')"
+        )
+    op.execute("CREATE TABLE disbursements_default PARTITION OF disbursements DEFAULT")
+
+    # Corrections are new entries; the application refuses changes too, this covers raw SQL
+    op.execute("""
+        CREATE FUNCTION disbursements_append_only() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'disbursements is append-only; record a reversing entry instead';
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER disbursements_append_only BEFORE UPDATE OR DELETE ON disbursements
+        FOR EACH ROW EXECUTE FUNCTION disbursements_append_only()
+    """)
+
+    if legacy:
+        op.execute("""
+            INSERT INTO disbursements (id, disbursement_date, project_id, amount)
+            SELECT id, disbursement_date, project_id, amount
+            FROM disbursements_legacy
+            WHERE disbursement_date IS NOT NULL AND amount IS NOT NULL
+            ORDER BY id
+        """)
+        op.execute("SELECT setval('disbursements_ledger_id_seq', coalesce((SELECT max(id) FROM disbursements), 0) + 1, false)")
+        op.execute("DROP TABLE disbursements_legacy")
+
+    op.create_table(
+        "project_ledgers",
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_disbursed", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_entry_id", sa.BigInteger()),
+        sa.Column("last_amount", sa.Numeric(18, 2)),
+        sa.Column("last_disbursement_date", sa.Date()),
+        sa.Column("last_recorded_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "spend_monthly",
+        sa.Column("scope", sa.String(20), nullable=False),
+        sa.Column("scope_key", sa.String(220), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("scope", "scope_key", "month"),
+    )
+
+    # Initial fill; afterwards kept current by app.core.ledger
+    op.execute("""
+        INSERT INTO project_ledgers (project_id, total_disbursed, entry_count, last_entry_id, last_amount,
+                                     last_disbursement_date, last_recorded_at)
+        SELECT t.project_id, t.total, t.entries, l.id, l.amount, l.disbursement_date, l.recorded_at
+        FROM (SELECT project_id, sum(amount) AS total, count(*) AS entries FROM disbursements GROUP BY project_id) t
+        JOIN (SELECT DISTINCT ON (project_id) project_id, id, amount, disbursement_date, recorded_at
+              FROM disbursements ORDER BY project_id, id DESC) l ON l.project_id = t.project_id
+    """)
+    op.execute("""
+        INSERT INTO spend_monthly (scope, scope_key, month, amount, entry_count)
+        SELECT 'project', project_id::text, date_trunc('month', disbursement_date)::date, sum(amount), count(*)
+        FROM disbursements
+        GROUP BY project_id, date_trunc('month', disbursement_date)
+    """)
+    for scope, key, filled in (
+        ("district", "p.state || '|' || p.district", "p.state IS NOT NULL AND p.district IS NOT NULL"),
+        ("contractor", "p.contractor_id::text", "p.contractor_id IS NOT NULL"),
+    ):
+        op.execute(f"""
+            INSERT INTO spend_monthly (scope, scope_key, month, amount, entry_count)
+            SELECT '{scope}', {key}, m.month, sum(m.amount), sum(m.entry_count)
+            FROM projects p
+            JOIN spend_monthly m ON m.scope = 'project' AND m.scope_key = p.id::text
+            WHERE {filled}
+            GROUP BY {key}, m.month
+        """)
+    op.execute("""
+        UPDATE projects p SET total_disbursed = l.total_disbursed
+        FROM project_ledgers l
+        WHERE l.project_id = p.id AND p.total_disbursed IS DISTINCT FROM l.total_disbursed
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("spend_monthly")
+    op.drop_table("project_ledgers")
+    op.execute("""
+        CREATE TABLE disbursements_flat AS
+        SELECT id::integer AS id, project_id, amount, disbursement_date FROM disbursements
+    """)
+    op.execute("DROP TABLE disbursements")
+    op.execute("DROP FUNCTION IF EXISTS disbursements_append_only()")
+    op.execute("ALTER TABLE disbursements_flat RENAME TO disbursements")
+    op.execute("ALTER TABLE disbursements ADD PRIMARY KEY (id)")
+    op.execute("ALTER TABLE disbursements ADD FOREIGN KEY (project_id) REFERENCES projects (id)")
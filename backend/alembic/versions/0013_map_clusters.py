@@ -0,0 +1,80 @@
+"""add project points and precomputed map clusters
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+# Must match app.core.clusters
+MERCATOR_HALF = 20037508.342789244
+CELL_ZOOM_OFFSET = 2
+PRECOMPUTED_MAX_ZOOM = 8
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_points",
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+        sa.Column("point", Geometry(geometry_type="POINT", srid=4326, spatial_index=False), nullable=False),
+        sa.Column("x", sa.Float(), nullable=False),
+        sa.Column("y", sa.Float(), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("road_type", sa.String(30), nullable=False),
+        sa.Column("sanctioned_cost", sa.Numeric(18, 2), nullable=False, server_default="0"),
+    )
+    op.create_index("idx_project_points_point", "project_points", ["point"], postgresql_using="gist")
+
+    op.create_table(
+        "map_clusters",
+        sa.Column("zoom", sa.SmallInteger(), nullable=False),
+        sa.Column("cell_x", sa.Integer(), nullable=False),
+        sa.Column("cell_y", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("road_type", sa.String(30), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sanctioned_cost", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("sum_lon", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("sum_lat", sa.Float(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("zoom", "cell_x", "cell_y", "status", "road_type"),
+    )
+    op.execute("CREATE INDEX ix_map_clusters_empty ON map_clusters (zoom) WHERE project_count <= 0")
+
+    # Initial fill; afterwards kept current by app.core.clusters
+    op.execute("""
+        INSERT INTO project_points (project_id, point, x, y, status, road_type, sanctioned_cost)
+        SELECT l.project_id, l.point, ST_X(ST_Transform(l.point, 3857)), ST_Y(ST_Transform(l.point, 3857)),
+               l.status, l.road_type, l.sanctioned_cost
+        FROM (
+            SELECT p.id AS project_id, ST_PointOnSurface(ST_Collect(s.geometry)) AS point,
+                   lower(p.status::text) AS status, lower(p.road_type::text) AS road_type,
+                   coalesce(p.sanctioned_cost, 0) AS sanctioned_cost
+            FROM projects p
+            JOIN road_segments s ON s.project_id = p.id
+            GROUP BY p.id
+        ) l
+    """)
+    op.execute(f"""
+        INSERT INTO map_clusters (zoom, cell_x, cell_y, status, road_type, project_count, sanctioned_cost, sum_lon, sum_lat)
+        SELECT z.zoom,
+               floor((pp.x + {MERCATOR_HALF}) * power(2, z.zoom + {CELL_ZOOM_OFFSET}) / {2 * MERCATOR_HALF})::int,
+               floor(({MERCATOR_HALF} - pp.y) * power(2, z.zoom + {CELL_ZOOM_OFFSET}) / {2 * MERCATOR_HALF})::int,
+               pp.status, pp.road_type, count(*), sum(pp.sanctioned_cost), sum(ST_X(pp.point)), sum(ST_Y(pp.point))
+        FROM project_points pp
+        CROSS JOIN generate_series(0, {PRECOMPUTED_MAX_ZOOM}) AS z(zoom)
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("map_clusters")
+    op.drop_index("idx_project_points_point", table_name="project_points")
+    op.drop_table("project_points")
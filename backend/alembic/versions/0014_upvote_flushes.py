@@ -0,0 +1,26 @@
+"""record applied upvote batches so retried flushes are no-ops
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upvote_flushes",
+        sa.Column("batch_id", sa.String(36), primary_key=True),
+        sa.Column("applied_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("upvote_flushes")
@@ -4,6 +4,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.core.security import decode_access_token
+from app.core.principals import resolve_principal
 from app.models.user import User, UserRole
 import logging
 
@@ -16,7 +17,12 @@ def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> Optional[User]:
-    """Get current authenticated user"""
+    """
+    Get current authenticated user.
+
+    Resolved from the principal cache, so most requests don't query users;
+    the returned User is transient and not attached to db.
+    """
     if not token:
         return None
     
@@ -28,11 +34,7 @@ def get_current_user(
     if user_id is None:
         return None
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.is_active:
-        return None
-    
-    return user
+    return resolve_principal(db, int(user_id), float(payload.get("iat", 0)))
 
 
 def require_auth(
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
-from app.database import get_db
+from anyio import to_thread
+from app.database import get_async_db, get_db
 from app.models import User
 from app.schemas.auth import Token, UserLogin, UserCreate, UserResponse
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import HashingBusy, averify_password, get_password_hash, create_access_token
+from app.core import login_throttle
 from app.api.deps import require_super_admin
 from app.config import settings
 import logging
@@ -15,16 +19,39 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    OAuth2 compatible login endpoint
+    OAuth2 compatible login endpoint.
+    
+    Repeated failures lock out the account and the client IP for a while
+    (429); bcrypt runs on a bounded pool and a saturated pool answers 503.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
+    ip = request.client.host if request.client else None
+    wait = await to_thread.run_sync(login_throttle.retry_after, form_data.username, ip)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Try again later.",
+            headers={"Retry-After": str(wait)},
+        )
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalar_one_or_none()
+    
+    try:
+        valid = await averify_password(form_data.password, user.hashed_password if user else None)
+    except HashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    
+    if not user or not valid:
+        await to_thread.run_sync(login_throttle.record_failure, form_data.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -37,9 +64,11 @@ def login(
             detail="User account is disabled"
         )
     
+    await to_thread.run_sync(login_throttle.clear_failures, form_data.username)
+    
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
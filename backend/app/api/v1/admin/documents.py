@@ -0,0 +1,203 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from botocore.exceptions import ClientError
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import uuid4
+from app.database import get_db
+from app.models import Project, ProjectDocument
+from app.models.project_document import DocumentStatus
+from app.models.user import User
+from app.schemas.document import (
+    DocumentResponse,
+    DocumentUploadComplete,
+    DocumentUploadCreate,
+    DocumentUploadResponse,
+    UploadPartsRequest
+)
+from app.schemas.common import MessageResponse
+from app.api.deps import require_admin, require_data_entry
+from app.config import settings
+from app.utils.file_upload import (
+    MAX_UPLOAD_PARTS,
+    abort_multipart_upload,
+    complete_multipart_upload,
+    content_type_for,
+    delete_object,
+    part_count,
+    presign_upload_parts,
+    start_multipart_upload,
+    validate_extension
+)
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def get_document(db: Session, document_id: int, status: Optional[DocumentStatus] = None) -> ProjectDocument:
+    document = db.get(ProjectDocument, document_id)
+    if not document or (status and document.status != status):
+        raise HTTPException(status_code=404, detail="Document not found")
+    return document
+
+
+@router.post("/uploads", response_model=DocumentUploadResponse, status_code=201)
+def start_upload(
+    upload: DocumentUploadCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_data_entry)
+):
+    """
+    Start a multipart upload straight to object storage.
+
+    PUT each part to its URL, keep the ETag response header of each, then
+    call /uploads/{document_id}/complete. File bytes never pass through the API.
+    """
+    if not db.get(Project, upload.project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    extension = validate_extension(upload.filename)
+    if upload.size_bytes > settings.MAX_DOCUMENT_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.MAX_DOCUMENT_SIZE // (1024 * 1024)}MB"
+        )
+    parts = part_count(upload.size_bytes)
+    if parts > MAX_UPLOAD_PARTS:
+        raise HTTPException(status_code=413, detail="File needs more upload parts than storage allows")
+
+    content_type = content_type_for(extension)
+    key = f"projects/{upload.project_id}/documents/{uuid4().hex}.{extension}"
+    upload_id = start_multipart_upload(key, content_type)
+
+    document = ProjectDocument(
+        project_id=upload.project_id,
+        title=upload.title,
+        document_type=upload.document_type,
+        filename=upload.filename,
+        content_type=content_type,
+        size_bytes=upload.size_bytes,
+        storage_key=key,
+        upload_id=upload_id,
+        uploaded_by_id=current_user.id
+    )
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+
+    return DocumentUploadResponse(
+        document_id=document.id,
+        upload_id=upload_id,
+        part_size=settings.UPLOAD_PART_SIZE,
+        parts=presign_upload_parts(key, upload_id, range(1, parts + 1)),
+        expires_in=settings.PRESIGNED_URL_EXPIRY
+    )
+
+
+@router.post("/uploads/{document_id}/parts", response_model=DocumentUploadResponse)
+def refresh_part_urls(
+    document_id: int,
+    request: UploadPartsRequest,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_data_entry)
+):
+    """
+    Re-issue part URLs, e.g. to resume an upload after its URLs expired
+    """
+    document = get_document(db, document_id, DocumentStatus.UPLOADING)
+
+    parts = part_count(document.size_bytes)
+    if any(number < 1 or number > parts for number in request.part_numbers):
+        raise HTTPException(status_code=400, detail=f"Part numbers must be between 1 and {parts}")
+
+    return DocumentUploadResponse(
+        document_id=document.id,
+        upload_id=document.upload_id,
+        part_size=settings.UPLOAD_PART_SIZE,
+        parts=presign_upload_parts(document.storage_key, document.upload_id, sorted(set(request.part_numbers))),
+        expires_in=settings.PRESIGNED_URL_EXPIRY
+    )
+
+
+@router.post("/uploads/{document_id}/complete", response_model=DocumentResponse)
+def complete_upload(
+    document_id: int,
+    completion: DocumentUploadComplete,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_data_entry)
+):
+    """
+    Assemble the uploaded parts and publish the document
+    """
+    document = get_document(db, document_id, DocumentStatus.UPLOADING)
+
+    try:
+        size = complete_multipart_upload(
+            document.storage_key,
+            document.upload_id,
+            [part.model_dump() for part in completion.parts]
+        )
+    except ClientError as e:
+        raise HTTPException(status_code=400, detail=f"Upload could not be completed: {e}")
+
+    if size > settings.MAX_DOCUMENT_SIZE:
+        delete_object(document.storage_key)
+        db.delete(document)
+        db.commit()
+        raise HTTPException(status_code=413, detail="Uploaded file exceeds the declared size limit")
+
+    document.size_bytes = size
+    document.upload_id = None
+    document.status = DocumentStatus.AVAILABLE
+    document.uploaded_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(document)
+
+    logger.info(f"Document {document.id} uploaded for project {document.project_id} ({size} bytes)")
+
+    return document
+
+
+@router.delete("/uploads/{document_id}", response_model=MessageResponse)
+def abort_upload(
+    document_id: int,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_data_entry)
+):
+    """
+    Cancel an unfinished upload and discard its parts
+    """
+    document = get_document(db, document_id, DocumentStatus.UPLOADING)
+
+    try:
+        abort_multipart_upload(document.storage_key, document.upload_id)
+    except ClientError as e:
+        logger.warning(f"Abort of upload {document.upload_id} failed: {e}")
+
+    db.delete(document)
+    db.commit()
+
+    return MessageResponse(message="Upload cancelled")
+
+
+@router.delete("/{document_id}", response_model=MessageResponse)
+def delete_document(
+    document_id: int,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin)
+):
+    """
+    Remove a document and its stored file
+    """
+    document = get_document(db, document_id)
+
+    if document.status == DocumentStatus.UPLOADING:
+        abort_multipart_upload(document.storage_key, document.upload_id)
+    else:
+        delete_object(document.storage_key)
+
+    db.delete(document)
+    db.commit()
+
+    return MessageResponse(message="Document deleted")
@@ -0,0 +1,89 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional
+from app.database import get_db
+from app.models.user import User
+from app.models.import_job import ImportJob, ImportRowError
+from app.schemas.upload import ImportJobResponse, ImportRowErrorPage, ImportRowErrorResponse
+from app.api.deps import require_data_entry
+from app.config import settings
+from app.utils.file_upload import save_upload, validate_extension
+from app.utils.bulk_import import run_import
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def get_job(db: Session, job_id: int) -> ImportJob:
+    job = db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.post("/projects", response_model=ImportJobResponse, status_code=202)
+def import_projects(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_data_entry)
+):
+    """
+    Upload a CSV/XLSX sanction list and import it in the background.
+
+    Poll /jobs/{id} for progress and /jobs/{id}/errors for rejected rows.
+    Rows are upserted by project slug (name + district), so re-uploading
+    a corrected file updates projects rather than duplicating them.
+    """
+    file_type = validate_extension(file.filename, settings.IMPORT_EXTENSIONS)
+    path = save_upload(file, "imports", max_size=settings.MAX_IMPORT_SIZE)
+
+    job = ImportJob(filename=file.filename, file_type=file_type, created_by_id=current_user.id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    background_tasks.add_task(run_import, job.id, str(path), file_type)
+    logger.info(f"Import {job.id} queued: {file.filename} by {current_user.email}")
+
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ImportJobResponse)
+def get_import_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _: User = Depends(require_data_entry)
+):
+    """
+    Import status and progress counters
+    """
+    return get_job(db, job_id)
+
+
+@router.get("/jobs/{job_id}/errors", response_model=ImportRowErrorPage)
+def list_import_errors(
+    job_id: int,
+    after_row: Optional[int] = Query(None, ge=0, description="Continue after this row number"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_data_entry)
+):
+    """
+    Rejected rows with their reasons, in file order
+    """
+    get_job(db, job_id)
+
+    query = select(ImportRowError).where(ImportRowError.job_id == job_id)
+    if after_row is not None:
+        query = query.where(ImportRowError.row_number > after_row)
+    rows = db.scalars(query.order_by(ImportRowError.row_number).limit(limit + 1)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return ImportRowErrorPage(
+        items=[ImportRowErrorResponse.model_validate(row) for row in rows],
+        next_after_row=rows[-1].row_number if has_more else None
+    )
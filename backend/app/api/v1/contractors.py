@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import List, Optional, Union
+from app.database import get_read_db
+from app.models import Firm
+from app.models.firm_scorecard import FirmScorecard
+from app.schemas.firm import FirmListItem, FirmProfile, FirmScorecardResponse, LeaderboardEntry, LeaderboardMetric
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
+from app.schemas.stats import SpendSeries
+from app.core.pagination import PageParams, paginate
+from app.core.invalidation import ALL_FIRMS
+from app.core.ledger import contractor_scope, monthly_spend_query, spend_series
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=Union[PaginatedResponse[FirmListItem], CursorPaginatedResponse[FirmListItem]]
+)
+def list_contractors(
+    pagination: PageParams = Depends(),
+    is_blacklisted: Optional[bool] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    List contractor and maintenance firms, newest first
+    """
+    query = select(Firm)
+    
+    if is_blacklisted is not None:
+        query = query.where(Firm.is_blacklisted == is_blacklisted)
+    
+    return paginate(
+        db,
+        query,
+        pagination,
+        created_col=Firm.created_at,
+        id_col=Firm.id,
+        to_item=FirmListItem.model_validate,
+        count_cache_key=f"count:firms:{is_blacklisted}",
+        count_tags=[ALL_FIRMS]
+    )
+
+
+def metric_column(metric: LeaderboardMetric):
+    if metric == LeaderboardMetric.PERFORMANCE_RATING:
+        return Firm.performance_rating
+    return getattr(FirmScorecard, metric.value)
+
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+def contractor_leaderboard(
+    metric: LeaderboardMetric = LeaderboardMetric.ON_TIME_RATE,
+    descending: bool = True,
+    min_projects: int = Query(1, ge=0),
+    is_blacklisted: Optional[bool] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Rank firms by a scorecard metric.
+
+    Reads only the precomputed scorecards, one row per firm. Firms with fewer
+    than min_projects contracts are left out so one lucky project can't top a
+    rate ranking.
+    """
+    column = metric_column(metric)
+    query = (
+        select(Firm, FirmScorecard)
+        .join(FirmScorecard, FirmScorecard.firm_id == Firm.id)
+        .where(FirmScorecard.project_count >= min_projects)
+    )
+    if is_blacklisted is not None:
+        query = query.where(Firm.is_blacklisted == is_blacklisted)
+
+    rows = db.execute(
+        query
+        .order_by((column.desc() if descending else column.asc()).nulls_last(), Firm.id)
+        .offset(offset)
+        .limit(limit)
+    ).all()
+
+    return [
+        LeaderboardEntry(
+            rank=offset + position,
+            firm=FirmListItem.model_validate(firm),
+            scorecard=FirmScorecardResponse.model_validate(scorecard)
+        )
+        for position, (firm, scorecard) in enumerate(rows, start=1)
+    ]
+
+
+@router.get("/{firm_id}", response_model=FirmProfile)
+def get_contractor(
+    firm_id: int,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Contractor profile with its scorecard, read by primary key
+    """
+    row = db.execute(
+        select(Firm, FirmScorecard)
+        .outerjoin(FirmScorecard, FirmScorecard.firm_id == Firm.id)
+        .where(Firm.id == firm_id)
+    ).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Contractor not found")
+
+    firm, scorecard = row
+    return FirmProfile(
+        **FirmListItem.model_validate(firm).model_dump(),
+        scorecard=FirmScorecardResponse.model_validate(scorecard) if scorecard else None
+    )
+
+
+@router.get("/{firm_id}/spend", response_model=SpendSeries)
+def get_contractor_spend(
+    firm_id: int,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Cumulative disbursements per month across the projects a firm was
+    awarded, against their combined sanctioned cost
+    """
+    row = db.execute(
+        select(Firm.id, FirmScorecard.sanctioned_cost)
+        .outerjoin(FirmScorecard, FirmScorecard.firm_id == Firm.id)
+        .where(Firm.id == firm_id)
+    ).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Contractor not found")
+
+    scope = contractor_scope(firm_id)
+    return SpendSeries(**spend_series(scope, db.execute(monthly_spend_query(scope)).all(), row.sanctioned_cost))
@@ -0,0 +1,149 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import RedirectResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from anyio import to_thread
+from typing import AsyncIterator, Optional
+from app.database import get_async_read_db
+from app.models import Project, ProjectStatus, RoadType
+from app.schemas.export import ExportSnapshots
+from app.core.cache import aget_or_set
+from app.core.export import (
+    EXPORT_BATCH_SIZE,
+    GEOMETRY_ENCODINGS,
+    MEDIA_TYPES,
+    ExportFormat,
+    aiter_export,
+    export_query,
+    read_manifest
+)
+from app.config import settings
+from app.utils.file_upload import public_url
+from app.utils.geojson import DEFAULT_PRECISION
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Live export streams on this worker; each holds a database connection until done
+_export_slots = asyncio.Semaphore(settings.EXPORT_MAX_CONCURRENT)
+
+
+class ExportSlot:
+    """One claimed export slot, released exactly once whichever cleanup path gets there first"""
+
+    def __init__(self):
+        self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            _export_slots.release()
+
+
+async def claim_slot() -> ExportSlot:
+    if _export_slots.locked():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many exports in progress, please retry or use /exports/snapshots",
+            headers={"Retry-After": "30"},
+        )
+    # Never suspends while a slot is free, so nothing can take it between the check and here
+    await _export_slots.acquire()
+    return ExportSlot()
+
+
+async def load_snapshots() -> ExportSnapshots:
+    async def loader():
+        return await to_thread.run_sync(read_manifest) or {}
+
+    manifest = await aget_or_set("exports:manifest", loader, ttl=settings.EXPORT_MANIFEST_TTL)
+    return ExportSnapshots(
+        generated_at=manifest.get("generated_at"),
+        files={
+            name: {"url": public_url(entry["key"]), "size": entry["size"], "rows": entry["rows"]}
+            for name, entry in manifest.get("files", {}).items()
+        }
+    )
+
+
+async def release_slot(chunks: AsyncIterator[bytes], slot: ExportSlot) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        slot.release()
+
+
+@router.get("/snapshots", response_model=ExportSnapshots)
+async def list_snapshots():
+    """
+    Nightly full-dataset files in every format, including GeoParquet.
+
+    Served straight from object storage, which honours Range requests, so
+    interrupted downloads resume with a standard Range header.
+    """
+    return await load_snapshots()
+
+
+@router.get("/projects")
+async def export_projects(
+    format: ExportFormat = ExportFormat.NDJSON,
+    status: Optional[ProjectStatus] = None,
+    road_type: Optional[RoadType] = None,
+    district: Optional[str] = None,
+    state: Optional[str] = None,
+    after_id: Optional[int] = Query(None, ge=0, description="Resume after the last project id received"),
+    precision: int = Query(DEFAULT_PRECISION, ge=0, le=8, description="Coordinate decimal places"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Stream projects with their accountability chain and geometry as NDJSON,
+    CSV (geometry as WKT) or GeoJSON text sequences, in id order.
+
+    Rows are encoded as they arrive from a server-side cursor, so memory is
+    flat whatever the result size. To resume an interrupted download, repeat
+    the request with after_id set to the last id received (CSV omits the
+    header row then). GeoParquet is only available as a nightly snapshot:
+    this redirects to it.
+    """
+    filters = []
+    if status:
+        filters.append(Project.status == status)
+    if road_type:
+        filters.append(Project.road_type == road_type)
+    if district:
+        filters.append(Project.district.ilike(f"%{district}%"))
+    if state:
+        filters.append(Project.state.ilike(f"%{state}%"))
+
+    if format == ExportFormat.GEOPARQUET:
+        if filters or after_id is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="GeoParquet is published as a full nightly snapshot; filter it client-side or use another format"
+            )
+        snapshot = (await load_snapshots()).files.get(format.value)
+        if not snapshot:
+            raise HTTPException(status_code=404, detail="No GeoParquet snapshot has been published yet")
+        return RedirectResponse(snapshot.url)
+
+    slot = await claim_slot()
+    try:
+        # A full export outlives the statement timeout meant for API reads
+        await db.execute(text(f"SET LOCAL statement_timeout = {int(settings.EXPORT_STATEMENT_TIMEOUT_MS)}"))
+        stmt = export_query(filters, after_id, GEOMETRY_ENCODINGS[format], precision)
+        rows = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    except BaseException:
+        slot.release()
+        raise
+
+    return StreamingResponse(
+        release_slot(aiter_export(rows, format, header=after_id is None), slot),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="projects.{format.value}"'},
+        # Covers a response whose body never starts, e.g. the client went away first
+        background=BackgroundTask(slot.release),
+    )
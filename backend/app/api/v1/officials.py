@@ -0,0 +1,186 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import String, cast, func, select
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
+from app.database import get_read_db
+from app.models import Official, Project
+from app.models.accountability_edge import NodeKind
+from app.schemas.official import GraphNode, GraphProject, OfficialListItem, SharedContractorOfficial
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
+from app.core.pagination import PageParams, paginate
+from app.core.invalidation import ALL_OFFICIALS
+from app.core.accountability import HOP_FANOUT, MAX_HOPS, neighbours, node_names, projects_of, reachable
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=Union[PaginatedResponse[OfficialListItem], CursorPaginatedResponse[OfficialListItem]]
+)
+def list_officials(
+    pagination: PageParams = Depends(),
+    department: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    List approving officials, newest first
+    """
+    query = select(Official)
+    
+    if department:
+        query = query.where(Official.department.ilike(f"%{department}%"))
+    
+    return paginate(
+        db,
+        query,
+        pagination,
+        created_col=Official.created_at,
+        id_col=Official.id,
+        to_item=OfficialListItem.model_validate,
+        count_cache_key=f"count:officials:{department}",
+        count_tags=[ALL_OFFICIALS]
+    )
+
+
+# Graph queries read only app.core.accountability's edge table, following at
+# most HOP_FANOUT edges per node, so they cost the same for every official.
+
+
+def get_node(db: Session, kind: NodeKind, node_id: int) -> str:
+    """Name of a graph node; 404 if it doesn't exist"""
+    name = node_names(db, [(kind.value, node_id)]).get((kind.value, node_id))
+    if name is None:
+        raise HTTPException(status_code=404, detail=f"{kind.value.replace('_', ' ').capitalize()} not found")
+    return name
+
+
+@router.get("/{official_id}/neighbours", response_model=List[GraphNode])
+def official_neighbours(
+    official_id: int,
+    kind: Optional[NodeKind] = None,
+    limit: int = Query(HOP_FANOUT, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Ministers, contractors and maintenance firms this official has worked with,
+    most shared projects first, e.g. kind=contractor for the contractors they
+    approved most often
+    """
+    node = (NodeKind.OFFICIAL.value, official_id)
+    get_node(db, NodeKind.OFFICIAL, official_id)
+
+    edges = neighbours(db, [node], [kind] if kind else None, limit).get(node, [])[:limit]
+    names = node_names(db, [target for target, _, _ in edges])
+
+    return [
+        GraphNode(
+            kind=target[0],
+            id=target[1],
+            name=names.get(target),
+            project_count=count,
+            sanctioned_cost=float(cost)
+        )
+        for target, count, cost in edges
+    ]
+
+
+@router.get("/{official_id}/shared-contractors", response_model=List[SharedContractorOfficial])
+def shared_contractor_officials(
+    official_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Other officials who approved the same contractors as this one, ranked by
+    how many of this official's top contractors they share
+    """
+    node = (NodeKind.OFFICIAL.value, official_id)
+    get_node(db, NodeKind.OFFICIAL, official_id)
+
+    contractors = [target for target, _, _ in neighbours(db, [node], [NodeKind.CONTRACTOR]).get(node, [])]
+    shared: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+    for edges in neighbours(db, contractors, [NodeKind.OFFICIAL]).values():
+        for (_, other_id), count, _ in edges:
+            if other_id != official_id:
+                shared[other_id][0] += 1
+                shared[other_id][1] += count
+
+    ranked = sorted(shared.items(), key=lambda item: (-item[1][0], -item[1][1], item[0]))[:limit]
+    names = node_names(db, [(NodeKind.OFFICIAL.value, other_id) for other_id, _ in ranked])
+
+    return [
+        SharedContractorOfficial(
+            id=other_id,
+            name=names.get((NodeKind.OFFICIAL.value, other_id)),
+            shared_contractors=contractor_count,
+            shared_contractor_projects=project_count
+        )
+        for other_id, (contractor_count, project_count) in ranked
+    ]
+
+
+@router.get("/graph/{kind}/{node_id}/reachable", response_model=List[GraphNode])
+def reachable_nodes(
+    kind: NodeKind,
+    node_id: int,
+    hops: int = Query(2, ge=1, le=MAX_HOPS),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Everyone within hops of a minister, official or firm, nearest hop first,
+    following each node's strongest links
+    """
+    start = (kind.value, node_id)
+    get_node(db, kind, node_id)
+
+    found = reachable(db, start, hops)
+    found.pop(start)
+    names = node_names(db, found)
+
+    return [
+        GraphNode(kind=node[0], id=node[1], name=names.get(node), hop=hop, project_count=count)
+        for node, (hop, count) in sorted(found.items(), key=lambda item: (item[1][0], -item[1][1], item[0]))
+    ]
+
+
+@router.get("/graph/{kind}/{node_id}/projects", response_model=List[GraphProject])
+def reachable_projects(
+    kind: NodeKind,
+    node_id: int,
+    hops: int = Query(2, ge=0, le=MAX_HOPS),
+    limit: int = Query(50, ge=1, le=200),
+    before_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Newest projects involving anyone within hops of a node (hops=0: the node's
+    own projects), e.g. all projects two hops from a minister.
+
+    Page with before_id set to the last id returned.
+    """
+    start = (kind.value, node_id)
+    get_node(db, kind, node_id)
+
+    nodes = reachable(db, start, hops) if hops else {start: (0, 0)}
+    project_ids = projects_of(db, nodes, limit, before_id)
+    if not project_ids:
+        return []
+
+    rows = db.execute(
+        select(
+            Project.id,
+            Project.name,
+            Project.slug,
+            func.lower(cast(Project.status, String)).label("status"),
+            Project.district,
+            Project.sanctioned_cost
+        )
+        .where(Project.id.in_(project_ids))
+        .order_by(Project.id.desc())
+    ).mappings().all()
+
+    return [GraphProject(**row) for row in rows]
@@ -1,28 +1,81 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
-from typing import List, Optional
-from app.database import get_db
-from app.models import Project, RoadSegment, ProjectStatus, RoadType
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import func, select, literal
+from typing import AsyncIterator, List, Optional, Set, Union
+from app.database import get_async_read_db
+from app.models import (
+    Project, RoadSegment, Firm, PublicReport, ProjectDocument, ProjectStatus, RoadType
+)
 from app.schemas.project import (
     ProjectResponse,
     ProjectDetailResponse,
     ProjectListItem,
-    ProjectSearchResult,
     RoadSegmentInProject
 )
-from app.schemas.common import PaginatedResponse
-from app.core.cache import get_cache, set_cache
-from geoalchemy2.shape import to_shape
-from shapely.geometry import mapping
+from app.models.project_document import DocumentStatus
+from app.models.disbursement import ProjectLedger
+from app.schemas.document import DocumentResponse
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
+from app.schemas.stats import SpendSeries
+from app.schemas.cluster import MapClusters
+from app.core.cache import aget_cache, aget_or_set, aset_cache
+from app.core.search import project_search
+from app.core.pagination import PageParams, apaginate
+from app.core.invalidation import project_detail_tags, search_tags
+from app.core.ledger import monthly_spend_query, project_scope, spend_series
+from app.core.clusters import MAX_CELLS, PRECOMPUTED_MAX_ZOOM, cell_range, cluster_query, fold_cells
+from app.core.responses import encode_model
+from app.core.http_cache import cached_body_response, versioned
+from app.config import settings
+from app.utils.file_upload import presign_download
+from app.utils.geojson import (
+    DEFAULT_PRECISION,
+    GEOJSON_MEDIA_TYPE,
+    aiter_feature_collection,
+    feature_json,
+    feature_property_columns,
+    select_level
+)
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Rows fetched per round-trip from the server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+# Search responses larger than this are streamed but not cached
+SEARCH_CACHE_MAX_BYTES = 5 * 1024 * 1024
+
+
+async def stream_and_cache(chunks: AsyncIterator[bytes], cache_key: str, ttl: int, tags: Set[str]) -> AsyncIterator[bytes]:
+    """
+    Pass chunks through to the client, caching the full body if it stays small
+    """
+    buffered = []
+    size = 0
+    async for chunk in chunks:
+        if buffered is not None:
+            buffered.append(chunk)
+            size += len(chunk)
+            if size > SEARCH_CACHE_MAX_BYTES:
+                buffered = None  # Too large to cache; keep memory flat
+        yield chunk
+    
+    if buffered is not None:
+        await aset_cache(cache_key, versioned(b"".join(buffered)), ttl=ttl, tags=tags)
+
 
-@router.get("/search", response_model=ProjectSearchResult)
-def search_projects(
+@router.get(
+    "/search",
+    response_class=StreamingResponse,
+    responses={200: {"content": {GEOJSON_MEDIA_TYPE: {}}, "description": "GeoJSON FeatureCollection"}}
+)
+async def search_projects(
+    request: Request,
     q: Optional[str] = Query(None, description="Search query (name, district, city, pincode)"),
     district: Optional[str] = Query(None),
     city: Optional[str] = Query(None),
@@ -30,193 +83,351 @@ def search_projects(
     pincode: Optional[str] = Query(None),
     status: Optional[ProjectStatus] = Query(None),
     road_type: Optional[RoadType] = Query(None),
-    db: Session = Depends(get_db)
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom, selects geometry level of detail"),
+    tolerance: Optional[float] = Query(None, gt=0, description="Max simplification error in degrees (overrides zoom)"),
+    precision: int = Query(DEFAULT_PRECISION, ge=0, le=15, description="Decimal places in coordinates"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum number of projects"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Search projects and return as GeoJSON for map display
+    Search projects and return as GeoJSON for map display.
+    
+    Features are serialized by PostGIS and streamed from a server-side cursor,
+    so there is no response model to validate against. Cached results carry
+    an ETag; a streamed first response has none.
     """
+    level = select_level(zoom, tolerance)
+    
     # Build cache key
-    cache_key = f"search:{q}:{district}:{city}:{state}:{pincode}:{status}:{road_type}"
-    cached = get_cache(cache_key)
+    cache_key = f"search:{q}:{district}:{city}:{state}:{pincode}:{status}:{road_type}:{level}:{precision}:{limit}:etag"
+    cached = await aget_cache(cache_key)
     if cached:
-        return cached
+        return cached_body_response(request, cached, GEOJSON_MEDIA_TYPE)
     
-    # Build query
-    query = db.query(Project).options(
-        joinedload(Project.road_segments),
-        joinedload(Project.contractor),
-        joinedload(Project.maintenance_firm)
-    )
+    # Select matching projects first so the limit applies to projects, not segments
+    rank = literal(0.0)
+    if q:
+        search_filter, rank = project_search(q)
+    
+    matching = select(Project.id.label("id"), rank.label("rank"))
     
     # Apply filters
     if q:
-        search_filter = or_(
-            Project.name.ilike(f"%{q}%"),
-            Project.district.ilike(f"%{q}%"),
-            Project.city.ilike(f"%{q}%"),
-            Project.pincode.ilike(f"%{q}%")
-        )
-        query = query.filter(search_filter)
+        matching = matching.where(search_filter)
     
     if district:
-        query = query.filter(Project.district.ilike(f"%{district}%"))
+        matching = matching.where(Project.district.ilike(f"%{district}%"))
     if city:
-        query = query.filter(Project.city.ilike(f"%{city}%"))
+        matching = matching.where(Project.city.ilike(f"%{city}%"))
     if state:
-        query = query.filter(Project.state.ilike(f"%{state}%"))
+        matching = matching.where(Project.state.ilike(f"%{state}%"))
     if pincode:
-        query = query.filter(Project.pincode == pincode)
+        matching = matching.where(Project.pincode == pincode)
     if status:
-        query = query.filter(Project.status == status)
+        matching = matching.where(Project.status == status)
     if road_type:
-        query = query.filter(Project.road_type == road_type)
-    
-    projects = query.limit(100).all()
-    
-    # Convert to GeoJSON
-    features = []
-    for project in projects:
-        for segment in project.road_segments:
-            # Convert PostGIS geometry to GeoJSON
-            geom = to_shape(segment.geometry)
-            
-            features.append({
-                "type": "Feature",
-                "id": project.id,
-                "geometry": mapping(geom),
-                "properties": {
-                    "project_id": project.id,
-                    "project_name": project.name,
-                    "status": project.status.value,
-                    "road_type": project.road_type.value,
-                    "district": project.district,
-                    "city": project.city,
-                    "contractor": project.contractor.name if project.contractor else None,
-                    "sanctioned_cost": float(project.sanctioned_cost),
-                    "segment_name": segment.segment_name
-                }
-            })
-    
-    result = {
-        "type": "FeatureCollection",
-        "features": features
-    }
-    
-    # Cache for 30 minutes
-    set_cache(cache_key, result, ttl=1800)
-    
-    return result
+        matching = matching.where(Project.road_type == road_type)
+    
+    # Most relevant projects first; without a query there is nothing to rank
+    if q:
+        matching = matching.order_by(rank.desc(), Project.id)
+    matching = matching.limit(limit).subquery("matching")
+    
+    # Each row is one complete GeoJSON Feature rendered by the database
+    stmt = (
+        select(feature_json(
+            Project.id,
+            RoadSegment.geometry_column(level),
+            feature_property_columns(),
+            precision
+        ))
+        .select_from(RoadSegment)
+        .join(Project, RoadSegment.project)
+        .join(matching, matching.c.id == Project.id)
+        .outerjoin(Firm, Project.contractor)
+        .order_by(matching.c.rank.desc(), Project.id, RoadSegment.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    
+    features = await db.stream_scalars(stmt)
+    
+    # Dropped on any project write, so this can live for hours
+    return StreamingResponse(
+        stream_and_cache(
+            aiter_feature_collection(features),
+            cache_key,
+            ttl=settings.CACHE_SEARCH_TTL,
+            tags=search_tags(district)
+        ),
+        media_type=GEOJSON_MEDIA_TYPE
+    )
 
 
-@router.get("/{project_id}", response_model=ProjectDetailResponse)
-def get_project_detail(
-    project_id: int,
-    db: Session = Depends(get_db)
+@router.get("/clusters", response_model=MapClusters)
+async def cluster_projects(
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom"),
+    min_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    status: Optional[ProjectStatus] = Query(None),
+    road_type: Optional[RoadType] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Get full project details including accountability chain and related data
+    Projects in the visible map area aggregated into grid cells, for zoomed-out
+    views where drawing every feature is slow and unreadable.
+    
+    Cells are about 64px on screen (4x4 per tile) and report their project
+    count, sanctioned cost, status breakdown and members' mean position.
+    Zooms up to PRECOMPUTED_MAX_ZOOM read maintained per-zoom aggregates, so
+    cost depends on the cells in view, not the projects behind them.
     """
-    cache_key = f"project:{project_id}"
-    cached = get_cache(cache_key)
-    if cached:
-        return cached
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="Bounding box must be min_lon,min_lat,max_lon,max_lat")
     
-    project = db.query(Project).options(
-        joinedload(Project.minister),
-        joinedload(Project.approving_official),
-        joinedload(Project.contractor),
-        joinedload(Project.maintenance_firm),
-        joinedload(Project.road_segments)
-    ).filter(Project.id == project_id).first()
+    first_x, last_x, first_y, last_y = cell_range(zoom, (min_lon, min_lat, max_lon, max_lat))
+    if (last_x - first_x + 1) * (last_y - first_y + 1) > MAX_CELLS:
+        raise HTTPException(status_code=400, detail="Bounding box too large for this zoom")
+    
+    rows = await db.execute(cluster_query(zoom, (min_lon, min_lat, max_lon, max_lat), status, road_type))
+    return MapClusters(
+        zoom=zoom,
+        precomputed=zoom <= PRECOMPUTED_MAX_ZOOM,
+        cells=fold_cells(zoom, rows.all())
+    )
+
+
+def count_for_project(model, *criteria):
+    return (
+        select(func.count())
+        .where(model.project_id == Project.id, *criteria)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+
+
+async def load_project_detail(db: AsyncSession, project_id: int, level: Optional[int]) -> ProjectDetailResponse:
+    """
+    Build the project detail payload from the database.
+
+    Two round-trips: the project with its people, firms and related-row
+    counts, then its segments with geometry already rendered as GeoJSON.
+    The disbursement count comes from the ledger snapshot, not the ledger.
+    """
+    result = await db.execute(
+        select(
+            Project,
+            count_for_project(PublicReport).label("reports_count"),
+            func.coalesce(
+                select(ProjectLedger.entry_count)
+                .where(ProjectLedger.project_id == Project.id)
+                .correlate(Project)
+                .scalar_subquery(),
+                0
+            ).label("disbursements_count"),
+            count_for_project(
+                ProjectDocument,
+                ProjectDocument.status == DocumentStatus.AVAILABLE
+            ).label("documents_count")
+        )
+        .options(
+            joinedload(Project.minister),
+            joinedload(Project.approving_official),
+            joinedload(Project.contractor),
+            joinedload(Project.maintenance_firm)
+        )
+        .where(Project.id == project_id)
+    )
+    row = result.first()
     
-    if not project:
+    if not row:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get counts
-    reports_count = len(project.reports)
-    disbursements_count = len(project.disbursements)
-    documents_count = len(project.documents)
-    
-    # Convert road segments to GeoJSON
-    road_segments = []
-    for segment in project.road_segments:
-        geom = to_shape(segment.geometry)
-        road_segments.append({
-            "id": segment.id,
-            "segment_name": segment.segment_name,
-            "length_km": segment.length_km,
-            "start_point": segment.start_point,
-            "end_point": segment.end_point,
-            "geometry": mapping(geom)
-        })
-    
-    response = ProjectDetailResponse(
+    project, reports_count, disbursements_count, documents_count = row
+    
+    # Fall back to full resolution for segments without a simplified copy
+    geometry = RoadSegment.geometry_column(level)
+    if level is not None:
+        geometry = func.coalesce(geometry, RoadSegment.geometry)
+    
+    segments = await db.execute(
+        select(
+            RoadSegment.id,
+            RoadSegment.segment_name,
+            RoadSegment.length_km,
+            RoadSegment.start_point,
+            RoadSegment.end_point,
+            func.ST_AsGeoJSON(geometry).label("geometry")
+        )
+        .where(RoadSegment.project_id == project_id)
+        .order_by(RoadSegment.id)
+    )
+    road_segments = [
+        {**segment._asdict(), "geometry": json.loads(segment.geometry)}
+        for segment in segments
+    ]
+    
+    return ProjectDetailResponse(
         **project.__dict__,
         road_segments=road_segments,
         reports_count=reports_count,
         disbursements_count=disbursements_count,
         documents_count=documents_count
     )
+
+
+@router.get("/{project_id}", response_model=ProjectDetailResponse)
+async def get_project_detail(
+    request: Request,
+    project_id: int,
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom, selects geometry level of detail"),
+    tolerance: Optional[float] = Query(None, gt=0, description="Max simplification error in degrees (overrides zoom)"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get full project details including accountability chain and related data.
     
-    # Cache for 15 minutes
-    set_cache(cache_key, response.dict(), ttl=900)
+    The cache holds the encoded response and its ETag, so a hit is sent (or
+    answered with 304) without being validated or serialized again.
+    """
+    level = select_level(zoom, tolerance)
+    tags: Set[str] = set()
+    
+    async def build() -> list:
+        detail = await load_project_detail(db, project_id, level)
+        tags.update(project_detail_tags(detail.model_dump()))
+        return versioned(encode_model(detail))
     
-    return response
+    # Invalidated by writes to the project or its firms/officials; only one
+    # worker rebuilds a popular project when it expires
+    entry = await aget_or_set(
+        f"project:{project_id}:{level}:etag",
+        build,
+        ttl=settings.CACHE_DETAIL_TTL,
+        tags=lambda _: tags
+    )
+    return cached_body_response(request, entry, "application/json")
 
 
-@router.get("/", response_model=PaginatedResponse[ProjectListItem])
-def list_projects(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
+@router.get("/{project_id}/spend", response_model=SpendSeries)
+async def get_project_spend(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Cumulative disbursements per month against the sanctioned cost.
+    
+    Read from the monthly series kept by app.core.ledger, never the ledger rows.
+    """
+    sanctioned = (await db.execute(
+        select(Project.sanctioned_cost).where(Project.id == project_id)
+    )).first()
+    if not sanctioned:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    scope = project_scope(project_id)
+    rows = (await db.execute(monthly_spend_query(scope))).all()
+    return SpendSeries(**spend_series(scope, rows, sanctioned[0]))
+
+
+@router.get("/{project_id}/documents", response_model=List[DocumentResponse])
+async def list_project_documents(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Published documents for a project, newest first
+    """
+    result = await db.execute(
+        select(ProjectDocument)
+        .where(
+            ProjectDocument.project_id == project_id,
+            ProjectDocument.status == DocumentStatus.AVAILABLE
+        )
+        .order_by(ProjectDocument.uploaded_at.desc(), ProjectDocument.id.desc())
+    )
+    return result.scalars().all()
+
+
+@router.get("/{project_id}/documents/{document_id}")
+async def download_project_document(
+    project_id: int,
+    document_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Redirect to a short-lived object storage URL for the file.
+
+    Storage serves the bytes (with Range support), never this API.
+    """
+    document = await db.get(ProjectDocument, document_id)
+    if (
+        not document
+        or document.project_id != project_id
+        or document.status != DocumentStatus.AVAILABLE
+    ):
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    return RedirectResponse(
+        presign_download(document.storage_key, document.filename),
+        status_code=307
+    )
+
+
+def to_list_item(p: Project) -> ProjectListItem:
+    return ProjectListItem(
+        id=p.id,
+        name=p.name,
+        slug=p.slug,
+        status=p.status,
+        road_type=p.road_type,
+        district=p.district,
+        city=p.city,
+        sanctioned_cost=p.sanctioned_cost,
+        contractor_name=p.contractor.name if p.contractor else "N/A",
+        created_at=p.created_at
+    )
+
+
+@router.get(
+    "/",
+    response_model=Union[PaginatedResponse[ProjectListItem], CursorPaginatedResponse[ProjectListItem]]
+)
+async def list_projects(
+    pagination: PageParams = Depends(),
     status: Optional[ProjectStatus] = None,
     road_type: Optional[RoadType] = None,
     district: Optional[str] = None,
     state: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    List projects with pagination and filters
+    List projects with pagination and filters.
+    
+    Use paginate=cursor (then next_cursor) for deep pages; page/page_size
+    offset mode is kept for compatibility.
     """
-    query = db.query(Project).options(joinedload(Project.contractor))
+    query = select(Project)
     
     # Apply filters
     if status:
-        query = query.filter(Project.status == status)
+        query = query.where(Project.status == status)
     if road_type:
-        query = query.filter(Project.road_type == road_type)
+        query = query.where(Project.road_type == road_type)
     if district:
-        query = query.filter(Project.district.ilike(f"%{district}%"))
+        query = query.where(Project.district.ilike(f"%{district}%"))
     if state:
-        query = query.filter(Project.state.ilike(f"%{state}%"))
-    
-    # Get total count
-    total = query.count()
-    
-    # Paginate
-    offset = (page - 1) * page_size
-    projects = query.order_by(Project.created_at.desc()).offset(offset).limit(page_size).all()
-    
-    # Convert to list items
-    items = [
-        ProjectListItem(
-            id=p.id,
-            name=p.name,
-            slug=p.slug,
-            status=p.status,
-            road_type=p.road_type,
-            district=p.district,
-            city=p.city,
-            sanctioned_cost=p.sanctioned_cost,
-            contractor_name=p.contractor.name if p.contractor else "N/A",
-            created_at=p.created_at
-        )
-        for p in projects
-    ]
+        query = query.where(Project.state.ilike(f"%{state}%"))
     
-    return PaginatedResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size
+    return await apaginate(
+        db,
+        query,
+        pagination,
+        created_col=Project.created_at,
+        id_col=Project.id,
+        to_item=to_list_item,
+        count_cache_key=f"count:projects:{status}:{road_type}:{district}:{state}",
+        count_tags=search_tags(district),
+        load_options=[joinedload(Project.contractor)]
     )
\ No newline at end of file
@@ -0,0 +1,251 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Header, HTTPException, Request, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select
+from typing import List, Optional, Union
+from anyio import to_thread
+from redis import RedisError
+from app.database import get_async_read_db
+from app.models import Project, PublicReport
+from app.models.public_report import IssueType, PhotoStatus, ReportPhoto, ReportStatus
+from app.schemas.report import (
+    PublicReportResponse,
+    ReportPhotoURLs,
+    ReportSubmissionResponse,
+    UpvoteResponse
+)
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
+from app.core.pagination import PageParams, apaginate
+from app.core.invalidation import ALL_REPORTS, project_tag
+from app.core.nearest import nearest_segments_query
+from app.core.report_buffer import (
+    pending_upvotes,
+    queue_report,
+    record_upvote,
+    submission_report_id,
+    UnknownReport
+)
+from app.config import settings
+from app.utils.file_upload import public_url, validate_extension
+from app.utils.images import content_hash, process_photo
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+PHOTO_EXTENSIONS = ["jpg", "jpeg", "png", "webp"]
+
+
+def photo_urls(photo: Optional[ReportPhoto]) -> Optional[ReportPhotoURLs]:
+    if photo is None or photo.status != PhotoStatus.READY:
+        return None
+    return ReportPhotoURLs(
+        thumbnail=public_url(photo.thumbnail_key),
+        medium=public_url(photo.medium_key),
+        original=public_url(photo.original_key),
+        width=photo.width,
+        height=photo.height
+    )
+
+
+def to_report_response(report: PublicReport) -> PublicReportResponse:
+    photo = photo_urls(report.photo)
+    return PublicReportResponse(
+        id=report.id,
+        project_id=report.project_id,
+        issue_type=report.issue_type,
+        description=report.description,
+        location_description=report.location_description,
+        status=report.status,
+        photo_url=photo.medium if photo else report.photo_url,
+        photo=photo,
+        upvotes_count=report.upvotes_count,
+        created_at=report.created_at,
+        resolution_date=report.resolution_date
+    )
+
+
+async def read_photo(photo: UploadFile) -> bytes:
+    """Read an uploaded photo, enforcing the type and MAX_UPLOAD_SIZE"""
+    validate_extension(photo.filename, PHOTO_EXTENSIONS)
+    data = await photo.read(settings.MAX_UPLOAD_SIZE + 1)
+    if len(data) > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+        )
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty photo")
+    return data
+
+
+async def merge_pending_upvotes(reports: List[PublicReportResponse]) -> None:
+    """Add upvotes still buffered in Redis so counts look live"""
+    pending = await to_thread.run_sync(pending_upvotes, [report.id for report in reports])
+    for report in reports:
+        report.upvotes_count += pending.get(report.id, 0)
+
+
+@router.post("/", response_model=ReportSubmissionResponse, status_code=202)
+async def submit_report(
+    background_tasks: BackgroundTasks,
+    project_id: Optional[int] = Form(None),
+    latitude: Optional[float] = Form(None, ge=-90, le=90),
+    longitude: Optional[float] = Form(None, ge=-180, le=180),
+    issue_type: IssueType = Form(...),
+    description: str = Form(..., min_length=10, max_length=5000),
+    location_description: Optional[str] = Form(None, max_length=500),
+    reporter_name: Optional[str] = Form(None, max_length=255),
+    reporter_contact: Optional[str] = Form(None, max_length=255),
+    photo: Optional[UploadFile] = File(None),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Submit a citizen report with an optional photo.
+
+    Send either project_id or the reporter's latitude/longitude; a located
+    report is attached to the project of the nearest road. Reports are queued and bulk-inserted within about a second; poll
+    /submissions/{submission_id} for the report id. The photo is resized and
+    stripped of EXIF in the background, and identical photos are stored once.
+    """
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(status_code=422, detail="Send both latitude and longitude")
+
+    road_segment_id = None
+    if latitude is not None:
+        nearest = (await db.execute(
+            nearest_segments_query(latitude, longitude, settings.REPORT_SNAP_RADIUS_M, limit=1)
+        )).mappings().first()
+        if nearest and project_id in (None, nearest["project_id"]):
+            project_id = nearest["project_id"]
+            road_segment_id = nearest["segment_id"]
+
+    if project_id is None:
+        if latitude is None:
+            raise HTTPException(status_code=422, detail="Send project_id or a location")
+        raise HTTPException(
+            status_code=422,
+            detail=f"No tracked road within {settings.REPORT_SNAP_RADIUS_M:g}m of this location; send project_id"
+        )
+    if road_segment_id is None and not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    report = {
+        "project_id": project_id,
+        "lat": latitude,
+        "lon": longitude,
+        "road_segment_id": road_segment_id,
+        "issue_type": issue_type.value,
+        "description": description,
+        "location_description": location_description,
+        "reporter_name": reporter_name,
+        "reporter_contact": reporter_contact,
+    }
+
+    if photo is not None:
+        data = await read_photo(photo)
+        report["photo_sha256"] = content_hash(data)
+        background_tasks.add_task(process_photo, report["photo_sha256"], data)
+
+    submission_id = await to_thread.run_sync(queue_report, report)
+
+    return ReportSubmissionResponse(submission_id=submission_id, status="queued")
+
+
+@router.get("/submissions/{submission_id}", response_model=ReportSubmissionResponse)
+async def get_submission(submission_id: str):
+    """
+    Whether a queued report has been written yet
+    """
+    try:
+        report_id = await to_thread.run_sync(submission_report_id, submission_id)
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Submission status unavailable")
+
+    return ReportSubmissionResponse(
+        submission_id=submission_id,
+        status="created" if report_id else "queued",
+        report_id=report_id
+    )
+
+
+@router.post("/{report_id}/upvote", response_model=UpvoteResponse)
+async def upvote_report(
+    report_id: int,
+    request: Request,
+    x_device_id: Optional[str] = Header(None, max_length=128)
+):
+    """
+    Upvote a report, once per IP and once per device.
+
+    Counted in Redis and written to Postgres in batches.
+    """
+    ip = request.client.host if request.client else None
+    try:
+        counted = await to_thread.run_sync(record_upvote, report_id, ip, x_device_id)
+    except UnknownReport:
+        raise HTTPException(status_code=404, detail="Report not found")
+    except RedisError:
+        raise HTTPException(status_code=503, detail="Upvotes are temporarily unavailable")
+
+    return UpvoteResponse(report_id=report_id, counted=counted)
+
+
+@router.get(
+    "/",
+    response_model=Union[PaginatedResponse[PublicReportResponse], CursorPaginatedResponse[PublicReportResponse]]
+)
+async def list_reports(
+    pagination: PageParams = Depends(),
+    project_id: Optional[int] = None,
+    status: Optional[ReportStatus] = None,
+    issue_type: Optional[IssueType] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    List reports, newest first, with photo thumbnail/medium URLs
+    """
+    query = select(PublicReport)
+
+    if project_id:
+        query = query.where(PublicReport.project_id == project_id)
+    if status:
+        query = query.where(PublicReport.status == status)
+    if issue_type:
+        query = query.where(PublicReport.issue_type == issue_type)
+
+    page = await apaginate(
+        db,
+        query,
+        pagination,
+        created_col=PublicReport.created_at,
+        id_col=PublicReport.id,
+        to_item=to_report_response,
+        count_cache_key=f"count:reports:{project_id}:{status}:{issue_type}",
+        count_tags=[project_tag(project_id)] if project_id else [ALL_REPORTS],
+        load_options=[joinedload(PublicReport.photo)]
+    )
+    await merge_pending_upvotes(page.items)
+
+    return page
+
+
+@router.get("/{report_id}", response_model=PublicReportResponse)
+async def get_report(
+    report_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get a single report
+    """
+    report = (await db.execute(
+        select(PublicReport).options(joinedload(PublicReport.photo)).where(PublicReport.id == report_id)
+    )).scalar_one_or_none()
+
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    response = to_report_response(report)
+    await merge_pending_upvotes([response])
+
+    return response
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.database import get_async_read_db
+from app.schemas.road import NearestRoad, SnapRequest, SnapResponse, SnapResult
+from app.core.nearest import nearest_segments_query, snap_points_query
+from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/nearest", response_model=List[NearestRoad])
+async def nearest_roads(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(1000, gt=0, le=settings.NEAREST_MAX_RADIUS_M),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Road segments near a point ("roads near me"), nearest first, with their projects
+    """
+    rows = (await db.execute(nearest_segments_query(lat, lon, radius_m, limit))).mappings().all()
+    return [NearestRoad(**row) for row in rows]
+
+
+@router.post("/snap", response_model=SnapResponse)
+async def snap_points(
+    request: SnapRequest,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Nearest road within radius_m for each of many points, e.g. an imported
+    complaint dataset. Results are in input order.
+    """
+    points = [(point.lat, point.lon) for point in request.points]
+    matches = {}
+
+    # Each statement is one index-driven lateral join over a chunk of points
+    for start in range(0, len(points), settings.SNAP_CHUNK_SIZE):
+        chunk = points[start:start + settings.SNAP_CHUNK_SIZE]
+        rows = (await db.execute(snap_points_query(chunk, request.radius_m))).mappings().all()
+        for row in rows:
+            row = dict(row)
+            matches[start + row.pop("idx")] = NearestRoad(**row)
+
+    return SnapResponse(
+        radius_m=request.radius_m,
+        matched=len(matches),
+        results=[
+            SnapResult(index=index, lat=lat, lon=lon, match=matches.get(index))
+            for index, (lat, lon) in enumerate(points)
+        ]
+    )
@@ -0,0 +1,159 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from collections import defaultdict
+from typing import Dict, List, Optional
+from app.database import get_read_db
+from app.models import ProjectStatus, RoadType
+from app.models.stats_rollup import ALL, StatsRollup, MonthlyStatsRollup
+from app.schemas.stats import ProjectStats, MonthlyStats, MonthlyStatsPoint, SpendSeries
+from app.core.ledger import district_scope, monthly_spend_query, spend_series
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Every endpoint here reads the rollup tables maintained by app.core.stats_rollup,
+# touching at most (statuses x road types) rows per region regardless of how
+# many projects exist.
+
+
+def summarize(rows: List[StatsRollup], state: Optional[str] = None, district: Optional[str] = None) -> ProjectStats:
+    """
+    Fold one region's rollup rows into dashboard totals
+    """
+    by_status: Dict[str, int] = defaultdict(int)
+    by_road_type: Dict[str, int] = defaultdict(int)
+    total_cost = 0.0
+    total_disbursed = 0.0
+    total_reports = 0
+    
+    for row in rows:
+        by_status[row.status] += row.project_count
+        by_road_type[row.road_type] += row.project_count
+        total_cost += float(row.sanctioned_cost)
+        total_disbursed += float(row.total_disbursed)
+        total_reports += row.report_count
+    
+    return ProjectStats(
+        state=state,
+        district=district,
+        total_projects=sum(by_status.values()),
+        total_cost=total_cost,
+        total_disbursed=total_disbursed,
+        completed_projects=by_status[ProjectStatus.COMPLETED.value],
+        active_projects=by_status[ProjectStatus.ACTIVE.value],
+        delayed_projects=by_status[ProjectStatus.DELAYED.value],
+        total_reports=total_reports,
+        by_status=dict(by_status),
+        by_road_type=dict(by_road_type)
+    )
+
+
+def region_rows(db: Session, state: str, district: str) -> List[StatsRollup]:
+    return db.execute(
+        select(StatsRollup).where(StatsRollup.state == state, StatsRollup.district == district)
+    ).scalars().all()
+
+
+def child_counts(db: Session, state: str) -> Dict[str, int]:
+    """Project counts one level down: per state nationally, per district within a state"""
+    if state == ALL:
+        child, where = StatsRollup.state, (StatsRollup.state != ALL, StatsRollup.district == ALL)
+    else:
+        child, where = StatsRollup.district, (StatsRollup.state == state, StatsRollup.district != ALL)
+    
+    rows = db.execute(
+        select(child, func.sum(StatsRollup.project_count)).where(*where).group_by(child)
+    ).all()
+    return {name: int(count) for name, count in rows}
+
+
+@router.get("/", response_model=ProjectStats)
+def get_national_stats(db: Session = Depends(get_read_db)):
+    """
+    National totals with a per-state breakdown
+    """
+    stats = summarize(region_rows(db, ALL, ALL))
+    stats.by_state = child_counts(db, ALL)
+    return stats
+
+
+@router.get("/states/{state}", response_model=ProjectStats)
+def get_state_stats(state: str, db: Session = Depends(get_read_db)):
+    """
+    State totals with a per-district breakdown
+    """
+    rows = region_rows(db, state, ALL)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No projects in this state")
+    
+    stats = summarize(rows, state=state)
+    stats.by_district = child_counts(db, state)
+    return stats
+
+
+@router.get("/states/{state}/districts/{district}", response_model=ProjectStats)
+def get_district_stats(state: str, district: str, db: Session = Depends(get_read_db)):
+    """
+    District totals
+    """
+    rows = region_rows(db, state, district)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No projects in this district")
+    
+    return summarize(rows, state=state, district=district)
+
+
+@router.get("/states/{state}/districts/{district}/spend", response_model=SpendSeries)
+def get_district_spend(state: str, district: str, db: Session = Depends(get_read_db)):
+    """
+    Cumulative disbursements per month across the district's projects,
+    against their combined sanctioned cost
+    """
+    rows = region_rows(db, state, district)
+    if not rows:
+        raise HTTPException(status_code=404, detail="No projects in this district")
+    
+    scope = district_scope(state, district)
+    sanctioned = sum(row.sanctioned_cost for row in rows)
+    return SpendSeries(**spend_series(scope, db.execute(monthly_spend_query(scope)).all(), sanctioned))
+
+
+@router.get("/monthly", response_model=MonthlyStats)
+def get_monthly_stats(
+    state: Optional[str] = Query(None),
+    district: Optional[str] = Query(None),
+    status: Optional[ProjectStatus] = Query(None),
+    road_type: Optional[RoadType] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Projects sanctioned per month, nationally or for a state/district
+    """
+    if district and not state:
+        raise HTTPException(status_code=400, detail="district requires state")
+    
+    query = (
+        select(
+            MonthlyStatsRollup.month,
+            func.sum(MonthlyStatsRollup.project_count),
+            func.sum(MonthlyStatsRollup.sanctioned_cost)
+        )
+        .where(
+            MonthlyStatsRollup.state == (state or ALL),
+            MonthlyStatsRollup.district == (district or ALL)
+        )
+        .group_by(MonthlyStatsRollup.month)
+        .order_by(MonthlyStatsRollup.month)
+    )
+    if status:
+        query = query.where(MonthlyStatsRollup.status == status.value)
+    if road_type:
+        query = query.where(MonthlyStatsRollup.road_type == road_type.value)
+    
+    points = [
+        MonthlyStatsPoint(month=month, project_count=count, sanctioned_cost=float(cost))
+        for month, count, cost in db.execute(query).all()
+    ]
+    return MonthlyStats(state=state, district=district, points=points)
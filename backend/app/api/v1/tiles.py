@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from typing import Optional
+from app.database import get_read_db
+from app.models import Project, RoadSegment, Firm, ProjectStatus, RoadType
+from app.core.cache import get_or_set
+from app.core.invalidation import search_tags
+from app.core.http_cache import cached_body_response, versioned
+from app.config import settings
+from app.utils.geojson import feature_property_columns, select_level
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MVT_LAYER_NAME = "road_segments"
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+MAX_ZOOM = 22
+
+
+def build_tile_query(
+    z: int,
+    x: int,
+    y: int,
+    status: Optional[ProjectStatus] = None,
+    road_type: Optional[RoadType] = None,
+    district: Optional[str] = None
+):
+    """
+    Build a single statement that clips, encodes and aggregates one tile in PostGIS
+    """
+    # Tile bounds in Web Mercator; segments are stored in WGS84, so the index
+    # lookup uses the envelope transformed back to 4326
+    envelope = func.ST_TileEnvelope(z, x, y)
+    envelope_4326 = func.ST_Transform(envelope, 4326)
+
+    # Low zooms read the precomputed simplified geometry instead of every vertex
+    geometry = RoadSegment.geometry_column(select_level(zoom=z))
+
+    features = (
+        select(
+            func.ST_AsMVTGeom(
+                func.ST_Transform(geometry, 3857),
+                envelope,
+                MVT_EXTENT,
+                MVT_BUFFER,
+                True
+            ).label("geom"),
+            *feature_property_columns()
+        )
+        .select_from(RoadSegment)
+        .join(Project, RoadSegment.project)
+        .outerjoin(Firm, Project.contractor)
+        .where(geometry.intersects(envelope_4326))
+    )
+
+    # Same filters as the GeoJSON search feed
+    if status:
+        features = features.where(Project.status == status)
+    if road_type:
+        features = features.where(Project.road_type == road_type)
+    if district:
+        features = features.where(Project.district.ilike(f"%{district}%"))
+
+    features = features.subquery("features")
+
+    return select(
+        func.ST_AsMVT(features.table_valued(), MVT_LAYER_NAME, MVT_EXTENT, "geom")
+    ).select_from(features)
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+def get_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=MAX_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    status: Optional[ProjectStatus] = Query(None),
+    road_type: Optional[RoadType] = Query(None),
+    district: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Serve road segments as a Mapbox Vector Tile for the map
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    def render() -> list:
+        tile = db.execute(build_tile_query(z, x, y, status, road_type, district)).scalar()
+        return versioned(bytes(tile) if tile else b"")
+
+    # Invalidated on project and segment writes, same as the search feed.
+    # Cache-Control comes from app.core.http_cache.
+    entry = get_or_set(
+        f"tile:{z}:{x}:{y}:{status}:{road_type}:{district}:etag",
+        render,
+        ttl=settings.CACHE_TILE_TTL,
+        tags=search_tags(district)
+    )
+
+    return cached_body_response(request, entry, MVT_MEDIA_TYPE)
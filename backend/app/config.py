@@ -3,6 +3,12 @@ from typing import List
 import os
 
 
+def to_async_url(url: str) -> str:
+    """Same database, asyncpg driver"""
+    _, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}"
+
+
 class Settings(BaseSettings):
     # App
     APP_NAME: str = "RoadTrack"
@@ -11,15 +17,61 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str = ""  # Defaults to DATABASE_URL with the asyncpg driver
+    DB_POOL_SIZE: int = 10  # Per engine, per worker
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Replace connections before proxies/LBs drop them
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_ECHO: bool = False
+    DATABASE_REPLICA_URLS: str = ""  # Comma-separated; public reads go here when set
+    REPLICA_MAX_LAG_SECONDS: float = 1.5  # Keep below CACHE_INVALIDATION_REPEAT_DELAY so replica-filled caches get re-dropped
+    REPLICA_LAG_CHECK_INTERVAL: float = 1.0
+    REPLICA_RETRY_AFTER: int = 30  # Seconds a failed replica is skipped
+    READ_YOUR_WRITES_WINDOW: int = 30  # Seconds after a write that reads check replica progress
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600  # 1 hour
+    CACHE_REDIS_TIMEOUT: float = 0.5  # Seconds before a Redis call is treated as a miss
+    CACHE_L1_MAX_ITEMS: int = 2048  # In-process LRU entries per worker
+    CACHE_L1_TTL: int = 30  # Max seconds a worker trusts its local copy
+    CACHE_STALE_TTL: int = 300  # Serve expired values this long while one worker recomputes
+    CACHE_LOCK_TIMEOUT: float = 10.0  # Max seconds a recompute may hold the single-flight lock
+    CACHE_TAG_TTL: int = 86400  # Tag membership sets outlive the entries they point to
+    CACHE_INVALIDATION_REPEAT_DELAY: float = 2.0  # Second invalidation pass for in-flight recomputes
+    CACHE_DETAIL_TTL: int = 6 * 3600  # Entries are invalidated on write, so TTLs can be long
+    CACHE_SEARCH_TTL: int = 3 * 3600
+    CACHE_TILE_TTL: int = 6 * 3600
+    CACHE_COUNT_TTL: int = 3600  # Cached exact totals for offset pagination
+    
+    # Instrumentation
+    QUERY_BUDGET: int = 20  # Warn when a request runs more SQL statements than this
+    N_PLUS_ONE_THRESHOLD: int = 10  # Warn when one statement runs this many times in a request
+    
+    # HTTP caching and compression
+    ETAG_HASH_MAX_BYTES: int = 1024 * 1024  # Uncached bodies up to this size are hashed for an ETag
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Higher levels cost far more CPU for little gain on JSON
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL: int = 60  # Seconds a resolved user is reused; revocations still apply at once
+    PASSWORD_HASH_WORKERS: int = 4  # bcrypt threads per API worker
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Logins waiting for a bcrypt thread before new ones get 503
+    LOGIN_THROTTLE_WINDOW: int = 900  # Seconds failed logins are counted for
+    LOGIN_MAX_FAILURES_PER_ACCOUNT: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 30
+    
+    # Dataset exports
+    EXPORT_MAX_CONCURRENT: int = 4  # Live export streams per API worker; more get 503
+    EXPORT_STATEMENT_TIMEOUT_MS: int = 3600000  # Exports outlive the normal request timeout
+    EXPORT_SNAPSHOT_PREFIX: str = "exports"  # Object storage prefix for nightly snapshots
+    EXPORT_MANIFEST_TTL: int = 300
     
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
@@ -28,6 +80,9 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     ALLOWED_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "pdf", "xlsx", "csv"]
+    IMPORT_EXTENSIONS: List[str] = ["csv", "xlsx"]
+    MAX_IMPORT_SIZE: int = 209715200  # 200MB; sanction lists run to hundreds of thousands of rows
+    IMPORT_CHUNK_SIZE: int = 5000  # Rows validated and loaded per transaction
     
     # MinIO / S3
     MINIO_ENDPOINT: str = "localhost:9000"
@@ -35,6 +90,7 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET: str = "roadtrack-uploads"
     MINIO_USE_SSL: bool = False
+    MINIO_PUBLIC_ENDPOINT: str = ""  # Host clients reach storage on, if not MINIO_ENDPOINT
     
     # Cloudflare R2 (Production)
     R2_ACCOUNT_ID: str = ""
@@ -42,6 +98,37 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: str = ""
     R2_BUCKET: str = ""
     
+    # Direct-to-storage document uploads
+    MAX_DOCUMENT_SIZE: int = 5 * 1024 ** 3  # 5GB
+    UPLOAD_PART_SIZE: int = 16 * 1024 * 1024  # S3 needs >= 5MB for all but the last part
+    PRESIGNED_URL_EXPIRY: int = 3600  # Seconds
+    PUBLIC_MEDIA_URL: str = ""  # CDN / public bucket base for report photos; presigned URLs if empty
+    
+    # Public report write buffering
+    REPORT_FLUSH_INTERVAL: float = 1.0  # Seconds between flushes of queued reports and upvotes
+    REPORT_FLUSH_BATCH: int = 1000  # Max queued reports inserted per statement
+    UPVOTE_DEDUPE_TTL: int = 30 * 86400  # How long one device/IP can't upvote the same report again
+    REPORT_EXISTS_TTL: int = 3600  # Cached report existence checks for upvotes
+    SUBMISSION_STATUS_TTL: int = 86400  # How long a queued submission's report id can be looked up
+
+    # Derived-table refreshes (rollups, scorecards, map clusters)
+    REFRESH_INTERVAL: float = 1.0  # Seconds between drains of the refresh queue
+    REFRESH_LOCK_TIMEOUT: int = 300  # Max seconds one drain may run before another worker takes over
+    REFRESH_MAX_ATTEMPTS: int = 5  # Failed batches are then left to the nightly rebuild
+
+    # Report photo derivatives
+    IMAGE_WORKERS: int = 2  # Decode/resize processes per API worker
+    PHOTO_THUMBNAIL_SIZE: int = 320  # Longest edge, pixels
+    PHOTO_MEDIUM_SIZE: int = 1280
+    PHOTO_WEBP_QUALITY: int = 80
+    PHOTO_MAX_PIXELS: int = 50_000_000  # Reject decompression bombs
+    
+    # Nearest-road lookup
+    NEAREST_MAX_RADIUS_M: float = 5000
+    REPORT_SNAP_RADIUS_M: float = 150  # How far a GPS-tagged report may be from the road it is attached to
+    SNAP_MAX_POINTS: int = 5000  # Points per batch snap request
+    SNAP_CHUNK_SIZE: int = 500  # Points per snapping statement
+    
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
@@ -56,6 +143,14 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
         return self.CORS_ORIGINS
     
+    @property
+    def async_database_url(self) -> str:
+        return self.ASYNC_DATABASE_URL or to_async_url(self.DATABASE_URL)
+    
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     @property
     def use_s3(self) -> bool:
         """Determine if we should use S3/R2 instead of local storage"""
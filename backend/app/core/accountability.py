@@ -0,0 +1,360 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import (
+    Integer, String, column, delete, event, func, inspect, insert, literal, literal_column, or_, select, tuple_,
+    union_all, values
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.models import Firm, Minister, Official, Project
+from app.models.accountability_edge import AccountabilityEdge, NodeKind
+import logging
+
+logger = logging.getLogger(__name__)
+
+Node = Tuple[str, int]  # (NodeKind value, id)
+
+# Project foreign key holding each role
+ROLE_COLUMNS = {
+    NodeKind.MINISTER: "minister_id",
+    NodeKind.OFFICIAL: "approving_official_id",
+    NodeKind.CONTRACTOR: "contractor_id",
+    NodeKind.MAINTENANCE_FIRM: "maintenance_firm_id",
+}
+
+NAME_SOURCES = {
+    NodeKind.MINISTER: Minister,
+    NodeKind.OFFICIAL: Official,
+    NodeKind.CONTRACTOR: Firm,
+    NodeKind.MAINTENANCE_FIRM: Firm,
+}
+
+# Read bounds: neighbours followed per node and hop, nodes carried into the
+# next hop, hops, and nodes returned in all. Together they cap every
+# traversal at a few thousand index entries, and the project and name
+# lookups that follow at MAX_REACHED nodes, however many projects a node has.
+HOP_FANOUT = 25
+MAX_FRONTIER = 200
+MAX_HOPS = 3
+MAX_REACHED = 500
+
+
+def role_column(kind: NodeKind):
+    return getattr(Project, ROLE_COLUMNS[kind])
+
+
+# --- Maintenance -----------------------------------------------------------
+
+def _pairs(nodes: Iterable[Node]) -> List[Tuple[Node, Node]]:
+    """Ordered pairs of distinct roles on one project (both directions)"""
+    nodes = list(nodes)
+    return [(a, b) for a in nodes for b in nodes if a[0] != b[0]]
+
+
+def apply_deltas(conn: Connection, deltas: Dict[Tuple[Node, Node], Tuple[int, Decimal]]) -> None:
+    """Add project count/cost deltas to edges, dropping edges that reach zero"""
+    deltas = {pair: delta for pair, delta in deltas.items() if delta != (0, 0)}
+    if not deltas:
+        return
+
+    rows = [
+        {
+            "source_kind": a[0], "source_id": a[1], "target_kind": b[0], "target_id": b[1],
+            "project_count": count, "sanctioned_cost": cost,
+        }
+        # Fixed order so concurrent writers lock rows in the same sequence
+        for (a, b), (count, cost) in sorted(deltas.items())
+    ]
+    stmt = pg_insert(AccountabilityEdge).values(rows)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[
+            AccountabilityEdge.source_kind, AccountabilityEdge.source_id,
+            AccountabilityEdge.target_kind, AccountabilityEdge.target_id,
+        ],
+        set_={
+            "project_count": AccountabilityEdge.project_count + stmt.excluded.project_count,
+            "sanctioned_cost": AccountabilityEdge.sanctioned_cost + stmt.excluded.sanctioned_cost,
+            "updated_at": func.now(),
+        }
+    ))
+    conn.execute(
+        delete(AccountabilityEdge)
+        .where(
+            tuple_(
+                AccountabilityEdge.source_kind, AccountabilityEdge.source_id,
+                AccountabilityEdge.target_kind, AccountabilityEdge.target_id,
+            ).in_([(a[0], a[1], b[0], b[1]) for a, b in deltas]),
+            AccountabilityEdge.project_count <= 0
+        )
+    )
+
+
+def _project_roles(where):
+    """(project, role kind, node id, cost) for every filled role of projects matching where"""
+    return union_all(*[
+        select(
+            Project.id.label("project_id"),
+            literal(kind.value, String).label("kind"),
+            role_column(kind).label("node_id"),
+            func.coalesce(Project.sanctioned_cost, 0).label("cost"),
+        ).where(role_column(kind).is_not(None), *where)
+        for kind in NodeKind
+    ]).cte("roles")
+
+
+def _edge_source(where, touching: Optional[Set[Node]] = None):
+    roles = _project_roles(where)
+    a, b = roles.alias("a"), roles.alias("b")
+    query = (
+        select(a.c.kind, a.c.node_id, b.c.kind, b.c.node_id, func.count(), func.sum(a.c.cost))
+        .join(b, (b.c.project_id == a.c.project_id) & (b.c.kind != a.c.kind))
+        .group_by(a.c.kind, a.c.node_id, b.c.kind, b.c.node_id)
+    )
+    if touching:
+        nodes = sorted(touching)
+        query = query.where(or_(
+            tuple_(a.c.kind, a.c.node_id).in_(nodes),
+            tuple_(b.c.kind, b.c.node_id).in_(nodes)
+        ))
+    return query
+
+
+EDGE_COLUMNS = ["source_kind", "source_id", "target_kind", "target_id", "project_count", "sanctioned_cost"]
+
+
+def refresh_nodes(conn: Connection, nodes: Iterable[Node]) -> None:
+    """
+    Recompute every edge touching the given nodes from their projects.
+
+    Used after Core writes (bulk import) that bypass the session hooks.
+    """
+    nodes = sorted({(kind, node_id) for kind, node_id in nodes if node_id})
+    if not nodes:
+        return
+
+    by_kind: Dict[NodeKind, List[int]] = defaultdict(list)
+    for kind, node_id in nodes:
+        by_kind[NodeKind(kind)].append(node_id)
+    involved = or_(*[role_column(kind).in_(ids) for kind, ids in by_kind.items()])
+
+    source = tuple_(AccountabilityEdge.source_kind, AccountabilityEdge.source_id)
+    target = tuple_(AccountabilityEdge.target_kind, AccountabilityEdge.target_id)
+    conn.execute(delete(AccountabilityEdge).where(or_(source.in_(nodes), target.in_(nodes))))
+    conn.execute(insert(AccountabilityEdge).from_select(
+        EDGE_COLUMNS, _edge_source((involved,), touching=set(nodes))
+    ))
+
+
+def project_nodes(conn: Connection, project_ids: Iterable[int]) -> Set[Node]:
+    """Every party currently on the given projects"""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return set()
+    rows = conn.execute(
+        select(*[role_column(kind) for kind in NodeKind]).where(Project.id.in_(project_ids))
+    ).all()
+    return {
+        (kind.value, node_id)
+        for row in rows
+        for kind, node_id in zip(NodeKind, row)
+        if node_id is not None
+    }
+
+
+def refresh_all(conn: Connection) -> None:
+    """Rebuild the whole graph; run nightly to repair anything the incremental path missed"""
+    conn.execute(delete(AccountabilityEdge))
+    conn.execute(insert(AccountabilityEdge).from_select(EDGE_COLUMNS, _edge_source(())))
+
+
+def _load_replaced_value(target, value, oldvalue, initiator):
+    pass  # Registering with active_history is the point; see below
+
+
+# Without active history, assigning an expired or unloaded column records no
+# old value, and the edges of the role it replaces would never be decremented
+for _attribute in (*ROLE_COLUMNS.values(), "sanctioned_cost"):
+    event.listen(getattr(Project, _attribute), "set", _load_replaced_value, active_history=True)
+
+
+def _roles_before_and_after(session: Session, project: Project):
+    """(nodes, cost) of a project as it was before and after this flush"""
+    state = inspect(project)
+
+    def value_before(attribute):
+        # Active history (above) means an empty deleted list is a genuine NULL
+        history = state.attrs[attribute].history
+        if history.has_changes():
+            return history.deleted[0] if history.deleted else None
+        return getattr(project, attribute)
+
+    before = after = ((), 0)
+    if project not in session.new:
+        before = (
+            [(kind.value, value_before(attr)) for kind, attr in ROLE_COLUMNS.items() if value_before(attr)],
+            value_before("sanctioned_cost") or 0
+        )
+    if project not in session.deleted:
+        after = (
+            [(kind.value, getattr(project, attr)) for kind, attr in ROLE_COLUMNS.items() if getattr(project, attr)],
+            project.sanctioned_cost or 0
+        )
+    return before, after
+
+
+@event.listens_for(Session, "after_flush")
+def _update_edges(session: Session, flush_context) -> None:
+    """
+    Apply each changed project's edge deltas in the same transaction.
+
+    A project write touches at most 12 edges, so keeping the graph current
+    costs the same for a first-time official as for the most prolific one.
+    """
+    deltas: Dict[Tuple[Node, Node], List] = defaultdict(lambda: [0, Decimal(0)])
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Project):
+            continue
+        (old_nodes, old_cost), (new_nodes, new_cost) = _roles_before_and_after(session, obj)
+        if old_nodes == new_nodes and old_cost == new_cost:
+            continue
+        for pair in _pairs(old_nodes):
+            deltas[pair][0] -= 1
+            deltas[pair][1] -= Decimal(str(old_cost))
+        for pair in _pairs(new_nodes):
+            deltas[pair][0] += 1
+            deltas[pair][1] += Decimal(str(new_cost))
+
+    if deltas:
+        apply_deltas(session.connection(), {pair: tuple(delta) for pair, delta in deltas.items()})
+
+
+# --- Reads -------------------------------------------------------------------
+
+def neighbours(
+    db: Session,
+    nodes: List[Node],
+    target_kinds: Optional[Iterable[NodeKind]] = None,
+    limit: int = HOP_FANOUT
+) -> Dict[Node, List[Tuple[Node, int, Decimal]]]:
+    """
+    Top neighbours of each node by co-occurrence, per target kind.
+
+    One statement; each (node, kind) is an index range scan that stops after
+    limit entries.
+    """
+    kinds = list(target_kinds or NodeKind)
+    probes = [(kind, node_id, target.value) for kind, node_id in nodes for target in kinds if target.value != kind]
+    if not probes:
+        return {}
+
+    inputs = values(
+        column("kind", String), column("node_id", Integer), column("target_kind", String), name="probes"
+    ).data(probes)
+    edges = (
+        select(
+            AccountabilityEdge.target_kind,
+            AccountabilityEdge.target_id,
+            AccountabilityEdge.project_count,
+            AccountabilityEdge.sanctioned_cost,
+        )
+        .where(
+            AccountabilityEdge.source_kind == inputs.c.kind,
+            AccountabilityEdge.source_id == inputs.c.node_id,
+            AccountabilityEdge.target_kind == inputs.c.target_kind,
+        )
+        .order_by(AccountabilityEdge.project_count.desc(), AccountabilityEdge.target_id)
+        .limit(limit)
+        .lateral("edges")
+    )
+    rows = db.execute(
+        select(inputs.c.kind, inputs.c.node_id, edges).select_from(inputs).join(edges, literal_column("true"))
+    ).all()
+
+    result: Dict[Node, List[Tuple[Node, int, Decimal]]] = defaultdict(list)
+    for kind, node_id, target_kind, target_id, count, cost in rows:
+        result[(kind, node_id)].append(((target_kind, target_id), count, cost))
+    for found in result.values():
+        found.sort(key=lambda item: (-item[1], item[0]))
+    return result
+
+
+def reachable(db: Session, start: Node, hops: int, fanout: int = HOP_FANOUT) -> Dict[Node, Tuple[int, int]]:
+    """
+    Nodes within hops of start -> (hop, co-occurrence with the node it was reached from).
+
+    Each hop follows the fanout strongest edges of at most MAX_FRONTIER nodes,
+    and the walk stops once MAX_REACHED nodes are found, keeping the
+    strongest of the last hop.
+    """
+    found: Dict[Node, Tuple[int, int]] = {start: (0, 0)}
+    frontier = [start]
+    for hop in range(1, min(hops, MAX_HOPS) + 1):
+        reached: Dict[Node, int] = {}
+        for edges in neighbours(db, frontier, limit=fanout).values():
+            for node, count, _ in edges:
+                if node not in found:
+                    reached[node] = max(count, reached.get(node, 0))
+        if not reached:
+            break
+        strongest = sorted(reached, key=lambda node: (-reached[node], node))[:MAX_REACHED - len(found)]
+        for node in strongest:
+            found[node] = (hop, reached[node])
+        if len(found) >= MAX_REACHED:
+            break
+        frontier = strongest[:MAX_FRONTIER]
+    return found
+
+
+def projects_of(db: Session, nodes: Iterable[Node], limit: int, before_id: Optional[int] = None) -> List[int]:
+    """
+    Newest project ids involving any of the nodes.
+
+    Reads at most limit ids per node from the (role, id) indexes, so the cost
+    is independent of how many projects each node has.
+    """
+    by_kind: Dict[NodeKind, Set[int]] = defaultdict(set)
+    for kind, node_id in nodes:
+        by_kind[NodeKind(kind)].add(node_id)
+    if not by_kind:
+        return []
+
+    branches = []
+    for kind, ids in by_kind.items():
+        inputs = values(column("node_id", Integer), name=f"{kind.value}_ids").data([(i,) for i in sorted(ids)])
+        criteria = [role_column(kind) == inputs.c.node_id]
+        if before_id is not None:
+            criteria.append(Project.id < before_id)
+        newest = select(Project.id).where(*criteria).order_by(Project.id.desc()).limit(limit).lateral()
+        branches.append(select(newest.c.id).select_from(inputs).join(newest, literal_column("true")))
+
+    ids = union_all(*branches).subquery("ids")
+    return list(db.execute(
+        select(ids.c.id).distinct().order_by(ids.c.id.desc()).limit(limit)
+    ).scalars())
+
+
+def node_names(db: Session, nodes: Iterable[Node]) -> Dict[Node, str]:
+    """Display names, one IN lookup per kind"""
+    by_kind: Dict[NodeKind, Set[int]] = defaultdict(set)
+    for kind, node_id in nodes:
+        by_kind[NodeKind(kind)].add(node_id)
+
+    names: Dict[Node, str] = {}
+    for kind, ids in by_kind.items():
+        model = NAME_SOURCES[kind]
+        for node_id, name in db.execute(select(model.id, model.name).where(model.id.in_(ids))):
+            names[(kind.value, node_id)] = name
+    return names
+
+
+if __name__ == "__main__":
+    # Nightly full rebuild, e.g. from cron: python -m app.core.accountability
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as connection:
+        refresh_all(connection)
+    logger.info("Accountability graph rebuilt")
@@ -0,0 +1,702 @@
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from uuid import UUID
+import asyncio
+import logging
+import queue
+import threading
+import time
+import weakref
+
+import msgpack
+import redis
+import redis.asyncio as aioredis
+
+from app.config import settings
+from app.core.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Poll interval while waiting for another worker to fill a key
+WAIT_INTERVAL = 0.05
+
+# Pub/sub channel telling every worker to drop invalidated keys from L1
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Seconds the listener blocks per poll, and between pings on its idle connection
+LISTENER_POLL_INTERVAL = 1.0
+LISTENER_HEALTH_CHECK_INTERVAL = 30
+
+# Tags can be given up front or derived from the computed value
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]], None]
+
+
+class CacheEntry:
+    """A cached value with its freshness deadline and the point it may no longer be served stale"""
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+
+class LRUCache:
+    """Size-bounded, thread-safe in-process cache (L1)"""
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if now >= entry.stale_until:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                stats.incr("l1_evictions")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class CacheStats:
+    """Process-wide hit/miss/latency counters"""
+
+    COUNTERS = (
+        "l1_hits", "l2_hits", "misses", "stale_served", "recomputes",
+        "lock_waits", "l1_evictions", "invalidated_keys", "errors"
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.counters = {name: 0 for name in self.COUNTERS}
+        self.timings = {
+            "l2_get": [0, 0.0, 0.0],  # count, total ms, max ms
+            "recompute": [0, 0.0, 0.0],
+        }
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            timing = self.timings[name]
+            timing[0] += 1
+            timing[1] += elapsed_ms
+            timing[2] = max(timing[2], elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.counters["l1_hits"] + self.counters["l2_hits"] + self.counters["misses"]
+            hits = self.counters["l1_hits"] + self.counters["l2_hits"]
+            return {
+                **self.counters,
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+                "latency_ms": {
+                    name: {
+                        "count": count,
+                        "avg": round(total / count, 3) if count else None,
+                        "max": round(peak, 3),
+                    }
+                    for name, (count, total, peak) in self.timings.items()
+                },
+            }
+
+
+stats = CacheStats()
+_l1 = LRUCache(settings.CACHE_L1_MAX_ITEMS)
+_redis: Optional[redis.Redis] = None
+
+# One lock per key currently being recomputed in this process
+_key_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_key_locks_guard = threading.Lock()
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis client (uses hiredis for parsing when it is installed)"""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+    return _redis
+
+
+def _default(value: Any) -> Any:
+    """msgpack fallback for types FastAPI responses commonly contain"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _encode(entry: CacheEntry) -> bytes:
+    return msgpack.packb(
+        [entry.fresh_until, entry.stale_until, entry.value],
+        default=_default,
+        use_bin_type=True,
+    )
+
+
+def _decode(raw: bytes) -> CacheEntry:
+    fresh_until, stale_until, value = msgpack.unpackb(raw, raw=False)
+    return CacheEntry(value, fresh_until, stale_until)
+
+
+def _lookup(key: str) -> Tuple[Optional[CacheEntry], str]:
+    """
+    Find an entry in L1, then L2. Returns the entry and the tier it came from.
+
+    A stale local copy is only returned when L2 has nothing better.
+    """
+    local = _l1.get(key)
+    if local is not None and local.is_fresh(time.time()):
+        return local, "l1"
+
+    started = time.perf_counter()
+    try:
+        raw = get_redis().get(key)
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return local, "miss"
+    finally:
+        stats.observe("l2_get", (time.perf_counter() - started) * 1000)
+
+    if raw is None:
+        return local, "miss"
+
+    entry = _decode(raw)
+    if time.time() >= entry.stale_until:
+        return local, "miss"
+
+    _promote(key, entry)
+    return entry, "l2"
+
+
+def _promote(key: str, entry: CacheEntry) -> None:
+    """Keep a local copy, never trusting it for longer than CACHE_L1_TTL"""
+    local_fresh = min(entry.fresh_until, time.time() + settings.CACHE_L1_TTL)
+    _l1.set(key, CacheEntry(entry.value, local_fresh, max(local_fresh, entry.stale_until)))
+
+
+def _record(tier: str, fresh: bool) -> None:
+    record_cache(fresh)
+    if fresh and tier == "l1":
+        stats.incr("l1_hits")
+    elif fresh and tier == "l2":
+        stats.incr("l2_hits")
+    else:
+        stats.incr("misses")
+
+
+def get_cache(key: str) -> Any:
+    """Get a fresh cached value, or None"""
+    entry, tier = _lookup(key)
+    fresh = entry is not None and entry.is_fresh(time.time())
+    _record(tier, fresh)
+    return entry.value if fresh else None
+
+
+def _tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def set_cache(key: str, value: Any, ttl: Optional[int] = None, tags: Tags = None) -> None:
+    """
+    Store a value in both tiers. Past ttl it may still be served stale for CACHE_STALE_TTL.
+
+    tags name what the value was built from (see app.core.invalidation);
+    invalidating any of them drops the entry everywhere.
+    """
+    ttl = ttl or settings.REDIS_CACHE_TTL
+    now = time.time()
+    entry = CacheEntry(value, now + ttl, now + ttl + settings.CACHE_STALE_TTL)
+    if callable(tags):
+        tags = tags(value)
+
+    _promote(key, entry)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.set(key, _encode(entry), ex=ttl + settings.CACHE_STALE_TTL)
+        for tag in set(tags or ()):
+            pipe.sadd(_tag_key(tag), key)
+            pipe.expire(_tag_key(tag), settings.CACHE_TAG_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+def delete_cache(key: str) -> None:
+    """Remove a key from both tiers"""
+    _l1.delete(key)
+    try:
+        get_redis().delete(key)
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.warning(f"Cache delete failed for {key}: {e}")
+
+
+def _drop_tagged(tags: Iterable[str]) -> None:
+    client = get_redis()
+    keys = set()
+    for tag in tags:
+        keys.update(member.decode() for member in client.smembers(_tag_key(tag)))
+
+    pipe = client.pipeline(transaction=False)
+    for tag in tags:
+        pipe.delete(_tag_key(tag))
+    if keys:
+        pipe.delete(*keys)
+        pipe.publish(INVALIDATION_CHANNEL, msgpack.packb(sorted(keys), use_bin_type=True))
+    pipe.execute()
+
+    for key in keys:
+        _l1.delete(key)
+    stats.incr("invalidated_keys", len(keys))
+
+
+def invalidate_tags(tags: Iterable[str]) -> None:
+    """
+    Drop every cached entry that depends on any of tags, in Redis and in every worker's L1.
+
+    The drop is repeated after CACHE_INVALIDATION_REPEAT_DELAY so a value that
+    was being recomputed from pre-write data while the write committed does
+    not survive for its whole TTL. Repeats run on one background thread.
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return
+
+    try:
+        _drop_tagged(tags)
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.error(f"Cache invalidation failed for {tags}: {e}")
+    _schedule_repeat(tags)
+
+
+# Repeat passes queued by invalidate_tags, as (due on the monotonic clock, tags).
+# The delay is constant, so the queue is already in due order.
+_repeats: "queue.SimpleQueue[Tuple[float, List[str]]]" = queue.SimpleQueue()
+_repeat_worker: Optional[threading.Thread] = None
+_repeat_worker_guard = threading.Lock()
+
+
+def _schedule_repeat(tags: List[str]) -> None:
+    global _repeat_worker
+    _repeats.put((time.monotonic() + settings.CACHE_INVALIDATION_REPEAT_DELAY, tags))
+    if _repeat_worker is None:
+        with _repeat_worker_guard:
+            if _repeat_worker is None:
+                _repeat_worker = threading.Thread(target=_run_repeats, name="cache-invalidation-repeat", daemon=True)
+                _repeat_worker.start()
+
+
+def _run_repeats() -> None:
+    """Replay queued invalidations once due, merging everything due together into one pass"""
+    held = None
+    while True:
+        due, tags = held or _repeats.get()
+        held = None
+        time.sleep(max(0.0, due - time.monotonic()))
+
+        batch = set(tags)
+        while held is None:
+            try:
+                item = _repeats.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] <= time.monotonic():
+                batch.update(item[1])
+            else:
+                held = item
+
+        try:
+            _drop_tagged(sorted(batch))
+        except redis.RedisError as e:
+            stats.incr("errors")
+            logger.error(f"Repeated cache invalidation failed for {sorted(batch)}: {e}")
+        except Exception:
+            logger.exception("Repeated cache invalidation failed")
+
+
+def _listener_client() -> redis.Redis:
+    """
+    Client for the invalidation subscriber. A quiet channel is normal, so
+    reads must not time out like the shared client's do; health checks
+    notice a dead connection instead.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=None,
+        socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        health_check_interval=LISTENER_HEALTH_CHECK_INTERVAL,
+    )
+
+
+def _listen_for_invalidations() -> None:
+    """Evict keys other workers invalidated from this worker's L1"""
+    client = _listener_client()
+    disconnected = False
+    while True:
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            if disconnected:
+                # Anything published while disconnected was missed
+                _l1.clear()
+                disconnected = False
+                logger.info("Cache invalidation listener reconnected")
+            while True:
+                message = pubsub.get_message(timeout=LISTENER_POLL_INTERVAL)
+                if message is not None and message["type"] == "message":
+                    for key in msgpack.unpackb(message["data"], raw=False):
+                        _l1.delete(key)
+        except redis.RedisError as e:
+            if not disconnected:
+                logger.warning(f"Cache invalidation listener disconnected: {e}")
+            disconnected = True
+            time.sleep(1)
+        finally:
+            pubsub.close()
+
+
+def start_invalidation_listener() -> None:
+    """Start the background pub/sub subscriber; call once per worker"""
+    thread = threading.Thread(target=_listen_for_invalidations, name="cache-invalidation", daemon=True)
+    thread.start()
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _key_locks_guard:
+        lock = _key_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _key_locks[key] = lock
+        return lock
+
+
+def _recompute(key: str, loader: Callable[[], Any], ttl: Optional[int], tags: Tags) -> Any:
+    stats.incr("recomputes")
+    started = time.perf_counter()
+    value = loader()
+    stats.observe("recompute", (time.perf_counter() - started) * 1000)
+    set_cache(key, value, ttl, tags)
+    return value
+
+
+def get_or_set(
+    key: str,
+    loader: Callable[[], Any],
+    ttl: Optional[int] = None,
+    tags: Tags = None
+) -> Any:
+    """
+    Return the cached value for key, computing it with loader on a miss.
+
+    Only one caller recomputes an expired key at a time: a per-key lock
+    covers threads in this process and a Redis lock covers other workers.
+    Everyone else gets the stale value if there is one, or waits up to
+    CACHE_LOCK_TIMEOUT for the recomputed value before computing it themselves.
+    """
+    entry, tier = _lookup(key)
+    if entry is not None and entry.is_fresh(time.time()):
+        _record(tier, True)
+        return entry.value
+    _record(tier, False)
+
+    local_lock = _key_lock(key)
+    if not local_lock.acquire(blocking=False):
+        # Another thread in this process is already on it
+        if entry is not None:
+            stats.incr("stale_served")
+            return entry.value
+        stats.incr("lock_waits")
+        if local_lock.acquire(timeout=settings.CACHE_LOCK_TIMEOUT):
+            local_lock.release()
+        refreshed = get_cache(key)
+        return refreshed if refreshed is not None else _recompute(key, loader, ttl, tags)
+
+    try:
+        try:
+            remote_lock = get_redis().lock(
+                f"lock:{key}",
+                timeout=settings.CACHE_LOCK_TIMEOUT,
+                blocking=False,
+            )
+            acquired = remote_lock.acquire()
+        except redis.RedisError as e:
+            stats.incr("errors")
+            logger.warning(f"Cache lock failed for {key}: {e}")
+            remote_lock, acquired = None, True
+
+        if acquired:
+            try:
+                return _recompute(key, loader, ttl, tags)
+            finally:
+                if remote_lock is not None:
+                    try:
+                        remote_lock.release()
+                    except redis.RedisError:
+                        pass  # Lock already expired; nothing to release
+
+        # Another worker holds the lock
+        if entry is not None:
+            stats.incr("stale_served")
+            return entry.value
+
+        stats.incr("lock_waits")
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            entry, _ = _lookup(key)
+            if entry is not None and entry.is_fresh(time.time()):
+                return entry.value
+
+        logger.warning(f"Timed out waiting for {key} to be recomputed")
+        return _recompute(key, loader, ttl, tags)
+    finally:
+        local_lock.release()
+
+
+# --- Async path ----------------------------------------------------------------
+# The same two tiers and locks, driven from the event loop with redis.asyncio so
+# cache traffic and lock waits never occupy threadpool tokens.
+
+_aredis: Optional[aioredis.Redis] = None
+
+# Recompute in flight on this worker's event loop, per key
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Shared asyncio Redis client; bound to the worker's event loop"""
+    global _aredis
+    if _aredis is None:
+        _aredis = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+    return _aredis
+
+
+async def close_async_redis() -> None:
+    """Close the asyncio client's connections on shutdown"""
+    global _aredis
+    if _aredis is not None:
+        await _aredis.aclose()
+        _aredis = None
+
+
+async def _alookup(key: str) -> Tuple[Optional[CacheEntry], str]:
+    """_lookup for async code"""
+    local = _l1.get(key)
+    if local is not None and local.is_fresh(time.time()):
+        return local, "l1"
+
+    started = time.perf_counter()
+    try:
+        raw = await get_async_redis().get(key)
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return local, "miss"
+    finally:
+        stats.observe("l2_get", (time.perf_counter() - started) * 1000)
+
+    if raw is None:
+        return local, "miss"
+
+    entry = _decode(raw)
+    if time.time() >= entry.stale_until:
+        return local, "miss"
+
+    _promote(key, entry)
+    return entry, "l2"
+
+
+async def aget_cache(key: str) -> Any:
+    """get_cache for async code"""
+    entry, tier = await _alookup(key)
+    fresh = entry is not None and entry.is_fresh(time.time())
+    _record(tier, fresh)
+    return entry.value if fresh else None
+
+
+async def aset_cache(key: str, value: Any, ttl: Optional[int] = None, tags: Tags = None) -> None:
+    """set_cache for async code"""
+    ttl = ttl or settings.REDIS_CACHE_TTL
+    now = time.time()
+    entry = CacheEntry(value, now + ttl, now + ttl + settings.CACHE_STALE_TTL)
+    if callable(tags):
+        tags = tags(value)
+
+    _promote(key, entry)
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.set(key, _encode(entry), ex=ttl + settings.CACHE_STALE_TTL)
+        for tag in set(tags or ()):
+            pipe.sadd(_tag_key(tag), key)
+            pipe.expire(_tag_key(tag), settings.CACHE_TAG_TTL)
+        await pipe.execute()
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+
+async def _arecompute(key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[int], tags: Tags) -> Any:
+    stats.incr("recomputes")
+    started = time.perf_counter()
+    value = await loader()
+    stats.observe("recompute", (time.perf_counter() - started) * 1000)
+    await aset_cache(key, value, ttl, tags)
+    return value
+
+
+async def _afill(
+    key: str,
+    entry: Optional[CacheEntry],
+    loader: Callable[[], Awaitable[Any]],
+    ttl: Optional[int],
+    tags: Tags
+) -> Any:
+    """Recompute under the cross-worker Redis lock, or serve stale / wait for whoever holds it"""
+    try:
+        remote_lock = get_async_redis().lock(
+            f"lock:{key}",
+            timeout=settings.CACHE_LOCK_TIMEOUT,
+            blocking=False,
+        )
+        acquired = await remote_lock.acquire()
+    except redis.RedisError as e:
+        stats.incr("errors")
+        logger.warning(f"Cache lock failed for {key}: {e}")
+        remote_lock, acquired = None, True
+
+    if acquired:
+        try:
+            return await _arecompute(key, loader, ttl, tags)
+        finally:
+            if remote_lock is not None:
+                try:
+                    await remote_lock.release()
+                except redis.RedisError:
+                    pass  # Lock already expired; nothing to release
+
+    # Another worker holds the lock
+    if entry is not None:
+        stats.incr("stale_served")
+        return entry.value
+
+    stats.incr("lock_waits")
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_INTERVAL)
+        entry, _ = await _alookup(key)
+        if entry is not None and entry.is_fresh(time.time()):
+            return entry.value
+
+    logger.warning(f"Timed out waiting for {key} to be recomputed")
+    return await _arecompute(key, loader, ttl, tags)
+
+
+def _retrieve_exception(future: "asyncio.Future[Any]") -> None:
+    # A failed recompute nobody was waiting on is not worth a "never retrieved" warning
+    if not future.cancelled():
+        future.exception()
+
+
+async def aget_or_set(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: Optional[int] = None,
+    tags: Tags = None
+) -> Any:
+    """
+    get_or_set for async code with an async loader (which may use an AsyncSession).
+
+    Requests on this worker share one in-flight recompute through an
+    asyncio.Future; the Redis lock still covers other workers.
+    """
+    entry, tier = await _alookup(key)
+    if entry is not None and entry.is_fresh(time.time()):
+        _record(tier, True)
+        return entry.value
+    _record(tier, False)
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        # Another request on this worker is already on it
+        if entry is not None:
+            stats.incr("stale_served")
+            return entry.value
+        stats.incr("lock_waits")
+        await asyncio.wait((pending,))
+        if not pending.cancelled():
+            return pending.result()
+        # Its request was cancelled before the value was built
+        return await aget_or_set(key, loader, ttl, tags)
+
+    future = asyncio.get_running_loop().create_future()
+    future.add_done_callback(_retrieve_exception)
+    _inflight[key] = future
+    try:
+        value = await _afill(key, entry, loader, ttl, tags)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+    future.set_result(value)
+    return value
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Counters for monitoring"""
+    return {**stats.snapshot(), "l1_size": len(_l1), "l1_max_items": _l1.max_items}
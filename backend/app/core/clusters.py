@@ -0,0 +1,359 @@
+from itertools import chain
+from math import atan, degrees, exp, log, pi, radians, tan
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import Integer, String, cast, delete, event, func, insert, literal, or_, select, true, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models import Project, ProjectStatus, RoadSegment, RoadType
+from app.models.map_cluster import MapCluster, ProjectPoint
+from app.core import refresh_queue
+from app.core.invalidation import current_and_previous
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Session.info key for projects touched in the current transaction
+PENDING_PROJECTS = "cluster_projects"
+# Refresh queue kind
+PROJECTS_KIND = "clusters:projects"
+
+# Incremental refreshes hold this shared; a full rebuild holds it exclusively
+REBUILD_LOCK = "clusters:rebuild"
+
+# Half the width of the Web Mercator world, in metres
+MERCATOR_HALF = 20037508.342789244
+MAX_LATITUDE = 85.0511287798
+
+# Cells are map tiles of this many zoom levels deeper: 4x4 cells, about
+# 64px each, per 256px tile
+CELL_ZOOM_OFFSET = 2
+
+# Zooms kept in map_clusters. Deeper views cover few enough projects to
+# bucket project_points on the fly.
+PRECOMPUTED_MAX_ZOOM = 8
+
+# Refuse views that would need more cells than this (about 16x16 tiles)
+MAX_CELLS = 4096
+
+# Projects per refresh statement, so an import's refresh stays bounded
+REFRESH_BATCH_SIZE = 1000
+
+Bounds = Tuple[float, float, float, float]  # min_lon, min_lat, max_lon, max_lat
+
+
+def cells_per_side(zoom: int) -> int:
+    return 2 ** (zoom + CELL_ZOOM_OFFSET)
+
+
+def to_mercator(lon: float, lat: float) -> Tuple[float, float]:
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    return (
+        radians(lon) * MERCATOR_HALF / pi,
+        log(tan(pi / 4 + radians(lat) / 2)) * MERCATOR_HALF / pi,
+    )
+
+
+def from_mercator(x: float, y: float) -> Tuple[float, float]:
+    return degrees(x * pi / MERCATOR_HALF), degrees(2 * atan(exp(y * pi / MERCATOR_HALF)) - pi / 2)
+
+
+def cell_range(zoom: int, bounds: Bounds) -> Tuple[int, int, int, int]:
+    """First and last cell columns and rows covering bounds; rows count down from the north"""
+    n = cells_per_side(zoom)
+    size = 2 * MERCATOR_HALF / n
+    min_x, min_y = to_mercator(bounds[0], bounds[1])
+    max_x, max_y = to_mercator(bounds[2], bounds[3])
+
+    def index(offset: float) -> int:
+        return max(0, min(n - 1, int(offset // size)))
+
+    return (
+        index(min_x + MERCATOR_HALF), index(max_x + MERCATOR_HALF),
+        index(MERCATOR_HALF - max_y), index(MERCATOR_HALF - min_y),
+    )
+
+
+def cell_bounds(zoom: int, cell_x: int, cell_y: int) -> List[float]:
+    """[min_lon, min_lat, max_lon, max_lat] of a cell, so a client can zoom to it"""
+    size = 2 * MERCATOR_HALF / cells_per_side(zoom)
+    min_lon, max_lat = from_mercator(cell_x * size - MERCATOR_HALF, MERCATOR_HALF - cell_y * size)
+    max_lon, min_lat = from_mercator((cell_x + 1) * size - MERCATOR_HALF, MERCATOR_HALF - (cell_y + 1) * size)
+    return [min_lon, min_lat, max_lon, max_lat]
+
+
+def _cell_index(offset, zoom):
+    """SQL cell index for a Mercator offset from the west or north edge; zoom may be a column"""
+    return cast(func.floor(offset * func.power(2, zoom + CELL_ZOOM_OFFSET) / (2 * MERCATOR_HALF)), Integer)
+
+
+def _cell_columns(x, y, zoom):
+    return (
+        _cell_index(x + MERCATOR_HALF, zoom).label("cell_x"),
+        _cell_index(MERCATOR_HALF - y, zoom).label("cell_y"),
+    )
+
+
+def _lock(conn: Connection, scope: str, shared: bool = False) -> None:
+    """Transaction-scoped advisory lock so concurrent refreshes of a scope serialize"""
+    lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+    conn.execute(select(lock(func.hashtext(scope))))
+
+
+def _point_source(where) -> Select:
+    """project_points rows for projects matching where; projects without segments have none"""
+    point = (
+        select(
+            Project.id.label("project_id"),
+            # A point on the road itself, unlike a centroid, which can fall between roads
+            func.ST_PointOnSurface(func.ST_Collect(RoadSegment.geometry)).label("point"),
+            # Enums are stored by name; clusters key on the lower-case values the API exposes
+            func.lower(cast(Project.status, String)).label("status"),
+            func.lower(cast(Project.road_type, String)).label("road_type"),
+            func.coalesce(Project.sanctioned_cost, 0).label("sanctioned_cost"),
+        )
+        .join(RoadSegment, RoadSegment.project_id == Project.id)
+        .where(*where)
+        .group_by(Project.id)
+        .subquery("located")
+    )
+    mercator = func.ST_Transform(point.c.point, 3857)
+    return select(
+        point.c.project_id,
+        point.c.point,
+        func.ST_X(mercator).label("x"),
+        func.ST_Y(mercator).label("y"),
+        point.c.status,
+        point.c.road_type,
+        point.c.sanctioned_cost,
+    )
+
+
+def _add_clusters(conn: Connection, contributions) -> None:
+    """
+    Add signed project contributions to every precomputed zoom.
+
+    contributions has ProjectPoint's columns plus sign (+1 to add a project,
+    -1 to remove what it last added); emptied cells are deleted.
+    """
+    zooms = func.generate_series(0, PRECOMPUTED_MAX_ZOOM).table_valued("zoom").render_derived()
+    cell_x, cell_y = _cell_columns(contributions.c.x, contributions.c.y, zooms.c.zoom)
+    sign = contributions.c.sign
+    measures = (
+        func.sum(sign),
+        func.sum(sign * contributions.c.sanctioned_cost),
+        func.sum(sign * func.ST_X(contributions.c.point)),
+        func.sum(sign * func.ST_Y(contributions.c.point)),
+    )
+    columns = ["zoom", "cell_x", "cell_y", "status", "road_type", "project_count", "sanctioned_cost", "sum_lon", "sum_lat"]
+    deltas = (
+        select(zooms.c.zoom, cell_x, cell_y, contributions.c.status, contributions.c.road_type, *measures)
+        .select_from(contributions)
+        .join(zooms, true())
+        .group_by(zooms.c.zoom, cell_x, cell_y, contributions.c.status, contributions.c.road_type)
+        # Edits that leave a project where it was (most of them) write nothing
+        .having(or_(*(measure != 0 for measure in measures)))
+    )
+
+    stmt = pg_insert(MapCluster).from_select(columns, deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["zoom", "cell_x", "cell_y", "status", "road_type"],
+        set_={
+            name: getattr(MapCluster, name) + getattr(stmt.excluded, name)
+            for name in ("project_count", "sanctioned_cost", "sum_lon", "sum_lat")
+        }
+    )
+    conn.execute(stmt)
+    conn.execute(delete(MapCluster).where(MapCluster.project_count <= 0))
+
+
+def refresh_points(conn: Connection, project_ids: Iterable[int]) -> None:
+    """
+    Re-place the given projects (including deleted ones) and move their
+    counts between cells.
+
+    Each project's previous contribution, recorded in project_points, is
+    subtracted and its current one added, so the cost is bounded by the
+    projects refreshed times the precomputed zooms, never by how many
+    projects share their cells.
+    """
+    project_ids = sorted(set(project_ids))
+    if not project_ids:
+        return
+
+    _lock(conn, REBUILD_LOCK, shared=True)
+
+    for start in range(0, len(project_ids), REFRESH_BATCH_SIZE):
+        batch = project_ids[start:start + REFRESH_BATCH_SIZE]
+
+        # Row locks serialize refreshes of the same project without filling the lock table
+        conn.execute(select(ProjectPoint.project_id).where(ProjectPoint.project_id.in_(batch)).with_for_update())
+
+        previous = select(
+            ProjectPoint.project_id, ProjectPoint.point, ProjectPoint.x, ProjectPoint.y,
+            ProjectPoint.status, ProjectPoint.road_type, ProjectPoint.sanctioned_cost,
+            literal(-1).label("sign")
+        ).where(ProjectPoint.project_id.in_(batch))
+        current = _point_source((Project.id.in_(batch),)).add_columns(literal(1).label("sign"))
+        _add_clusters(conn, union_all(previous, current).subquery("contributions"))
+
+        conn.execute(delete(ProjectPoint).where(ProjectPoint.project_id.in_(batch)))
+        conn.execute(insert(ProjectPoint).from_select(
+            ["project_id", "point", "x", "y", "status", "road_type", "sanctioned_cost"],
+            _point_source((Project.id.in_(batch),))
+        ))
+
+
+def refresh_all(conn: Connection) -> None:
+    """Rebuild points and clusters from scratch; run on a schedule to repair drift"""
+    _lock(conn, REBUILD_LOCK)
+
+    conn.execute(delete(MapCluster))
+    conn.execute(delete(ProjectPoint))
+    conn.execute(insert(ProjectPoint).from_select(
+        ["project_id", "point", "x", "y", "status", "road_type", "sanctioned_cost"],
+        _point_source(())
+    ))
+    _add_clusters(conn, select(ProjectPoint, literal(1).label("sign")).subquery("contributions"))
+
+
+# --- Reads ---------------------------------------------------------------------
+
+def cluster_query(
+    zoom: int,
+    bounds: Bounds,
+    status: Optional[ProjectStatus] = None,
+    road_type: Optional[RoadType] = None
+) -> Select:
+    """
+    Per-cell, per-status totals for cells overlapping bounds, as (cell_x,
+    cell_y, status, project_count, sanctioned_cost, sum_lon, sum_lat) rows.
+
+    Coarse zooms read map_clusters, a few rows per cell; deeper zooms bucket
+    the project points inside the covered cells with the spatial index.
+    """
+    first_x, last_x, first_y, last_y = cell_range(zoom, bounds)
+
+    if zoom <= PRECOMPUTED_MAX_ZOOM:
+        query = (
+            select(
+                MapCluster.cell_x,
+                MapCluster.cell_y,
+                MapCluster.status,
+                func.sum(MapCluster.project_count),
+                func.sum(MapCluster.sanctioned_cost),
+                func.sum(MapCluster.sum_lon),
+                func.sum(MapCluster.sum_lat),
+            )
+            .where(
+                MapCluster.zoom == zoom,
+                MapCluster.cell_x.between(first_x, last_x),
+                MapCluster.cell_y.between(first_y, last_y),
+            )
+            .group_by(MapCluster.cell_x, MapCluster.cell_y, MapCluster.status)
+        )
+        if status:
+            query = query.where(MapCluster.status == status.value)
+        if road_type:
+            query = query.where(MapCluster.road_type == road_type.value)
+        return query
+
+    # Whole cells, so edge cells match what the precomputed zooms would return
+    size = 2 * MERCATOR_HALF / cells_per_side(zoom)
+    envelope = func.ST_Transform(
+        func.ST_MakeEnvelope(
+            first_x * size - MERCATOR_HALF, MERCATOR_HALF - (last_y + 1) * size,
+            (last_x + 1) * size - MERCATOR_HALF, MERCATOR_HALF - first_y * size,
+            3857
+        ),
+        4326
+    )
+    cell_x, cell_y = _cell_columns(ProjectPoint.x, ProjectPoint.y, zoom)
+    query = (
+        select(
+            cell_x,
+            cell_y,
+            ProjectPoint.status,
+            func.count(),
+            func.sum(ProjectPoint.sanctioned_cost),
+            func.sum(func.ST_X(ProjectPoint.point)),
+            func.sum(func.ST_Y(ProjectPoint.point)),
+        )
+        .where(ProjectPoint.point.intersects(envelope))
+        .group_by(cell_x, cell_y, ProjectPoint.status)
+    )
+    if status:
+        query = query.where(ProjectPoint.status == status.value)
+    if road_type:
+        query = query.where(ProjectPoint.road_type == road_type.value)
+    return query
+
+
+def fold_cells(zoom: int, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Merge cluster_query rows into one entry per cell, busiest first"""
+    cells: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for cell_x, cell_y, status, count, cost, sum_lon, sum_lat in rows:
+        cell = cells.setdefault((cell_x, cell_y), {
+            "x": cell_x, "y": cell_y, "project_count": 0, "sanctioned_cost": 0.0,
+            "by_status": {}, "sum_lon": 0.0, "sum_lat": 0.0,
+        })
+        cell["project_count"] += count
+        cell["sanctioned_cost"] += float(cost)
+        cell["by_status"][status] = cell["by_status"].get(status, 0) + count
+        cell["sum_lon"] += sum_lon
+        cell["sum_lat"] += sum_lat
+
+    folded = []
+    for cell in cells.values():
+        count = cell["project_count"]
+        # Mean member position: where the projects are, not the middle of the cell
+        longitude = cell.pop("sum_lon") / count
+        latitude = cell.pop("sum_lat") / count
+        folded.append({
+            **cell,
+            "longitude": longitude,
+            "latitude": latitude,
+            "bounds": cell_bounds(zoom, cell["x"], cell["y"]),
+        })
+    folded.sort(key=lambda cell: cell["project_count"], reverse=True)
+    return folded
+
+
+# --- Write hooks ---------------------------------------------------------------
+
+@event.listens_for(Session, "after_flush")
+def _collect_projects(session: Session, flush_context) -> None:
+    project_ids: Set[int] = session.info.setdefault(PENDING_PROJECTS, set())
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Project):
+            project_ids.add(obj.id)
+        elif isinstance(obj, RoadSegment):
+            # A segment moved to another project re-places both
+            project_ids.update(current_and_previous(obj, "project_id"))
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed(session: Session) -> None:
+    project_ids = session.info.pop(PENDING_PROJECTS, None) or set()
+    # Applied off the request path, coalesced with other commits touching the same projects
+    refresh_queue.enqueue({PROJECTS_KIND: project_ids})
+
+
+refresh_queue.register(PROJECTS_KIND, refresh_points)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_projects(session: Session) -> None:
+    session.info.pop(PENDING_PROJECTS, None)
+
+
+if __name__ == "__main__":
+    # Nightly full rebuild, e.g. from cron: python -m app.core.clusters
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as connection:
+        refresh_all(connection)
+    logger.info("Map clusters rebuilt")
@@ -0,0 +1,152 @@
+from typing import Optional
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Content types worth compressing; images and archives already are
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/geo+json",
+    "application/x-ndjson",
+    "application/vnd.mapbox-vector-tile",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class _Encoder:
+    """Streaming encoder; every chunk is flushed so clients can parse as it arrives"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality, mode=brotli.MODE_TEXT)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Preferred content coding we support: brotli, then gzip"""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip()] = quality
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip response compression above a size threshold, streaming-safe.
+
+    Strong ETags get the coding appended ("<tag>-br"), since compressed and
+    identity bodies are different representations; app.core.http_cache strips
+    it again when matching If-None-Match.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+
+class _CompressingSend:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            "content-encoding" not in headers
+            and self.start["status"] not in (204, 206, 304)
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start.setdefault("headers", []))
+            if not self._compressible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                if self._compressible(headers):
+                    headers.add_vary_header("Accept-Encoding")
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            self.encoder = _Encoder(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and etag.endswith('"'):
+                headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            del headers["Content-Length"]
+            await self.send(self.start)
+
+        chunk = self.encoder.compress(body) if body else b""
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,365 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, List, Optional, Sequence
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import orjson
+from sqlalchemy import String, cast, func, literal_column, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from app.config import settings
+from app.core.responses import dumps
+from app.models import Firm, Minister, Official, Project, PublicReport, RoadSegment
+from app.utils.geojson import DEFAULT_PRECISION, STREAM_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    GEOJSONSEQ = "geojsonseq"
+    GEOPARQUET = "parquet"  # Nightly snapshot only; needs the whole result to write the footer
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.GEOJSONSEQ: "application/geo+json-seq",
+    ExportFormat.GEOPARQUET: "application/vnd.apache.parquet",
+}
+
+# How each format carries geometry: GeoJSON text, WKT or WKB
+GEOMETRY_ENCODINGS = {
+    ExportFormat.NDJSON: "geojson",
+    ExportFormat.CSV: "wkt",
+    ExportFormat.GEOJSONSEQ: "geojson",
+    ExportFormat.GEOPARQUET: "wkb",
+}
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+PROJECT_FIELDS = [
+    "id", "name", "slug", "status", "road_type", "state", "district", "city", "pincode",
+    "sanctioned_cost", "total_disbursed", "approval_date", "start_date", "proposed_end_date", "actual_end_date",
+]
+
+# Accountability chain: role -> extra fields beyond id and name
+PARTIES = {
+    "minister": [],
+    "approving_official": ["designation"],
+    "contractor": [],
+    "maintenance_firm": [],
+}
+
+COUNT_FIELDS = ["reports_count", "segment_count"]
+
+CSV_COLUMNS = (
+    PROJECT_FIELDS
+    + [f"{role}_{field}" for role, extra in PARTIES.items() for field in ["id", "name", *extra]]
+    + COUNT_FIELDS
+)
+
+# GeoParquet 1.0 metadata; lon/lat in WGS84 matches the default OGC:CRS84
+GEOPARQUET_METADATA = {
+    "version": "1.0.0",
+    "primary_column": "geometry",
+    "columns": {"geometry": {"encoding": "WKB", "geometry_types": ["MultiLineString"]}},
+}
+
+
+def export_query(
+    where: Sequence = (),
+    after_id: Optional[int] = None,
+    geometry: Optional[str] = None,
+    precision: int = DEFAULT_PRECISION
+) -> Select:
+    """
+    Projects with their accountability chain, report and segment counts and
+    (optionally) all segments collected into one geometry, in id order.
+
+    Ordered by id so an interrupted download resumes with after_id = the
+    last id received. Related rows are index lookups per project, so the
+    statement streams at a steady rate however large the result.
+    """
+    minister = aliased(Minister)
+    official = aliased(Official)
+    contractor = aliased(Firm)
+    maintenance_firm = aliased(Firm)
+
+    collected = func.ST_Multi(func.ST_Collect(RoadSegment.geometry))
+    encoded = {
+        "geojson": func.ST_AsGeoJSON(collected, precision),
+        "wkt": func.ST_AsText(func.ST_ReducePrecision(collected, 10 ** -precision)),
+        "wkb": func.ST_AsBinary(collected),
+    }
+    segments = (
+        select(
+            func.count().label("segment_count"),
+            *([encoded[geometry].label("geometry")] if geometry else [])
+        )
+        .where(RoadSegment.project_id == Project.id)
+        .lateral("segments")
+    )
+    reports = (
+        select(func.count())
+        .where(PublicReport.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+
+    query = (
+        select(
+            Project.id, Project.name, Project.slug,
+            # Enums are stored by name; emit the lower-case values clients expect
+            func.lower(cast(Project.status, String)).label("status"),
+            func.lower(cast(Project.road_type, String)).label("road_type"),
+            Project.state, Project.district, Project.city, Project.pincode,
+            Project.sanctioned_cost, Project.total_disbursed,
+            Project.approval_date, Project.start_date, Project.proposed_end_date, Project.actual_end_date,
+            minister.id.label("minister_id"), minister.name.label("minister_name"),
+            official.id.label("approving_official_id"), official.name.label("approving_official_name"),
+            official.designation.label("approving_official_designation"),
+            contractor.id.label("contractor_id"), contractor.name.label("contractor_name"),
+            maintenance_firm.id.label("maintenance_firm_id"), maintenance_firm.name.label("maintenance_firm_name"),
+            reports.label("reports_count"),
+            *segments.c,
+        )
+        .select_from(Project)
+        .outerjoin(minister, minister.id == Project.minister_id)
+        .outerjoin(official, official.id == Project.approving_official_id)
+        .outerjoin(contractor, contractor.id == Project.contractor_id)
+        .outerjoin(maintenance_firm, maintenance_firm.id == Project.maintenance_firm_id)
+        .join(segments, literal_column("true"))
+        .where(*where)
+        .order_by(Project.id)
+    )
+    if after_id is not None:
+        query = query.where(Project.id > after_id)
+    return query
+
+
+def to_record(row: Any) -> Dict[str, Any]:
+    """Nested NDJSON record for an export_query row; geometry stays pre-encoded"""
+    values = row._mapping
+    record = {name: values[name] for name in PROJECT_FIELDS}
+    for role, extra in PARTIES.items():
+        record[role] = (
+            {field: values[f"{role}_{field}"] for field in ["id", "name", *extra]}
+            if values[f"{role}_id"] is not None else None
+        )
+    record.update((name, values[name]) for name in COUNT_FIELDS)
+    if "geometry" in values:
+        record["geometry"] = orjson.Fragment(values["geometry"]) if values["geometry"] else None
+    return record
+
+
+class ExportWriter:
+    """
+    Encodes export rows in one format, buffered into STREAM_CHUNK_SIZE chunks
+    so memory stays flat whatever the row count.
+    """
+
+    def __init__(self, export_format: ExportFormat, header: bool = True):
+        self.format = export_format
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text) if export_format == ExportFormat.CSV else None
+        self._buffer: List[bytes] = []
+        self._size = 0
+        if self._csv and header:
+            self._csv.writerow(CSV_COLUMNS + ["geometry_wkt"])
+
+    def _encode(self, row: Any) -> bytes:
+        if self.format == ExportFormat.NDJSON:
+            return dumps(to_record(row)) + b"\n"
+        if self.format == ExportFormat.GEOJSONSEQ:
+            properties = to_record(row)
+            geometry = properties.pop("geometry", None)
+            feature = {"type": "Feature", "id": properties["id"], "geometry": geometry, "properties": properties}
+            # RFC 8142: each text starts with a record separator
+            return b"\x1e" + dumps(feature) + b"\n"
+
+        values = row._mapping
+        self._csv.writerow([values[name] for name in CSV_COLUMNS] + [values["geometry"]])
+        encoded = self._text.getvalue().encode()
+        self._text.seek(0)
+        self._text.truncate()
+        return encoded
+
+    def add(self, row: Any) -> Optional[bytes]:
+        """Append a row; returns a chunk once STREAM_CHUNK_SIZE is reached"""
+        encoded = self._encode(row)
+        self._buffer.append(encoded)
+        self._size += len(encoded)
+        if self._size < STREAM_CHUNK_SIZE:
+            return None
+        return self.flush()
+
+    def flush(self) -> bytes:
+        if self._csv and self._text.tell():
+            self._buffer.append(self._text.getvalue().encode())
+            self._text.seek(0)
+            self._text.truncate()
+        chunk = b"".join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        return chunk
+
+
+async def aiter_export(rows: AsyncIterable[Any], export_format: ExportFormat, header: bool = True):
+    writer = ExportWriter(export_format, header)
+    async for row in rows:
+        chunk = writer.add(row)
+        if chunk:
+            yield chunk
+    yield writer.flush()
+
+
+def iter_export(rows: Iterable[Any], export_format: ExportFormat) -> Iterator[bytes]:
+    writer = ExportWriter(export_format)
+    for row in rows:
+        chunk = writer.add(row)
+        if chunk:
+            yield chunk
+    yield writer.flush()
+
+
+# --- Nightly snapshots ---------------------------------------------------------
+
+def snapshot_key(name: str) -> str:
+    return f"{settings.EXPORT_SNAPSHOT_PREFIX}/{name}"
+
+
+MANIFEST_KEY = "latest.json"
+
+
+def _write_text_snapshot(conn: Connection, export_format: ExportFormat, path: str) -> int:
+    """Gzipped full export; returns the row count"""
+    rows = 0
+    stmt = export_query(geometry=GEOMETRY_ENCODINGS[export_format])
+    result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+
+    def counted():
+        nonlocal rows
+        for row in result:
+            rows += 1
+            yield row
+
+    with gzip.open(path, "wb", compresslevel=6) as out:
+        for chunk in iter_export(counted(), export_format):
+            out.write(chunk)
+    return rows
+
+
+def _parquet_schema(pa):
+    fields = [
+        ("id", pa.int64()), ("name", pa.string()), ("slug", pa.string()),
+        ("status", pa.string()), ("road_type", pa.string()),
+        ("state", pa.string()), ("district", pa.string()), ("city", pa.string()), ("pincode", pa.string()),
+        ("sanctioned_cost", pa.decimal128(18, 2)), ("total_disbursed", pa.decimal128(18, 2)),
+        ("approval_date", pa.date32()), ("start_date", pa.date32()),
+        ("proposed_end_date", pa.date32()), ("actual_end_date", pa.date32()),
+    ]
+    for role, extra in PARTIES.items():
+        fields += [(f"{role}_id", pa.int64()), (f"{role}_name", pa.string())]
+        fields += [(f"{role}_{field}", pa.string()) for field in extra]
+    fields += [(name, pa.int64()) for name in COUNT_FIELDS] + [("geometry", pa.binary())]
+    return pa.schema(fields, metadata={"geo": json.dumps(GEOPARQUET_METADATA)})
+
+
+def _write_geoparquet(conn: Connection, path: str) -> int:
+    """GeoParquet file, one row group per fetched batch; returns the row count"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa)
+    stmt = export_query(geometry=GEOMETRY_ENCODINGS[ExportFormat.GEOPARQUET])
+    result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in result.partitions():
+            records = [dict(row._mapping) for row in batch]
+            for record in records:
+                if record["geometry"] is not None:
+                    record["geometry"] = bytes(record["geometry"])
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            rows += len(records)
+    return rows
+
+
+def write_snapshots(conn: Connection) -> Dict[str, Any]:
+    """
+    Export the full dataset in every format to object storage and publish a
+    manifest; returns the manifest.
+
+    Files go under a dated prefix and the manifest is replaced last, so
+    readers always see a complete set. Storage serves Range requests, so
+    these downloads resume natively.
+    """
+    from app.utils.file_upload import put_object, upload_file
+
+    generated_at = datetime.now(timezone.utc)
+    prefix = generated_at.strftime("%Y-%m-%d")
+    files = {}
+    directory = tempfile.mkdtemp(prefix="export-")
+    try:
+        for export_format in ExportFormat:
+            if export_format == ExportFormat.GEOPARQUET:
+                name, content_type = "projects.parquet", MEDIA_TYPES[export_format]
+                path = os.path.join(directory, name)
+                try:
+                    rows = _write_geoparquet(conn, path)
+                except ImportError:
+                    logger.warning("pyarrow is not installed; skipping the GeoParquet snapshot")
+                    continue
+            else:
+                name, content_type = f"projects.{export_format.value}.gz", "application/gzip"
+                path = os.path.join(directory, name)
+                rows = _write_text_snapshot(conn, export_format, path)
+
+            key = snapshot_key(f"{prefix}/{name}")
+            upload_file(key, path, content_type, cache_control="public, max-age=86400, immutable")
+            files[export_format.value] = {"key": key, "size": os.path.getsize(path), "rows": rows}
+            os.remove(path)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    manifest = {"generated_at": generated_at.isoformat(), "files": files}
+    put_object(snapshot_key(MANIFEST_KEY), dumps(manifest), "application/json", cache_control="no-cache")
+    return manifest
+
+
+def read_manifest() -> Optional[Dict[str, Any]]:
+    """The latest published manifest, or None before the first snapshot run"""
+    from botocore.exceptions import ClientError
+    from app.utils.file_upload import get_bucket, get_s3_client
+
+    try:
+        body = get_s3_client().get_object(Bucket=get_bucket(), Key=snapshot_key(MANIFEST_KEY))["Body"].read()
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None
+        raise
+    return orjson.loads(body)
+
+
+if __name__ == "__main__":
+    # Nightly, e.g. from cron: python -m app.core.export
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.connect() as connection:
+        connection.exec_driver_sql(f"SET statement_timeout = {settings.EXPORT_STATEMENT_TIMEOUT_MS}")
+        published = write_snapshots(connection)
+    logger.info(f"Export snapshots published: {published['files']}")
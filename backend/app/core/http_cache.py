@@ -0,0 +1,130 @@
+from hashlib import blake2b
+from typing import List, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.database import LAST_WRITE_COOKIE
+
+# Browser max-age is short; shared caches (CDN) hold longer and keep serving
+# while they revalidate in the background. First matching prefix wins.
+CACHE_POLICIES: List[Tuple[str, str]] = [
+    ("/api/v1/admin", "private, no-store"),
+    ("/api/v1/reports/submissions", "private, no-store"),  # Per-submitter status that changes once flushed
+    ("/api/v1/projects/search", "public, max-age=60, s-maxage=300, stale-while-revalidate=600"),
+    ("/api/v1/projects", "public, max-age=30, s-maxage=120, stale-while-revalidate=300"),
+    ("/api/v1/tiles", "public, max-age=300, s-maxage=3600, stale-while-revalidate=86400"),
+    ("/api/v1/stats", "public, max-age=60, s-maxage=300, stale-while-revalidate=900"),
+    ("/api/v1/reports", "public, max-age=10, s-maxage=30, stale-while-revalidate=60"),
+    ("/api/v1/", "public, max-age=60, s-maxage=300, stale-while-revalidate=600"),
+]
+
+# Sent to clients that wrote recently, so they never read a CDN copy older than their write
+AFTER_WRITE_POLICY = "private, no-cache"
+
+# Suffixes the compression middleware appends to ETags of encoded representations
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def versioned(body: bytes) -> list:
+    """
+    Cache entry holding a body with its ETag.
+
+    The tag is computed once when the entry is filled, so conditional
+    requests against cached payloads never re-hash them.
+    """
+    return [etag_for(body), body]
+
+
+def cache_control_for(request: Request) -> Optional[str]:
+    if request.method not in ("GET", "HEAD"):
+        return None
+    if LAST_WRITE_COOKIE in request.cookies:
+        return AFTER_WRITE_POLICY
+    for prefix, policy in CACHE_POLICIES:
+        if request.url.path.startswith(prefix):
+            return policy
+    return None
+
+
+def _base_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def if_none_match(request: Request, etag: str) -> Optional[str]:
+    """
+    The tag the client holds for this representation (any content coding), or None.
+
+    A 304 must repeat that tag, encoded suffix included, or the client
+    treats the response as describing a different representation.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+    for tag in header.split(","):
+        if _base_tag(tag) == etag:
+            return tag.strip()
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def cached_body_response(request: Request, entry: list, media_type: str) -> Response:
+    """Send a versioned() cache entry, or 304 if the client's copy is current"""
+    etag, body = entry
+    held = if_none_match(request, etag)
+    if held:
+        return not_modified(held)
+    return Response(content=body, media_type=media_type, headers={"ETag": etag})
+
+
+async def apply_http_caching(request: Request, response: Response) -> Response:
+    """
+    Add Cache-Control and an ETag to public GET responses and turn matches into 304s.
+
+    Responses that already carry an ETag (cached payloads) are never re-hashed;
+    other bodies are hashed only when small enough to buffer.
+    """
+    policy = cache_control_for(request)
+    if policy is None or response.status_code not in (200, 304):
+        return response
+
+    # A 304 refreshes the client's copy, so it carries the policy too
+    response.headers.setdefault("Cache-Control", policy)
+    if response.status_code == 304:
+        return response  # Already answered by the route (cached_body_response)
+
+    etag = response.headers.get("etag")
+
+    if etag is None:
+        length = response.headers.get("content-length")
+        if not length or int(length) > settings.ETAG_HASH_MAX_BYTES:
+            return response  # Streamed or large: not worth buffering just to hash
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = etag_for(body)
+        response = Response(
+            content=body,
+            status_code=response.status_code,
+            headers={**response.headers, "ETag": etag},
+            media_type=response.media_type
+        )
+
+    held = if_none_match(request, etag)
+    if held:
+        return Response(status_code=304, headers={"ETag": held, "Cache-Control": response.headers["cache-control"]})
+    return response
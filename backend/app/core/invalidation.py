@@ -0,0 +1,117 @@
+from itertools import chain
+from typing import Any, Optional, Set
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.models import Project, RoadSegment, Firm, Official, Disbursement, ProjectDocument, PublicReport
+from app.models.user import User
+from app.core.cache import invalidate_tags
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding tags touched by flushes in the current transaction
+PENDING_TAGS = "cache_invalidation_tags"
+
+# Any write to one row can change search results, map tiles, listings and counts
+ALL_PROJECTS = "projects"
+ALL_FIRMS = "firms"
+ALL_OFFICIALS = "officials"
+ALL_REPORTS = "reports"
+
+
+def project_tag(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+def firm_tag(firm_id: int) -> str:
+    return f"firm:{firm_id}"
+
+
+def official_tag(official_id: int) -> str:
+    return f"official:{official_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def region_tag(district: str) -> str:
+    return f"district:{district.strip().lower()}"
+
+
+def current_and_previous(obj: Any, attribute: str) -> Set[Any]:
+    """Current value of an attribute plus the value it had before this flush"""
+    history = inspect(obj).attrs[attribute].history
+    values = set(chain(history.added, history.unchanged, history.deleted))
+    values.add(getattr(obj, attribute))
+    values.discard(None)
+    return values
+
+
+def tags_for(obj: Any) -> Set[str]:
+    """Cache tags affected by a write to obj"""
+    if isinstance(obj, Project):
+        tags = {project_tag(obj.id), ALL_PROJECTS}
+        tags.update(region_tag(district) for district in current_and_previous(obj, "district"))
+        return tags
+    if isinstance(obj, RoadSegment):
+        return {ALL_PROJECTS} | {project_tag(pid) for pid in current_and_previous(obj, "project_id")}
+    if isinstance(obj, (Disbursement, ProjectDocument)):
+        return {project_tag(pid) for pid in current_and_previous(obj, "project_id")}
+    if isinstance(obj, PublicReport):
+        return {ALL_REPORTS} | {project_tag(pid) for pid in current_and_previous(obj, "project_id")}
+    if isinstance(obj, Firm):
+        tags = {firm_tag(obj.id), ALL_FIRMS}
+        # Listings, search features and tiles embed contractor names
+        state = inspect(obj)
+        if state.deleted or state.attrs.name.history.has_changes():
+            tags.add(ALL_PROJECTS)
+        return tags
+    if isinstance(obj, Official):
+        return {official_tag(obj.id), ALL_OFFICIALS}
+    if isinstance(obj, User):
+        return {user_tag(obj.id)}
+    return set()
+
+
+def project_detail_tags(detail: dict) -> Set[str]:
+    """Everything a cached project detail payload was built from"""
+    tags = {project_tag(detail["id"])}
+    if detail.get("district"):
+        tags.add(region_tag(detail["district"]))
+    for key in ("contractor", "maintenance_firm"):
+        if detail.get(key):
+            tags.add(firm_tag(detail[key]["id"]))
+    if detail.get("approving_official"):
+        tags.add(official_tag(detail["approving_official"]["id"]))
+    return tags
+
+
+def search_tags(district: Optional[str] = None) -> Set[str]:
+    """Tags for cached search results and map tiles"""
+    tags = {ALL_PROJECTS}
+    if district:
+        tags.add(region_tag(district))
+    return tags
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session: Session, flush_context) -> None:
+    """Record which tags this flush touched; new/dirty/deleted still hold pre-flush state here"""
+    pending = session.info.setdefault(PENDING_TAGS, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        pending.update(tags_for(obj))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    """Only invalidate once the write is visible to the readers that will refill the cache"""
+    tags = session.info.pop(PENDING_TAGS, None)
+    if tags:
+        invalidate_tags(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tags(session: Session) -> None:
+    session.info.pop(PENDING_TAGS, None)
+
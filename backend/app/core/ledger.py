@@ -0,0 +1,363 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import String, and_, case, cast, delete, event, func, insert, inspect, literal, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models import Project
+from app.models.disbursement import Disbursement, MonthlySpend, ProjectLedger, SpendScope
+import logging
+
+logger = logging.getLogger(__name__)
+
+Scope = Tuple[str, str]  # (SpendScope value, scope_key)
+
+# Indian fiscal years run April to March; FY 2024 is 2024-04-01 .. 2025-03-31
+FISCAL_YEAR_START_MONTH = 4
+
+# Fiscal years the nightly job keeps partitions ready for, beyond the current one
+PARTITIONS_AHEAD = 1
+
+
+class AppendOnlyError(Exception):
+    """An attempt to change or delete a ledger entry"""
+
+
+def fiscal_year(day: date) -> int:
+    return day.year if day.month >= FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def partition_name(year: int) -> str:
+    return f"disbursements_fy{year}"
+
+
+def project_scope(project_id: int) -> Scope:
+    return (SpendScope.PROJECT.value, str(project_id))
+
+
+def district_scope(state: str, district: str) -> Scope:
+    return (SpendScope.DISTRICT.value, f"{state}|{district}")
+
+
+def contractor_scope(firm_id: int) -> Scope:
+    return (SpendScope.CONTRACTOR.value, str(firm_id))
+
+
+def _rollup_scopes(state: Optional[str], district: Optional[str], contractor_id: Optional[int]) -> List[Scope]:
+    """District and contractor series a project's spend counts towards"""
+    scopes = []
+    if state and district:
+        scopes.append(district_scope(state, district))
+    if contractor_id:
+        scopes.append(contractor_scope(contractor_id))
+    return scopes
+
+
+# --- Partitions --------------------------------------------------------------
+
+def ensure_partitions(conn: Connection, first: Optional[int] = None, last: Optional[int] = None) -> None:
+    """
+    Create fiscal-year partitions from first through last (default: the
+    current year and PARTITIONS_AHEAD after it).
+
+    Must run before a year's first entry lands in the default partition;
+    after that the year can't be attached without moving its rows.
+    """
+    current = fiscal_year(date.today())
+    for year in range(first or current, (last or current + PARTITIONS_AHEAD) + 1):
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(year)} PARTITION OF disbursements "
+            f"FOR VALUES FROM ('{year}-{FISCAL_YEAR_START_MONTH:02d}-01') "
+            f"TO ('{year + 1}-{FISCAL_YEAR_START_MONTH:02d}-01')"
+        ))
+
+
+# --- Maintenance -------------------------------------------------------------
+
+def _add_monthly(conn: Connection, deltas: Dict[Tuple[str, str, date], List]) -> None:
+    if not deltas:
+        return
+    rows = [
+        {"scope": scope, "scope_key": key, "month": month, "amount": amount, "entry_count": count}
+        # Fixed order so concurrent writers lock rows in the same sequence
+        for (scope, key, month), (amount, count) in sorted(deltas.items())
+    ]
+    stmt = pg_insert(MonthlySpend).values(rows)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[MonthlySpend.scope, MonthlySpend.scope_key, MonthlySpend.month],
+        set_={
+            "amount": MonthlySpend.amount + stmt.excluded.amount,
+            "entry_count": MonthlySpend.entry_count + stmt.excluded.entry_count,
+        }
+    ))
+
+
+def _sync_project_totals(conn: Connection, where) -> None:
+    """Copy ledger totals to projects.total_disbursed, which rollups and scorecards read"""
+    conn.execute(
+        update(Project)
+        .where(Project.id == ProjectLedger.project_id, *where)
+        .where(Project.total_disbursed.is_distinct_from(ProjectLedger.total_disbursed))
+        .values(total_disbursed=ProjectLedger.total_disbursed)
+    )
+
+
+def apply_entries(conn: Connection, entries: Iterable[Tuple[int, int, Decimal, date]]) -> None:
+    """
+    Fold newly appended (id, project_id, amount, disbursement_date) entries
+    into the project snapshots, projects.total_disbursed and the monthly
+    series, in the caller's transaction.
+
+    A few row upserts per project however long its ledger is; concurrent
+    appends to one project serialize on its snapshot row.
+    """
+    entries = sorted(entries)
+    if not entries:
+        return
+
+    project_ids = sorted({project_id for _, project_id, _, _ in entries})
+    context = {
+        row[0]: tuple(row[1:])
+        for row in conn.execute(
+            select(Project.id, Project.state, Project.district, Project.contractor_id)
+            .where(Project.id.in_(project_ids))
+        )
+    }
+
+    snapshots: Dict[int, Dict[str, Any]] = {}
+    monthly: Dict[Tuple[str, str, date], List] = defaultdict(lambda: [Decimal(0), 0])
+    for entry_id, project_id, amount, disbursement_date in entries:
+        amount = Decimal(str(amount))
+        snapshot = snapshots.setdefault(project_id, {"total_disbursed": Decimal(0), "entry_count": 0})
+        snapshot["total_disbursed"] += amount
+        snapshot["entry_count"] += 1
+        snapshot.update(last_entry_id=entry_id, last_amount=amount, last_disbursement_date=disbursement_date)
+
+        month = disbursement_date.replace(day=1)
+        for scope in [project_scope(project_id), *_rollup_scopes(*context.get(project_id, (None, None, None)))]:
+            monthly[(*scope, month)][0] += amount
+            monthly[(*scope, month)][1] += 1
+
+    stmt = pg_insert(ProjectLedger).values([
+        {"project_id": project_id, **snapshot, "last_recorded_at": func.now()}
+        for project_id, snapshot in sorted(snapshots.items())
+    ])
+    # Ids come from a sequence, so the highest one is the latest append
+    newer = stmt.excluded.last_entry_id > func.coalesce(ProjectLedger.last_entry_id, 0)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[ProjectLedger.project_id],
+        set_={
+            "total_disbursed": ProjectLedger.total_disbursed + stmt.excluded.total_disbursed,
+            "entry_count": ProjectLedger.entry_count + stmt.excluded.entry_count,
+            **{
+                name: case((newer, stmt.excluded[name]), else_=getattr(ProjectLedger, name))
+                for name in ("last_entry_id", "last_amount", "last_disbursement_date", "last_recorded_at")
+            },
+        }
+    ))
+    _add_monthly(conn, monthly)
+    _sync_project_totals(conn, (Project.id.in_(project_ids),))
+
+
+def _rollup_source(scope: SpendScope, where):
+    """District or contractor months summed from the per-project series"""
+    if scope == SpendScope.DISTRICT:
+        key, filled = Project.state + "|" + Project.district, and_(Project.state.is_not(None), Project.district.is_not(None))
+    else:
+        key, filled = cast(Project.contractor_id, String), Project.contractor_id.is_not(None)
+    return (
+        select(literal(scope.value), key, MonthlySpend.month, func.sum(MonthlySpend.amount), func.sum(MonthlySpend.entry_count))
+        .select_from(Project)
+        .join(MonthlySpend, and_(
+            MonthlySpend.scope == SpendScope.PROJECT.value,
+            MonthlySpend.scope_key == cast(Project.id, String)
+        ))
+        .where(filled, *where)
+        .group_by(key, MonthlySpend.month)
+    )
+
+
+MONTHLY_COLUMNS = ["scope", "scope_key", "month", "amount", "entry_count"]
+
+
+def refresh_scopes(conn: Connection, scopes: Iterable[Scope]) -> None:
+    """
+    Rebuild district and contractor series from their projects' monthly rows.
+
+    Used when projects move between districts or contractors, and after
+    Core writes that bypass the session hooks. Never reads the ledger itself.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    conn.execute(delete(MonthlySpend).where(tuple_(MonthlySpend.scope, MonthlySpend.scope_key).in_(scopes)))
+
+    districts = [key.split("|", 1) for scope, key in scopes if scope == SpendScope.DISTRICT.value]
+    firms = [int(key) for scope, key in scopes if scope == SpendScope.CONTRACTOR.value]
+    if districts:
+        conn.execute(insert(MonthlySpend).from_select(
+            MONTHLY_COLUMNS,
+            _rollup_source(SpendScope.DISTRICT, (tuple_(Project.state, Project.district).in_(districts),))
+        ))
+    if firms:
+        conn.execute(insert(MonthlySpend).from_select(
+            MONTHLY_COLUMNS, _rollup_source(SpendScope.CONTRACTOR, (Project.contractor_id.in_(firms),))
+        ))
+
+
+def project_scopes(conn: Connection, project_ids: Iterable[int]) -> Set[Scope]:
+    """District and contractor series the given projects currently count towards"""
+    project_ids = sorted(set(project_ids))
+    if not project_ids:
+        return set()
+    rows = conn.execute(
+        select(Project.state, Project.district, Project.contractor_id).where(Project.id.in_(project_ids))
+    ).all()
+    return {scope for row in rows for scope in _rollup_scopes(*row)}
+
+
+def refresh_all(conn: Connection) -> None:
+    """
+    Rebuild snapshots and series from the ledger; run nightly to repair
+    anything the incremental path missed (such as a re-import moving a
+    project to another district).
+    """
+    conn.execute(delete(ProjectLedger))
+    conn.execute(delete(MonthlySpend))
+
+    latest = (
+        select(
+            Disbursement.project_id, Disbursement.id, Disbursement.amount,
+            Disbursement.disbursement_date, Disbursement.recorded_at
+        )
+        .distinct(Disbursement.project_id)
+        .order_by(Disbursement.project_id, Disbursement.id.desc())
+        .subquery("latest")
+    )
+    totals = (
+        select(Disbursement.project_id, func.sum(Disbursement.amount).label("total"), func.count().label("entries"))
+        .group_by(Disbursement.project_id)
+        .subquery("totals")
+    )
+    conn.execute(insert(ProjectLedger).from_select(
+        ["project_id", "total_disbursed", "entry_count", "last_entry_id", "last_amount",
+         "last_disbursement_date", "last_recorded_at"],
+        select(
+            totals.c.project_id, totals.c.total, totals.c.entries, latest.c.id, latest.c.amount,
+            latest.c.disbursement_date, latest.c.recorded_at
+        ).join(latest, latest.c.project_id == totals.c.project_id)
+    ))
+
+    month = func.date_trunc("month", Disbursement.disbursement_date).cast(Disbursement.disbursement_date.type)
+    conn.execute(insert(MonthlySpend).from_select(
+        MONTHLY_COLUMNS,
+        select(
+            literal(SpendScope.PROJECT.value), cast(Disbursement.project_id, String), month,
+            func.sum(Disbursement.amount), func.count()
+        ).group_by(Disbursement.project_id, month)
+    ))
+    for scope in (SpendScope.DISTRICT, SpendScope.CONTRACTOR):
+        conn.execute(insert(MonthlySpend).from_select(MONTHLY_COLUMNS, _rollup_source(scope, ())))
+
+    _sync_project_totals(conn, ())
+
+
+def _moved_scopes(project: Project) -> Set[Scope]:
+    """Old and new series of a project whose district or contractor changed in this flush"""
+    state = inspect(project)
+    if not any(state.attrs[name].history.has_changes() for name in ("state", "district", "contractor_id")):
+        return set()
+
+    def values(name):
+        history = state.attrs[name].history
+        return {getattr(project, name), *history.deleted} - {None}
+
+    scopes = {contractor_scope(firm_id) for firm_id in values("contractor_id")}
+    scopes.update(
+        district_scope(state_name, district)
+        for state_name in values("state")
+        for district in values("district")
+    )
+    return scopes
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_changes(session: Session, flush_context, instances) -> None:
+    for obj in session.deleted:
+        if isinstance(obj, Disbursement):
+            raise AppendOnlyError("Disbursements can't be deleted; append a reversing entry")
+    for obj in session.dirty:
+        if isinstance(obj, Disbursement) and session.is_modified(obj):
+            raise AppendOnlyError("Disbursements can't be changed; append a reversing entry")
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_appends(session: Session, flush_context) -> None:
+    """Keep snapshots and series current in the same transaction as the write"""
+    entries = [
+        (obj.id, obj.project_id, obj.amount, obj.disbursement_date)
+        for obj in session.new if isinstance(obj, Disbursement)
+    ]
+    moved: Set[Scope] = set()
+    for obj in session.dirty:
+        if isinstance(obj, Project):
+            moved.update(_moved_scopes(obj))
+
+    if entries or moved:
+        conn = session.connection()
+        apply_entries(conn, entries)
+        refresh_scopes(conn, moved)
+
+
+# --- Reads -------------------------------------------------------------------
+
+def monthly_spend_query(scope: Scope) -> Select:
+    """A series' months in order with the running total; a primary key range scan"""
+    return (
+        select(
+            MonthlySpend.month,
+            MonthlySpend.amount,
+            MonthlySpend.entry_count,
+            func.sum(MonthlySpend.amount).over(order_by=MonthlySpend.month).label("cumulative"),
+        )
+        .where(MonthlySpend.scope == scope[0], MonthlySpend.scope_key == scope[1])
+        .order_by(MonthlySpend.month)
+    )
+
+
+def spend_series(scope: Scope, rows, sanctioned_cost: Optional[Decimal]) -> Dict[str, Any]:
+    """Fields of a SpendSeries response from monthly_spend_query rows"""
+    sanctioned = float(sanctioned_cost or 0)
+    points = [
+        {
+            "month": row.month,
+            "disbursed": float(row.amount),
+            "entries": row.entry_count,
+            "cumulative": float(row.cumulative),
+            "share_of_sanctioned": float(row.cumulative) / sanctioned if sanctioned else None,
+        }
+        for row in rows
+    ]
+    total = points[-1]["cumulative"] if points else 0.0
+    return {
+        "scope": scope[0],
+        "scope_key": scope[1],
+        "sanctioned_cost": sanctioned,
+        "total_disbursed": total,
+        "overrun_amount": max(total - sanctioned, 0.0),
+        "points": points,
+    }
+
+
+if __name__ == "__main__":
+    # Nightly, e.g. from cron: python -m app.core.ledger
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as connection:
+        ensure_partitions(connection)
+        refresh_all(connection)
+    logger.info("Disbursement partitions ensured and ledger snapshots rebuilt")
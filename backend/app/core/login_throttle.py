@@ -0,0 +1,69 @@
+from hashlib import sha256
+from typing import Optional
+import logging
+
+import redis
+
+from app.config import settings
+from app.core.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def _account_key(email: str) -> str:
+    # Hashed so Redis never holds the attempted addresses
+    return f"auth:failures:account:{sha256(email.strip().lower().encode()).hexdigest()[:32]}"
+
+
+def _ip_key(ip: Optional[str]) -> str:
+    return f"auth:failures:ip:{sha256((ip or '').encode()).hexdigest()[:32]}"
+
+
+def retry_after(email: str, ip: Optional[str]) -> Optional[int]:
+    """
+    Seconds until this account or IP may try again, or None if it may now.
+
+    Checked before any bcrypt work, so a credential-stuffing burst is
+    refused with two Redis reads instead of occupying the hash pool.
+    Fails open when Redis is unavailable.
+    """
+    keys = [
+        (_account_key(email), settings.LOGIN_MAX_FAILURES_PER_ACCOUNT),
+        (_ip_key(ip), settings.LOGIN_MAX_FAILURES_PER_IP),
+    ]
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for key, _ in keys:
+            pipe.get(key)
+            pipe.ttl(key)
+        results = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Login throttle check failed: {e}")
+        return None
+
+    waits = [
+        max(ttl, 1)
+        for (_, limit), failures, ttl in zip(keys, results[::2], results[1::2])
+        if failures is not None and int(failures) >= limit
+    ]
+    return max(waits) if waits else None
+
+
+def record_failure(email: str, ip: Optional[str]) -> None:
+    """Count a failed login; the window starts at the first failure"""
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for key in (_account_key(email), _ip_key(ip)):
+            pipe.incr(key)
+            pipe.expire(key, settings.LOGIN_THROTTLE_WINDOW, nx=True)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Login failure not recorded: {e}")
+
+
+def clear_failures(email: str) -> None:
+    """Forget an account's failures after a successful login; the IP count stays"""
+    try:
+        get_redis().delete(_account_key(email))
+    except redis.RedisError as e:
+        logger.warning(f"Login failure reset failed: {e}")
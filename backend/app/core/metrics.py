@@ -0,0 +1,139 @@
+from collections import Counter as Tally
+from contextvars import ContextVar
+from typing import Optional
+import logging
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency", ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+DB_STATEMENTS = Histogram(
+    "db_statements_per_request", "SQL statements executed per request", ["route"], buckets=COUNT_BUCKETS
+)
+DB_TIME = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL statements per request", ["route"], buckets=LATENCY_BUCKETS
+)
+DB_ROWS = Histogram(
+    "db_rows_per_request", "Rows returned or affected per request", ["route"], buckets=ROW_BUCKETS
+)
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups by route and result", ["route", "result"])
+QUERY_BUDGET_EXCEEDED = Counter(
+    "query_budget_exceeded_total", "Requests that ran more SQL statements than QUERY_BUDGET", ["route"]
+)
+REPEATED_STATEMENTS = Counter(
+    "repeated_statement_requests_total", "Requests that ran one statement N_PLUS_ONE_THRESHOLD+ times", ["route"]
+)
+
+
+class RequestStats:
+    """Work done on behalf of one request; shared with the threads it hands off to"""
+    __slots__ = ("statements", "db_seconds", "rows", "cache_hits", "cache_misses", "statement_counts")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.statement_counts: Tally = Tally()
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    _current.set(stats)
+    return stats
+
+
+def record_cache(hit: bool) -> None:
+    """Called by app.core.cache for every lookup"""
+    stats = _current.get()
+    if stats is None:
+        return
+    if hit:
+        stats.cache_hits += 1
+    else:
+        stats.cache_misses += 1
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - started
+    # Client-side cursors report rows fetched; server-side (streamed) ones report -1
+    if cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+    stats.statement_counts[statement] += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed_execute(exception_context) -> None:
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def finish_request(stats: RequestStats, method: str, route: str, status: int, elapsed: float) -> None:
+    """Record a finished request and warn about query-heavy ones"""
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(elapsed)
+    DB_STATEMENTS.labels(route).observe(stats.statements)
+    DB_TIME.labels(route).observe(stats.db_seconds)
+    DB_ROWS.labels(route).observe(stats.rows)
+    if stats.cache_hits:
+        CACHE_LOOKUPS.labels(route, "hit").inc(stats.cache_hits)
+    if stats.cache_misses:
+        CACHE_LOOKUPS.labels(route, "miss").inc(stats.cache_misses)
+
+    if stats.statements > settings.QUERY_BUDGET:
+        QUERY_BUDGET_EXCEEDED.labels(route).inc()
+        logger.warning(
+            f"{method} {route} ran {stats.statements} SQL statements "
+            f"(budget {settings.QUERY_BUDGET}, {stats.db_seconds * 1000:.1f}ms in DB)"
+        )
+
+    if stats.statement_counts:
+        statement, count = stats.statement_counts.most_common(1)[0]
+        if count >= settings.N_PLUS_ONE_THRESHOLD:
+            # The same SQL text with different parameters: usually a lazy load in a loop
+            REPEATED_STATEMENTS.labels(route).inc()
+            logger.warning(f"Possible N+1 in {method} {route}: ran {count}x: {' '.join(statement.split())[:300]}")
+
+
+def render_metrics() -> tuple:
+    """Exposition body and content type; aggregates every worker when PROMETHEUS_MULTIPROC_DIR is set"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
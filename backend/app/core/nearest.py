@@ -0,0 +1,96 @@
+from typing import Sequence, Tuple
+from geoalchemy2 import Geography
+from sqlalchemy import Float, Integer, String, cast, column, func, literal_column, select, values
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from app.models import Project, RoadSegment
+
+# Segments fetched by index order before re-ranking by true distance. The
+# GiST KNN operator orders by planar degrees, which stretch with latitude,
+# so the metre-nearest segment is always within a handful of the first hits.
+KNN_CANDIDATES = 16
+
+
+def point(lat, lon) -> ColumnElement:
+    return func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+
+
+def _distance_m(geometry, target) -> ColumnElement:
+    return func.ST_Distance(cast(geometry, Geography), cast(target, Geography))
+
+
+def _result_columns(candidates):
+    return (
+        candidates.c.segment_id,
+        candidates.c.segment_name,
+        candidates.c.project_id,
+        Project.name.label("project_name"),
+        Project.slug.label("project_slug"),
+        func.lower(cast(Project.status, String)).label("status"),
+        Project.district.label("district"),
+    )
+
+
+def nearest_segments_query(lat: float, lon: float, radius_m: float, limit: int) -> Select:
+    """
+    Road segments within radius_m of a point, nearest first.
+
+    The inner query walks the road_segments GiST index with <-> and stops
+    after a few candidates, so cost doesn't grow with the table.
+    """
+    target = point(lat, lon)
+    candidates = (
+        select(
+            RoadSegment.id.label("segment_id"),
+            RoadSegment.segment_name.label("segment_name"),
+            RoadSegment.project_id.label("project_id"),
+            _distance_m(RoadSegment.geometry, target).label("distance_m"),
+        )
+        .order_by(RoadSegment.geometry.op("<->")(target))
+        .limit(max(limit, KNN_CANDIDATES))
+        .subquery("candidates")
+    )
+    return (
+        select(*_result_columns(candidates), candidates.c.distance_m)
+        .join(Project, Project.id == candidates.c.project_id)
+        .where(candidates.c.distance_m <= radius_m)
+        .order_by(candidates.c.distance_m, candidates.c.segment_id)
+        .limit(limit)
+    )
+
+
+def snap_points_query(points: Sequence[Tuple[float, float]], radius_m: float) -> Select:
+    """
+    Nearest segment within radius_m for each (lat, lon), in one statement.
+
+    Returns one row per point that matched, keyed by its index in points.
+    """
+    inputs = values(
+        column("idx", Integer),
+        column("lat", Float),
+        column("lon", Float),
+        name="inputs"
+    ).data([(idx, lat, lon) for idx, (lat, lon) in enumerate(points)])
+    target = point(inputs.c.lat, inputs.c.lon)
+
+    candidates = (
+        select(
+            RoadSegment.id.label("segment_id"),
+            RoadSegment.segment_name.label("segment_name"),
+            RoadSegment.project_id.label("project_id"),
+            _distance_m(RoadSegment.geometry, target).label("distance_m"),
+        )
+        .order_by(RoadSegment.geometry.op("<->")(target))
+        .limit(KNN_CANDIDATES)
+        .lateral("candidates")
+    )
+    return (
+        select(inputs.c.idx, *_result_columns(candidates), candidates.c.distance_m)
+        .select_from(inputs)
+        .join(candidates, literal_column("true"))
+        .join(Project, Project.id == candidates.c.project_id)
+        .where(candidates.c.distance_m <= radius_m)
+        .distinct(inputs.c.idx)
+        .order_by(inputs.c.idx, candidates.c.distance_m)
+    )
+
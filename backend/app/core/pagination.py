@@ -0,0 +1,224 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Literal, Optional, Tuple, Union
+import json
+import logging
+
+from fastapi import HTTPException, Query
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+
+from app.config import settings
+from app.core.cache import aget_or_set, get_or_set
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
+
+logger = logging.getLogger(__name__)
+
+
+class PageParams:
+    """
+    Shared pagination query parameters.
+
+    Offset mode (page/page_size) is kept for compatibility. Passing a cursor,
+    or paginate=cursor for the first page, switches to keyset pagination on
+    (created_at, id), which costs the same at any depth.
+    """
+
+    def __init__(
+        self,
+        page: int = Query(1, ge=1),
+        page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor"),
+        paginate: Literal["offset", "cursor"] = Query("offset", description="Pagination mode"),
+        exact_total: bool = Query(False, description="Count matches exactly instead of estimating")
+    ):
+        self.page = page
+        self.page_size = page_size
+        self.cursor = cursor
+        self.exact_total = exact_total
+        self.use_cursor = cursor is not None or paginate == "cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after a row"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, compiled with its bind parameters intact"""
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.stmt, **kw)}"
+
+
+def _plan_rows(plan: Any) -> int:
+    if isinstance(plan, str):  # asyncpg returns json columns undecoded
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _count_sql(stmt: Select) -> Select:
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def estimate_count(db: Session, stmt: Select) -> int:
+    """Row estimate from the query planner; no rows are read"""
+    return _plan_rows(db.execute(Explain(stmt)).scalar())
+
+
+def exact_count(db: Session, stmt: Select) -> int:
+    return db.execute(_count_sql(stmt)).scalar()
+
+
+def cached_count(db: Session, stmt: Select, cache_key: str, tags: Iterable[str]) -> int:
+    """Exact count, shared between requests until a tagged write invalidates it"""
+    return get_or_set(
+        cache_key,
+        lambda: exact_count(db, stmt),
+        ttl=settings.CACHE_COUNT_TTL,
+        tags=set(tags)
+    )
+
+
+async def aestimate_count(db: AsyncSession, stmt: Select) -> int:
+    return _plan_rows((await db.execute(Explain(stmt))).scalar())
+
+
+async def aexact_count(db: AsyncSession, stmt: Select) -> int:
+    return (await db.execute(_count_sql(stmt))).scalar()
+
+
+async def acached_count(db: AsyncSession, stmt: Select, cache_key: str, tags: Iterable[str]) -> int:
+    return await aget_or_set(
+        cache_key,
+        lambda: aexact_count(db, stmt),
+        ttl=settings.CACHE_COUNT_TTL,
+        tags=set(tags)
+    )
+
+
+def _page_query(
+    stmt: Select,
+    params: PageParams,
+    created_col: ColumnElement,
+    id_col: ColumnElement,
+    load_options: Iterable[Any]
+) -> Select:
+    ordered = stmt.options(*load_options).order_by(created_col.desc(), id_col.desc())
+
+    if not params.use_cursor:
+        return ordered.offset((params.page - 1) * params.page_size).limit(params.page_size)
+
+    if params.cursor:
+        created_at, row_id = decode_cursor(params.cursor)
+        ordered = ordered.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+
+    # Fetch one extra row to learn whether another page exists
+    return ordered.limit(params.page_size + 1)
+
+
+def _page_response(
+    rows: List[Any],
+    total: int,
+    params: PageParams,
+    to_item: Callable[[Any], Any]
+) -> Union[PaginatedResponse, CursorPaginatedResponse]:
+    if not params.use_cursor:
+        return PaginatedResponse(
+            items=[to_item(row) for row in rows],
+            total=total,
+            page=params.page,
+            page_size=params.page_size,
+            total_pages=(total + params.page_size - 1) // params.page_size
+        )
+
+    has_more = len(rows) > params.page_size
+    rows = rows[:params.page_size]
+
+    return CursorPaginatedResponse(
+        items=[to_item(row) for row in rows],
+        total=total,
+        total_is_estimate=not params.exact_total,
+        page_size=params.page_size,
+        next_cursor=encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+        has_more=has_more
+    )
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    params: PageParams,
+    created_col: ColumnElement,
+    id_col: ColumnElement,
+    to_item: Callable[[Any], Any],
+    count_cache_key: str,
+    count_tags: Iterable[str],
+    load_options: Iterable[Any] = ()
+) -> Union[PaginatedResponse, CursorPaginatedResponse]:
+    """
+    Run a filtered statement in either offset or keyset mode.
+
+    stmt must select a single ORM entity and carry all filters but no ordering
+    or loader options; load_options are applied to the page fetch only, so
+    counts and estimates stay free of eager-load joins.
+
+    Needs a (created_at DESC, id DESC) index (optionally prefixed by the
+    filtered column) to stay index-only in keyset mode.
+    """
+    if params.exact_total:
+        total = exact_count(db, stmt)
+    elif params.use_cursor:
+        total = estimate_count(db, stmt)
+    else:
+        total = cached_count(db, stmt, count_cache_key, count_tags)
+
+    query = _page_query(stmt, params, created_col, id_col, load_options)
+    rows = db.execute(query).unique().scalars().all()
+    return _page_response(rows, total, params, to_item)
+
+
+async def apaginate(
+    db: AsyncSession,
+    stmt: Select,
+    params: PageParams,
+    created_col: ColumnElement,
+    id_col: ColumnElement,
+    to_item: Callable[[Any], Any],
+    count_cache_key: str,
+    count_tags: Iterable[str],
+    load_options: Iterable[Any] = ()
+) -> Union[PaginatedResponse, CursorPaginatedResponse]:
+    """paginate for an AsyncSession; load_options must not rely on lazy loading"""
+    if params.exact_total:
+        total = await aexact_count(db, stmt)
+    elif params.use_cursor:
+        total = await aestimate_count(db, stmt)
+    else:
+        total = await acached_count(db, stmt, count_cache_key, count_tags)
+
+    query = _page_query(stmt, params, created_col, id_col, load_options)
+    rows = (await db.execute(query)).unique().scalars().all()
+    return _page_response(rows, total, params, to_item)
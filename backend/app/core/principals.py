@@ -0,0 +1,111 @@
+from typing import Any, Dict, Optional
+import logging
+import time
+
+import redis
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import get_or_set, get_redis
+from app.core.invalidation import user_tag
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding users whose tokens stop working once the transaction commits
+PENDING_REVOCATIONS = "principal_revocations"
+
+
+def _principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+def _revoked_key(user_id: int) -> str:
+    return f"auth:revoked:{user_id}"
+
+
+def _fields(user: Optional[User]) -> Optional[Dict[str, Any]]:
+    """What authorization needs from a user, in a cacheable shape"""
+    if user is None:
+        return None
+    return {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "role": user.role.value,
+        "is_active": bool(user.is_active),
+    }
+
+
+def _to_user(fields: Optional[Dict[str, Any]]) -> Optional[User]:
+    """A transient User for route dependencies; it is never added to a session"""
+    if not fields or not fields["is_active"]:
+        return None
+    return User(**{**fields, "role": UserRole(fields["role"])})
+
+
+def revoke_user(user_id: int) -> None:
+    """
+    Reject every token issued to user_id until now.
+
+    Kept for the access token lifetime; anything older has expired anyway.
+    """
+    get_redis().set(_revoked_key(user_id), time.time(), ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def resolve_principal(db: Session, user_id: int, issued_at: float) -> Optional[User]:
+    """
+    The active user a token belongs to, or None.
+
+    Users are cached for PRINCIPAL_CACHE_TTL and dropped on any write to
+    their row; the revocation check is one Redis GET per request, so a
+    disabled account or changed password takes effect on the next request.
+    """
+    try:
+        revoked_at = get_redis().get(_revoked_key(user_id))
+    except redis.RedisError as e:
+        # Without the revocation list the cached copy can't be trusted
+        logger.warning(f"Revocation check failed for user {user_id}, reading the row: {e}")
+        return _to_user(_fields(db.get(User, user_id)))
+
+    if revoked_at is not None and issued_at <= float(revoked_at):
+        return None
+
+    fields = get_or_set(
+        _principal_key(user_id),
+        lambda: _fields(db.get(User, user_id)),
+        ttl=settings.PRINCIPAL_CACHE_TTL,
+        tags=[user_tag(user_id)]
+    )
+    return _to_user(fields)
+
+
+def _loses_access(user: User) -> bool:
+    state = inspect(user)
+    if state.attrs.hashed_password.history.has_changes():
+        return True
+    return state.attrs.is_active.history.has_changes() and not user.is_active
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_revocations(session: Session, flush_context) -> None:
+    """Users disabled, deleted or given a new password by this flush"""
+    pending = session.info.setdefault(PENDING_REVOCATIONS, set())
+    pending.update(obj.id for obj in session.dirty if isinstance(obj, User) and _loses_access(obj))
+    pending.update(obj.id for obj in session.deleted if isinstance(obj, User))
+
+
+@event.listens_for(Session, "after_commit")
+def _revoke_committed(session: Session) -> None:
+    for user_id in session.info.pop(PENDING_REVOCATIONS, ()):
+        try:
+            revoke_user(user_id)
+        except redis.RedisError as e:
+            logger.error(f"Token revocation failed for user {user_id}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_revocations(session: Session) -> None:
+    session.info.pop(PENDING_REVOCATIONS, None)
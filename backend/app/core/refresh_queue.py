@@ -0,0 +1,139 @@
+from typing import Any, Callable, Dict, Iterable, List
+import asyncio
+import json
+import logging
+
+import redis
+from anyio import to_thread
+from sqlalchemy.engine import Connection
+
+from app.config import settings
+from app.core.cache import get_redis
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Only one worker drains at a time, so refreshes never contend with each other
+REFRESH_LOCK = "lock:refresh"
+# kind -> failed attempts at the batch currently being processed
+ATTEMPTS = "refresh:attempts"
+
+# Move pending scopes aside (unless a failed batch is still there) and return them
+TAKE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return {}
+    end
+    redis.call('RENAME', KEYS[1], KEYS[2])
+end
+return redis.call('SMEMBERS', KEYS[2])
+"""
+
+# Applies a batch of decoded scopes inside one transaction
+Handler = Callable[[Connection, List[Any]], None]
+
+_handlers: Dict[str, Handler] = {}
+_take_script = None
+
+
+def _pending_key(kind: str) -> str:
+    return f"refresh:pending:{kind}"
+
+
+def _processing_key(kind: str) -> str:
+    return f"refresh:processing:{kind}"
+
+
+def register(kind: str, handler: Handler) -> None:
+    """Declare how queued scopes of a kind are refreshed; called at import by the owning module"""
+    _handlers[kind] = handler
+
+
+def _apply(kind: str, scopes: List[Any]) -> None:
+    with engine.begin() as conn:
+        _handlers[kind](conn, scopes)
+
+
+def enqueue(scopes: Dict[str, Iterable[Any]]) -> None:
+    """
+    Queue derived-table refreshes for committed writes and return at once.
+
+    Scopes are JSON-encoded into one Redis set per kind, so a district or
+    project touched by many commits before the next drain is refreshed
+    once. If Redis is unavailable the refresh runs inline instead.
+    """
+    encoded = {kind: {json.dumps(scope) for scope in values} for kind, values in scopes.items()}
+    encoded = {kind: members for kind, members in encoded.items() if members}
+    if not encoded:
+        return
+
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for kind, members in encoded.items():
+            pipe.sadd(_pending_key(kind), *members)
+        pipe.execute()
+        return
+    except redis.RedisError as e:
+        logger.warning(f"Refresh queue unavailable, refreshing inline: {e}")
+
+    for kind, members in encoded.items():
+        try:
+            _apply(kind, [json.loads(member) for member in members])
+        except Exception as e:
+            # The nightly rebuilds repair anything missed here
+            logger.error(f"Inline {kind} refresh failed: {e}")
+
+
+def _take(client: redis.Redis, kind: str) -> List[bytes]:
+    global _take_script
+    if _take_script is None:
+        _take_script = client.register_script(TAKE_SCRIPT)
+    return _take_script(keys=[_pending_key(kind), _processing_key(kind)])
+
+
+def drain() -> None:
+    """
+    Apply everything queued, one transaction per kind; safe to call from every worker.
+
+    A failed batch stays aside and is retried on the next drain, with new
+    scopes queueing behind it, until REFRESH_MAX_ATTEMPTS; after that it is
+    dropped for the nightly rebuild to repair.
+    """
+    client = get_redis()
+    lock = client.lock(REFRESH_LOCK, timeout=settings.REFRESH_LOCK_TIMEOUT, blocking=False)
+    if not lock.acquire():
+        return
+
+    try:
+        for kind in sorted(_handlers):
+            members = _take(client, kind)
+            if not members:
+                continue
+            try:
+                _apply(kind, [json.loads(member) for member in members])
+            except Exception as e:
+                attempts = client.hincrby(ATTEMPTS, kind, 1)
+                if attempts < settings.REFRESH_MAX_ATTEMPTS:
+                    logger.error(f"{kind} refresh of {len(members)} scopes failed (attempt {attempts}): {e}")
+                    continue
+                logger.error(f"Dropping {kind} refresh of {len(members)} scopes after {attempts} attempts: {e}")
+
+            pipe = client.pipeline(transaction=False)
+            pipe.delete(_processing_key(kind))
+            pipe.hdel(ATTEMPTS, kind)
+            pipe.execute()
+    finally:
+        try:
+            lock.release()
+        except redis.RedisError:
+            pass  # Lock already expired; nothing to release
+
+
+async def run_refresher() -> None:
+    """Drain every REFRESH_INTERVAL until cancelled; started from the app lifespan"""
+    while True:
+        try:
+            await to_thread.run_sync(drain)
+        except Exception as e:
+            logger.error(f"Refresh drain failed: {e}")
+        await asyncio.sleep(settings.REFRESH_INTERVAL)
@@ -0,0 +1,386 @@
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+import asyncio
+import json
+import logging
+
+import redis
+from anyio import to_thread
+from sqlalchemy import DateTime, Float, Integer, String, Text, column, delete, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config import settings
+from app.core.cache import get_or_set, get_redis, invalidate_tags
+from app.core.invalidation import ALL_REPORTS, project_tag
+from app.core.nearest import point
+from app.core import refresh_queue, scorecards, stats_rollup
+from app.database import engine
+from app.models import Project, PublicReport, RoadSegment
+from app.models.public_report import IssueType, UpvoteFlush
+from app.utils.images import photo_rows
+
+logger = logging.getLogger(__name__)
+
+# Submitted reports waiting to be inserted (LPUSH at the head, consumed from the tail)
+REPORT_QUEUE = "reports:queue"
+# report id -> upvotes not yet written to Postgres
+PENDING_UPVOTES = "upvotes:pending"
+# Snapshot of PENDING_UPVOTES being written; retried if a flush fails
+FLUSHING_UPVOTES = "upvotes:flushing"
+# Id of the FLUSHING_UPVOTES snapshot, recorded in upvote_flushes when applied
+FLUSHING_BATCH = "upvotes:flushing:batch"
+# Queued reports that could not be inserted, kept for inspection
+DEAD_LETTER_QUEUE = "reports:dead"
+# Only one worker flushes at a time
+FLUSH_LOCK = "lock:reports:flush"
+# Highest report id written; upvotes above it are for reports that can't exist
+REPORT_ID_CEILING = "reports:max_id"
+REPORT_ID_CEILING_TTL = 300
+
+# Applied batch ids are kept this long; a retried flush comes within seconds
+UPVOTE_FLUSH_RETENTION = timedelta(days=7)
+
+# Count a vote only if neither the IP nor the device has voted on the report,
+# so neither rotating device ids nor switching networks adds votes
+UPVOTE_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 1 then
+    return -1
+end
+if ARGV[2] ~= '' and redis.call('SISMEMBER', KEYS[2], ARGV[2]) == 1 then
+    return -1
+end
+redis.call('SADD', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+if ARGV[2] ~= '' then
+    redis.call('SADD', KEYS[2], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+end
+return redis.call('HINCRBY', KEYS[3], ARGV[3], 1)
+"""
+
+# Set pending upvotes aside under a new batch id, or resume the batch already aside
+SNAPSHOT_UPVOTES_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    local batch = redis.call('GET', KEYS[3])
+    if not batch then
+        redis.call('SET', KEYS[3], ARGV[1])
+        batch = ARGV[1]
+    end
+    return batch
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('SET', KEYS[3], ARGV[1])
+return ARGV[1]
+"""
+
+_scripts: Dict[str, Any] = {}
+
+
+class UnknownReport(LookupError):
+    """Upvote for a report id that does not exist"""
+
+
+def _script(source: str):
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = get_redis().register_script(source)
+    return script
+
+
+def _submission_key(submission_id: str) -> str:
+    return f"reports:submission:{submission_id}"
+
+
+def voter_ids(ip: Optional[str], device_id: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Opaque IP and device identities, deduplicated separately; raw values are never stored"""
+    def digest(kind: str, value: str) -> str:
+        return sha256(f"{kind}|{value}".encode()).hexdigest()[:32]
+
+    return digest("ip", ip or ""), digest("device", device_id) if device_id else None
+
+
+def _report_id_ceiling(client: redis.Redis) -> int:
+    raw = client.get(REPORT_ID_CEILING)
+    if raw is not None:
+        return int(raw)
+    with engine.connect() as conn:
+        ceiling = conn.execute(select(func.coalesce(func.max(PublicReport.id), 0))).scalar()
+    client.set(REPORT_ID_CEILING, ceiling, ex=REPORT_ID_CEILING_TTL, nx=True)
+    return ceiling
+
+
+def _load_exists(report_id: int) -> bool:
+    with engine.connect() as conn:
+        return conn.execute(select(PublicReport.id).where(PublicReport.id == report_id)).first() is not None
+
+
+def report_exists(report_id: int) -> bool:
+    """
+    Whether report_id names a written report.
+
+    Ids above the highest one written are refused without touching Postgres
+    or leaving keys behind; the rest are looked up once and cached, so a hot
+    report costs no database reads.
+    """
+    if report_id < 1 or report_id > _report_id_ceiling(get_redis()):
+        return False
+    return get_or_set(
+        f"report:exists:{report_id}",
+        lambda: _load_exists(report_id),
+        ttl=settings.REPORT_EXISTS_TTL
+    )
+
+
+def record_upvote(report_id: int, ip: Optional[str], device_id: Optional[str]) -> bool:
+    """
+    Count an upvote in Redis. Returns False if this IP or device already
+    upvoted; raises UnknownReport for ids that don't exist.
+
+    A hot report costs one Redis call per click; Postgres sees one batched
+    UPDATE per flush however many clicks arrived.
+    """
+    if not report_exists(report_id):
+        raise UnknownReport(report_id)
+
+    ip_voter, device_voter = voter_ids(ip, device_id)
+    result = _script(UPVOTE_SCRIPT)(
+        keys=[f"upvoters:{report_id}:ip", f"upvoters:{report_id}:device", PENDING_UPVOTES],
+        args=[ip_voter, device_voter or "", report_id, settings.UPVOTE_DEDUPE_TTL]
+    )
+    return result != -1
+
+
+def pending_upvotes(report_ids: Iterable[int]) -> Dict[int, int]:
+    """Upvotes counted in Redis but not yet in Postgres"""
+    report_ids = list(report_ids)
+    if not report_ids:
+        return {}
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hmget(PENDING_UPVOTES, report_ids)
+        pipe.hmget(FLUSHING_UPVOTES, report_ids)
+        pending, flushing = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Pending upvote lookup failed: {e}")
+        return {}
+    return {
+        report_id: int(a or 0) + int(b or 0)
+        for report_id, a, b in zip(report_ids, pending, flushing)
+        if a or b
+    }
+
+
+def queue_report(report: Dict[str, Any]) -> str:
+    """
+    Queue a report for the next batched insert; returns its submission id.
+
+    Falls back to inserting it directly if Redis is unavailable.
+    """
+    submission_id = str(uuid4())
+    payload = {
+        **report,
+        "submission_id": submission_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        get_redis().lpush(REPORT_QUEUE, json.dumps(payload))
+    except redis.RedisError as e:
+        logger.warning(f"Report queue unavailable, inserting directly: {e}")
+        with engine.begin() as conn:
+            _insert_reports(conn, [payload])
+    return submission_id
+
+
+def submission_report_id(submission_id: str) -> Optional[int]:
+    """Report id for a flushed submission, or None while it is still queued"""
+    report_id = get_redis().get(_submission_key(submission_id))
+    return int(report_id) if report_id else None
+
+
+def _insert_reports(conn: Connection, payloads: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Insert queued reports in one statement; returns submission id -> report id.
+
+    Re-inserting a submission is a no-op, so a flush that failed after
+    committing can safely be retried. Reports for projects deleted in the
+    meantime are dropped.
+    """
+    photos = photo_rows(conn, [p["photo_sha256"] for p in payloads if p.get("photo_sha256")])
+
+    rows = values(
+        column("submission_id", String),
+        column("project_id", Integer),
+        column("issue_type", String),
+        column("description", Text),
+        column("location_description", String),
+        column("lat", Float),
+        column("lon", Float),
+        column("road_segment_id", Integer),
+        column("reporter_name", String),
+        column("reporter_contact", String),
+        column("photo_id", Integer),
+        column("created_at", DateTime(timezone=True)),
+        name="queued"
+    ).data([
+        (
+            p["submission_id"],
+            p["project_id"],
+            IssueType(p["issue_type"]).name,  # Enums are stored by name
+            p["description"],
+            p.get("location_description"),
+            p.get("lat"),
+            p.get("lon"),
+            p.get("road_segment_id"),
+            p.get("reporter_name"),
+            p.get("reporter_contact"),
+            photos.get(p.get("photo_sha256")),
+            datetime.fromisoformat(p["created_at"]),
+        )
+        for p in payloads
+    ])
+
+    source = (
+        select(
+            rows.c.submission_id,
+            rows.c.project_id,
+            rows.c.issue_type.cast(PublicReport.issue_type.type),
+            rows.c.description,
+            rows.c.location_description,
+            point(rows.c.lat, rows.c.lon),  # NULL when no position was given
+            RoadSegment.id,
+            rows.c.reporter_name,
+            rows.c.reporter_contact,
+            rows.c.photo_id,
+            rows.c.created_at,
+        )
+        .join(Project, Project.id == rows.c.project_id)
+        # Segments replaced by a re-import since snapping just leave the link empty
+        .outerjoin(RoadSegment, RoadSegment.id == rows.c.road_segment_id)
+    )
+    inserted = conn.execute(
+        pg_insert(PublicReport)
+        .from_select(
+            ["submission_id", "project_id", "issue_type", "description", "location_description",
+             "location", "road_segment_id", "reporter_name", "reporter_contact", "photo_id", "created_at"],
+            source
+        )
+        .on_conflict_do_nothing(index_elements=[PublicReport.submission_id])
+        .returning(PublicReport.submission_id, PublicReport.id)
+    ).all()
+    return dict(inserted)
+
+
+def _flush_reports(client: redis.Redis) -> List[int]:
+    """Insert the oldest batch of queued reports; returns their project ids"""
+    raw = client.lrange(REPORT_QUEUE, -settings.REPORT_FLUSH_BATCH, -1)
+    if not raw:
+        return []
+
+    payloads = [json.loads(item) for item in raw]
+    try:
+        with engine.begin() as conn:
+            inserted = _insert_reports(conn, payloads)
+    except (DataError, IntegrityError, KeyError, ValueError) as e:
+        # A malformed submission must not block the queue; isolate it
+        logger.error(f"Batched report insert failed, retrying one by one: {e}")
+        inserted = {}
+        for item, payload in zip(raw, payloads):
+            try:
+                with engine.begin() as conn:
+                    inserted.update(_insert_reports(conn, [payload]))
+            except (DataError, IntegrityError, KeyError, ValueError) as e:
+                logger.error(f"Dropping queued report {payload.get('submission_id')}: {e}")
+                client.lpush(DEAD_LETTER_QUEUE, item)
+
+    # Only this flusher removes from the tail, and producers only push at the head
+    pipe = client.pipeline(transaction=False)
+    for submission_id, report_id in inserted.items():
+        pipe.set(_submission_key(submission_id), report_id, ex=settings.SUBMISSION_STATUS_TTL)
+    if inserted:
+        # Ids come from a sequence and only this flusher runs, so the newest batch holds the max
+        pipe.set(REPORT_ID_CEILING, max(inserted.values()), ex=REPORT_ID_CEILING_TTL)
+    pipe.ltrim(REPORT_QUEUE, 0, -len(raw) - 1)
+    pipe.execute()
+
+    return sorted({p["project_id"] for p in payloads if p["submission_id"] in inserted})
+
+
+def _flush_upvotes(client: redis.Redis) -> None:
+    """
+    Apply accumulated upvotes with one UPDATE ... FROM (VALUES ...).
+
+    Each snapshot has a batch id recorded in the same transaction as the
+    UPDATE, so a snapshot whose cleanup failed after commit is never
+    applied twice.
+    """
+    batch = _script(SNAPSHOT_UPVOTES_SCRIPT)(
+        keys=[PENDING_UPVOTES, FLUSHING_UPVOTES, FLUSHING_BATCH],
+        args=[str(uuid4())]
+    )
+    if batch is None:
+        return  # Nothing pending
+
+    counts = sorted(
+        (int(report_id), int(delta))
+        for report_id, delta in client.hgetall(FLUSHING_UPVOTES).items()
+    )
+    if counts:
+        deltas = values(column("id", Integer), column("delta", Integer), name="deltas").data(counts)
+        with engine.begin() as conn:
+            first_time = conn.execute(
+                pg_insert(UpvoteFlush)
+                .values(batch_id=batch.decode())
+                .on_conflict_do_nothing(index_elements=[UpvoteFlush.batch_id])
+                .returning(UpvoteFlush.batch_id)
+            ).first()
+            if first_time:
+                conn.execute(
+                    update(PublicReport)
+                    .where(PublicReport.id == deltas.c.id)
+                    .values(upvotes_count=PublicReport.upvotes_count + deltas.c.delta)
+                )
+            else:
+                logger.warning(f"Upvote batch {batch.decode()} was already applied; discarding it")
+            conn.execute(delete(UpvoteFlush).where(UpvoteFlush.applied_at < func.now() - UPVOTE_FLUSH_RETENTION))
+    client.delete(FLUSHING_UPVOTES, FLUSHING_BATCH)
+
+
+def flush() -> None:
+    """Write buffered reports and upvotes to Postgres; safe to call from every worker"""
+    client = get_redis()
+    lock = client.lock(FLUSH_LOCK, timeout=60, blocking=False)
+    if not lock.acquire():
+        return
+
+    try:
+        project_ids = _flush_reports(client)
+        _flush_upvotes(client)
+    finally:
+        try:
+            lock.release()
+        except redis.RedisError:
+            pass
+
+    if not project_ids:
+        return
+
+    # Core inserts bypass the ORM session hooks
+    invalidate_tags({ALL_REPORTS} | {project_tag(project_id) for project_id in project_ids})
+    refresh_queue.enqueue({stats_rollup.PROJECTS_KIND: project_ids, scorecards.PROJECTS_KIND: project_ids})
+
+
+async def run_flusher() -> None:
+    """Flush every REPORT_FLUSH_INTERVAL until cancelled; started from the app lifespan"""
+    while True:
+        try:
+            await to_thread.run_sync(flush)
+        except Exception as e:
+            logger.error(f"Report flush failed: {e}")
+        await asyncio.sleep(settings.REPORT_FLUSH_INTERVAL)
@@ -0,0 +1,49 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.encoders import decimal_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+# Enums, datetimes, dates and UUIDs are native to orjson
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Types orjson can't encode itself"""
+    if isinstance(value, Decimal):
+        # As FastAPI encodes them in responses (e.g. in export rows)
+        return decimal_encoder(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a response payload to JSON bytes"""
+    return orjson.dumps(value, default=_default, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: FastAPI's encoded content, serialized by orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class EncodedJSONResponse(Response):
+    """
+    A body that is already JSON bytes, e.g. from the cache, sent as-is.
+
+    Returning a Response skips response_model validation and encoding, so
+    only return bytes produced by dumps() from a validated model.
+    """
+    media_type = "application/json"
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """Final response bytes for a validated model, ready to cache"""
+    return dumps(model.model_dump(mode="json"))
@@ -0,0 +1,186 @@
+from itertools import chain
+from typing import Iterable, Optional, Set
+from sqlalchemy import Float, and_, case, cast, event, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.models import Firm, Project, ProjectStatus, PublicReport, Disbursement
+from app.models.firm_scorecard import FirmScorecard
+from app.models.public_report import ReportStatus
+from app.core import refresh_queue
+from app.core.invalidation import current_and_previous
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys for firms/projects touched in the current transaction
+PENDING_FIRMS = "scorecard_firms"
+PENDING_PROJECTS = "scorecard_projects"
+# Refresh queue kinds
+FIRMS_KIND = "scorecards:firms"
+PROJECTS_KIND = "scorecards:projects"
+
+CLOSED_REPORT_STATUSES = (ReportStatus.RESOLVED, ReportStatus.REJECTED)
+
+
+def _ratio(numerator, denominator):
+    return cast(numerator, Float) / func.nullif(cast(denominator, Float), 0)
+
+
+def _scorecard_source(where):
+    """One scorecard row per firm matching where, aggregated over its contracts"""
+    today = func.current_date()
+    proposed = Project.proposed_end_date
+    actual = Project.actual_end_date
+    open_project = Project.status.not_in([ProjectStatus.COMPLETED, ProjectStatus.CANCELLED])
+
+    due = and_(Project.status != ProjectStatus.CANCELLED, proposed <= today)
+    late = and_(
+        Project.status != ProjectStatus.CANCELLED,
+        or_(actual > proposed, and_(actual.is_(None), open_project, proposed < today))
+    )
+    overrun = func.greatest(Project.total_disbursed - Project.sanctioned_cost, 0)
+
+    reports = (
+        select(func.count())
+        .where(PublicReport.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    open_reports = (
+        select(func.count())
+        .where(PublicReport.project_id == Project.id, PublicReport.status.not_in(CLOSED_REPORT_STATUSES))
+        .correlate(Project)
+        .scalar_subquery()
+    )
+
+    def count_where(condition):
+        return func.count(case((condition, 1)))
+
+    project_count = func.count(Project.id)
+    late_count = count_where(late)
+    sanctioned = func.coalesce(func.sum(Project.sanctioned_cost), 0)
+    overrun_amount = func.coalesce(func.sum(overrun), 0)
+    report_count = func.coalesce(func.sum(reports), 0)
+
+    return (
+        select(
+            Firm.id,
+            project_count,
+            count_where(Project.status == ProjectStatus.ACTIVE),
+            count_where(Project.status == ProjectStatus.COMPLETED),
+            count_where(Project.status == ProjectStatus.DELAYED),
+            late_count,
+            func.avg(case((late, func.coalesce(actual, today) - proposed))),
+            _ratio(count_where(and_(due, ~late)), count_where(due)),
+            sanctioned,
+            func.coalesce(func.sum(Project.total_disbursed), 0),
+            count_where(Project.total_disbursed > Project.sanctioned_cost),
+            overrun_amount,
+            _ratio(overrun_amount, sanctioned),
+            report_count,
+            func.coalesce(func.sum(open_reports), 0),
+            _ratio(report_count, project_count),
+        )
+        .select_from(Firm)
+        .outerjoin(Project, Project.contractor_id == Firm.id)
+        .where(*where)
+        .group_by(Firm.id)
+        .order_by(Firm.id)  # Upsert rows in a fixed order so concurrent refreshes can't deadlock
+    )
+
+
+SCORECARD_COLUMNS = [
+    "firm_id", "project_count", "active_projects", "completed_projects", "delayed_projects",
+    "late_projects", "avg_delay_days", "on_time_rate", "sanctioned_cost", "total_disbursed",
+    "overrun_projects", "overrun_amount", "overrun_rate", "report_count", "open_report_count",
+    "reports_per_project",
+]
+
+
+def _upsert(conn: Connection, where) -> None:
+    stmt = pg_insert(FirmScorecard).from_select(SCORECARD_COLUMNS, _scorecard_source(where))
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=[FirmScorecard.firm_id],
+        set_={
+            **{name: stmt.excluded[name] for name in SCORECARD_COLUMNS[1:]},
+            "refreshed_at": func.now(),
+        }
+    ))
+
+
+def refresh_firms(conn: Connection, firm_ids: Iterable[int]) -> None:
+    """
+    Recompute the scorecards of the given firms.
+
+    Cost is bounded by those firms' projects and their reports, whatever the
+    size of the projects table.
+    """
+    firm_ids = sorted({firm_id for firm_id in firm_ids if firm_id})
+    if firm_ids:
+        _upsert(conn, (Firm.id.in_(firm_ids),))
+
+
+def contractors_of(conn: Connection, project_ids: Iterable[int]) -> Set[int]:
+    project_ids = list(project_ids)
+    if not project_ids:
+        return set()
+    return set(conn.execute(
+        select(Project.contractor_id).where(Project.id.in_(project_ids)).distinct()
+    ).scalars())
+
+
+def refresh_projects(conn: Connection, project_ids: Iterable[int], firm_ids: Optional[Iterable[int]] = None) -> None:
+    """Recompute the scorecards of the projects' current contractors (plus firm_ids)"""
+    refresh_firms(conn, contractors_of(conn, project_ids) | set(firm_ids or ()))
+
+
+def refresh_all(conn: Connection) -> None:
+    """
+    Rebuild every scorecard. Run nightly: lateness depends on today's date,
+    so open projects become late without any row changing.
+    """
+    _upsert(conn, ())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_firms(session: Session, flush_context) -> None:
+    firm_ids: Set[int] = session.info.setdefault(PENDING_FIRMS, set())
+    project_ids: Set[int] = session.info.setdefault(PENDING_PROJECTS, set())
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Project):
+            # A contract moved to another firm changes both firms' records
+            firm_ids.update(current_and_previous(obj, "contractor_id"))
+        elif isinstance(obj, (PublicReport, Disbursement)):
+            project_ids.update(current_and_previous(obj, "project_id"))
+        elif isinstance(obj, Firm) and obj in session.new:
+            firm_ids.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed(session: Session) -> None:
+    firm_ids = session.info.pop(PENDING_FIRMS, None) or set()
+    project_ids = session.info.pop(PENDING_PROJECTS, None) or set()
+    # Applied off the request path, coalesced with other commits touching the same firms
+    refresh_queue.enqueue({FIRMS_KIND: firm_ids, PROJECTS_KIND: project_ids})
+
+
+refresh_queue.register(FIRMS_KIND, refresh_firms)
+refresh_queue.register(PROJECTS_KIND, refresh_projects)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_firms(session: Session) -> None:
+    session.info.pop(PENDING_FIRMS, None)
+    session.info.pop(PENDING_PROJECTS, None)
+
+
+if __name__ == "__main__":
+    # Nightly full rebuild, e.g. from cron: python -m app.core.scorecards
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as connection:
+        refresh_all(connection)
+    logger.info("Firm scorecards rebuilt")
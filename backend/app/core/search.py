@@ -0,0 +1,49 @@
+from typing import Tuple
+from sqlalchemy import Float, Text, cast, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql.elements import ColumnElement
+from app.models import Project
+
+# Place names and transliterations don't stem like English, so the
+# 'simple' configuration (lower-casing only) is used for full-text search
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# Generated columns maintained by Postgres (alembic revision 0002). They are
+# deliberately not mapped on Project so ORM writes never try to set them.
+search_document = literal_column("projects.search_document", TSVECTOR)
+search_text = literal_column("projects.search_text", Text)
+
+# Weights applied when combining the two relevance signals
+FULL_TEXT_WEIGHT = 1.0
+TRIGRAM_WEIGHT = 0.5
+
+
+def normalize_query(q: str) -> str:
+    """Collapse whitespace and lower-case a user query"""
+    return " ".join(q.split()).lower()
+
+
+def project_search(q: str) -> Tuple[ColumnElement, ColumnElement]:
+    """
+    Build the filter and relevance expressions for a free-text project search.
+
+    Matches on full-text (exact words, any order), trigram word similarity
+    (typos and transliteration variants such as "Vishakhapatnam" vs
+    "Visakhapatnam") and pincode prefix. Each branch is served by its own
+    index, so Postgres combines them with a bitmap OR instead of a scan.
+    """
+    term = normalize_query(q)
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+    search_filter = or_(
+        search_document.op("@@")(tsquery),
+        search_text.op("%>")(term),
+        Project.pincode.startswith(term, autoescape=True)
+    )
+
+    rank = (
+        literal(FULL_TEXT_WEIGHT) * func.ts_rank_cd(search_document, tsquery)
+        + literal(TRIGRAM_WEIGHT) * func.word_similarity(term, search_text)
+    )
+
+    return search_filter, cast(rank, Float)
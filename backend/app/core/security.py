@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
@@ -7,8 +10,24 @@ from app.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
+class HashingBusy(Exception):
+    """More logins are waiting for bcrypt than PASSWORD_HASH_MAX_PENDING"""
+
+
+_hash_pool: Optional[ThreadPoolExecutor] = None
+_pending_hashes = 0
+
+
+def verify_password(plain_password: str, hashed_password: Optional[str]) -> bool:
+    """
+    Verify a password against its hash.
+
+    With no hash (unknown account) a dummy verification still runs, so
+    response time doesn't reveal which emails are registered.
+    """
+    if hashed_password is None:
+        pwd_context.dummy_verify()
+        return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -17,6 +36,40 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_hash_pool() -> ThreadPoolExecutor:
+    """bcrypt releases the GIL, so a few threads hash in parallel without holding request threads"""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+async def averify_password(plain_password: str, hashed_password: Optional[str]) -> bool:
+    """
+    verify_password on the bounded bcrypt pool.
+
+    Raises HashingBusy instead of queueing without limit, so a login burst
+    is shed rather than delaying every login behind it.
+    """
+    global _pending_hashes
+    if _pending_hashes >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HashingBusy()
+    _pending_hashes += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            get_hash_pool(), verify_password, plain_password, hashed_password
+        )
+    finally:
+        _pending_hashes -= 1
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -26,7 +79,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # iat lets tokens issued before a revocation be rejected (see app.core.principals).
+    # Sub-second, so a token issued just after a revocation in the same second survives it.
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     return encoded_jwt
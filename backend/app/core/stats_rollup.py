@@ -0,0 +1,220 @@
+from itertools import chain
+from typing import Iterable, List, Set, Tuple
+from sqlalchemy import Date, String, cast, delete, event, func, insert, literal, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.models import Project, PublicReport, Disbursement
+from app.models.stats_rollup import ALL, StatsRollup, MonthlyStatsRollup
+from app.core import refresh_queue
+from app.core.invalidation import current_and_previous
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys for regions/projects touched in the current transaction
+PENDING_REGIONS = "stats_rollup_regions"
+PENDING_PROJECTS = "stats_rollup_projects"
+# Refresh queue kinds
+REGIONS_KIND = "stats_rollup:regions"
+PROJECTS_KIND = "stats_rollup:projects"
+
+# Incremental refreshes hold this shared; a full rebuild holds it exclusively
+REBUILD_LOCK = "stats:rebuild"
+
+Region = Tuple[str, str]
+
+# Measures summed when rolling district rows up to state and national level
+MEASURES = {
+    StatsRollup: ("project_count", "sanctioned_cost", "total_disbursed", "report_count"),
+    MonthlyStatsRollup: ("project_count", "sanctioned_cost"),
+}
+DIMENSIONS = {
+    StatsRollup: ("status", "road_type"),
+    MonthlyStatsRollup: ("month", "status", "road_type"),
+}
+
+
+def _lock(conn: Connection, scope: str, shared: bool = False) -> None:
+    """Transaction-scoped advisory lock so concurrent refreshes of a scope serialize"""
+    lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+    conn.execute(select(lock(func.hashtext(scope))))
+
+
+def _project_dimensions():
+    # Enums are stored by name; rollups key on the lower-case values the API exposes
+    return (
+        func.lower(cast(Project.status, String)).label("status"),
+        func.lower(cast(Project.road_type, String)).label("road_type"),
+    )
+
+
+def _district_totals(where):
+    status, road_type = _project_dimensions()
+    reports = (
+        select(func.count())
+        .where(PublicReport.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Project.state,
+            Project.district,
+            status,
+            road_type,
+            func.count(),
+            func.coalesce(func.sum(Project.sanctioned_cost), 0),
+            func.coalesce(func.sum(Project.total_disbursed), 0),
+            func.coalesce(func.sum(reports), 0),
+        )
+        .where(*where)
+        .group_by(Project.state, Project.district, status, road_type)
+    )
+
+
+def _district_months(where):
+    status, road_type = _project_dimensions()
+    month = cast(
+        func.date_trunc("month", func.coalesce(Project.approval_date, Project.created_at)),
+        Date
+    ).label("month")
+    return (
+        select(
+            Project.state,
+            Project.district,
+            month,
+            status,
+            road_type,
+            func.count(),
+            func.coalesce(func.sum(Project.sanctioned_cost), 0),
+        )
+        .where(*where)
+        .group_by(Project.state, Project.district, month, status, road_type)
+    )
+
+
+def _load_districts(conn: Connection, where) -> None:
+    """Insert district-level rows for projects matching where"""
+    for model, source in ((StatsRollup, _district_totals), (MonthlyStatsRollup, _district_months)):
+        columns = ["state", "district", *DIMENSIONS[model], *MEASURES[model]]
+        conn.execute(insert(model.__table__).from_select(columns, source(where)))
+
+
+def _roll_up(conn: Connection, state: str) -> None:
+    """Rebuild a state's rows from its districts, or national rows (state=ALL) from states"""
+    for model in (StatsRollup, MonthlyStatsRollup):
+        table = model.__table__
+        dimensions = [table.c[name] for name in DIMENSIONS[model]]
+        if state == ALL:
+            source = (table.c.state != ALL, table.c.district == ALL)
+        else:
+            source = (table.c.state == state, table.c.district != ALL)
+
+        conn.execute(delete(table).where(table.c.state == state, table.c.district == ALL))
+        conn.execute(insert(table).from_select(
+            ["state", "district", *DIMENSIONS[model], *MEASURES[model]],
+            select(
+                literal(state),
+                literal(ALL),
+                *dimensions,
+                *[func.sum(table.c[name]) for name in MEASURES[model]]
+            ).where(*source).group_by(*dimensions)
+        ))
+
+
+def refresh_regions(conn: Connection, regions: Iterable[Region]) -> None:
+    """
+    Recompute rollups for the given (state, district) pairs and the levels above them.
+
+    Cost is bounded by the projects in those districts plus the number of
+    rollup rows per state, never by the size of the projects table. Locks are
+    always taken districts -> states -> national so refreshes can't deadlock.
+    """
+    regions = sorted({(state, district) for state, district in regions if state and district})
+    if not regions:
+        return
+
+    _lock(conn, REBUILD_LOCK, shared=True)
+
+    for state, district in regions:
+        _lock(conn, f"stats:{state}:{district}")
+        for model in (StatsRollup, MonthlyStatsRollup):
+            table = model.__table__
+            conn.execute(delete(table).where(table.c.state == state, table.c.district == district))
+        _load_districts(conn, (Project.state == state, Project.district == district))
+
+    for state in sorted({state for state, _ in regions}):
+        _lock(conn, f"stats:{state}")
+        _roll_up(conn, state)
+
+    _lock(conn, "stats:national")
+    _roll_up(conn, ALL)
+
+
+def refresh_all(conn: Connection) -> None:
+    """Rebuild every rollup from scratch; run on a schedule to repair drift"""
+    _lock(conn, REBUILD_LOCK)
+
+    for model in (StatsRollup, MonthlyStatsRollup):
+        conn.execute(delete(model.__table__))
+    _load_districts(conn, ())
+
+    states = conn.execute(
+        select(StatsRollup.state).where(StatsRollup.district != ALL).distinct()
+    ).scalars().all()
+    for state in states:
+        _roll_up(conn, state)
+    _roll_up(conn, ALL)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_regions(session: Session, flush_context) -> None:
+    regions: Set[Region] = session.info.setdefault(PENDING_REGIONS, set())
+    project_ids: Set[int] = session.info.setdefault(PENDING_PROJECTS, set())
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Project):
+            # A project moved between regions changes both the old and the new one
+            for state in current_and_previous(obj, "state"):
+                for district in current_and_previous(obj, "district"):
+                    regions.add((state, district))
+        elif isinstance(obj, (PublicReport, Disbursement)):
+            project_ids.update(current_and_previous(obj, "project_id"))
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed(session: Session) -> None:
+    regions = session.info.pop(PENDING_REGIONS, None) or set()
+    project_ids = session.info.pop(PENDING_PROJECTS, None) or set()
+    # Applied off the request path, coalesced with other commits touching the same scopes
+    refresh_queue.enqueue({REGIONS_KIND: regions, PROJECTS_KIND: project_ids})
+
+
+def _refresh_queued_regions(conn: Connection, regions: List[List[str]]) -> None:
+    refresh_regions(conn, [tuple(region) for region in regions])
+
+
+def _refresh_queued_projects(conn: Connection, project_ids: List[int]) -> None:
+    refresh_regions(conn, conn.execute(
+        select(Project.state, Project.district).where(Project.id.in_(project_ids))
+    ).all())
+
+
+refresh_queue.register(REGIONS_KIND, _refresh_queued_regions)
+refresh_queue.register(PROJECTS_KIND, _refresh_queued_projects)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_regions(session: Session) -> None:
+    session.info.pop(PENDING_REGIONS, None)
+    session.info.pop(PENDING_PROJECTS, None)
+
+
+if __name__ == "__main__":
+    # Scheduled full rebuild, e.g. nightly from cron: python -m app.core.stats_rollup
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.begin() as connection:
+        refresh_all(connection)
+    logger.info("Stats rollups rebuilt")
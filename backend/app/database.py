@@ -0,0 +1,245 @@
+from itertools import count
+from pathlib import Path
+from typing import AsyncGenerator, Generator, List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from app.config import settings, to_async_url
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+Base = declarative_base()
+
+# Migrations; init_db runs them up to the latest revision
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+# Unix time of the client's last successful write, set by the write-tracking middleware
+LAST_WRITE_COOKIE = "rt_last_write"
+
+# Replica progress in seconds; 0 when it has replayed everything it received
+REPLICA_LAG_SQL = text("""
+    SELECT COALESCE(
+        CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+             ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END,
+        0
+    )
+""")
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+    }
+
+
+def _create_engine(url: str):
+    return create_engine(
+        url,
+        connect_args={"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"},
+        **_pool_options()
+    )
+
+
+def _create_async_engine(url: str):
+    return create_async_engine(
+        url,
+        connect_args={"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}},
+        **_pool_options()
+    )
+
+
+def _async_sessionmaker(bind) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
+        autoflush=False,
+        expire_on_commit=False  # Attributes can't lazy-load on access in async code
+    )
+
+
+# Primary, sync: admin writes, background jobs and the remaining sync routes
+engine = _create_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Primary, async: public read routes, which no longer hold a threadpool thread per request
+async_engine = _create_async_engine(settings.async_database_url)
+AsyncSessionLocal = _async_sessionmaker(async_engine)
+
+
+class Replica:
+    """A streaming replica with its last measured lag"""
+
+    def __init__(self, url: str):
+        self.name = url.rpartition("@")[2]  # host/db only, never credentials
+        self.engine = _create_engine(url)
+        self.async_engine = _create_async_engine(to_async_url(url))
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.AsyncSession = _async_sessionmaker(self.async_engine)
+        self.lag: Optional[float] = None  # Unknown until the first check
+        self.checked_at = 0.0
+        self.down_until = 0.0
+
+    def check(self) -> None:
+        with self.engine.connect() as conn:
+            lag = float(conn.execute(REPLICA_LAG_SQL).scalar())
+        self.lag, self.checked_at = lag, time.time()
+
+    def mark_down(self, error: Exception) -> None:
+        self.down_until = time.time() + settings.REPLICA_RETRY_AFTER
+        logger.warning(f"Replica {self.name} unavailable, using primary: {error}")
+
+    def usable(self, now: float, last_write: float) -> bool:
+        if now < self.down_until or self.lag is None:
+            return False
+        # A monitor that stopped reporting is as bad as a lagging replica
+        if now - self.checked_at > settings.REPLICA_LAG_CHECK_INTERVAL * 3:
+            return False
+        if self.lag > settings.REPLICA_MAX_LAG_SECONDS:
+            return False
+        # Everything committed before checked_at - lag had been replayed at the last check
+        return self.checked_at - self.lag >= last_write
+
+
+replicas: List[Replica] = [Replica(url) for url in settings.replica_urls]
+_next_replica = count()
+
+
+def _last_write(request: Request) -> float:
+    """When this client last wrote, if recent enough to matter"""
+    try:
+        written_at = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return 0.0
+    return written_at if time.time() - written_at < settings.READ_YOUR_WRITES_WINDOW else 0.0
+
+
+def choose_replica(last_write: float = 0.0) -> Optional[Replica]:
+    """Round-robin over replicas caught up past last_write; None means use the primary"""
+    now = time.time()
+    candidates = [replica for replica in replicas if replica.usable(now, last_write)]
+    if not candidates:
+        return None
+    return candidates[next(_next_replica) % len(candidates)]
+
+
+def get_db() -> Generator[Session, None, None]:
+    """Request-scoped sync session on the primary"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped async session on the primary"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Request-scoped sync session for read-only routes: a replica when one is
+    healthy and has replayed this client's last write, else the primary
+    """
+    db = None
+    replica = choose_replica(_last_write(request))
+    if replica is not None:
+        db = replica.Session()
+        try:
+            db.connection()
+        except DBAPIError as e:
+            replica.mark_down(e)
+            db.close()
+            db = None
+
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """get_read_db for async routes"""
+    db = None
+    replica = choose_replica(_last_write(request))
+    if replica is not None:
+        db = replica.AsyncSession()
+        try:
+            await db.connection()
+        except (DBAPIError, OSError) as e:
+            replica.mark_down(e)
+            await db.close()
+            db = None
+
+    if db is None:
+        db = AsyncSessionLocal()
+    async with db:
+        yield db
+
+
+def _monitor_replicas() -> None:
+    while True:
+        for replica in replicas:
+            try:
+                replica.check()
+            except Exception as e:
+                if time.time() >= replica.down_until:
+                    replica.mark_down(e)
+        time.sleep(settings.REPLICA_LAG_CHECK_INTERVAL)
+
+
+def start_replica_monitor() -> None:
+    """Measure replica lag in the background; call once per worker"""
+    if not replicas:
+        return
+    thread = threading.Thread(target=_monitor_replicas, name="replica-monitor", daemon=True)
+    thread.start()
+
+
+def init_db() -> None:
+    """
+    Ensure PostGIS and the schema exist by running migrations to the latest revision.
+
+    An empty database starts from the base schema (revision 0000), so it
+    gets the same extensions, indexes and triggers as an upgraded one.
+    Workers starting together take turns; the later ones find nothing to do.
+    """
+    from alembic.config import Config
+    from alembic.runtime.environment import EnvironmentContext
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    script = ScriptDirectory.from_config(config)
+
+    def upgrade(revision, context):
+        return script._upgrade_revs("head", revision)
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('roadtrack:init_db'))"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        with EnvironmentContext(config, script, fn=upgrade, destination_rev="head") as environment:
+            environment.configure(connection=conn, target_metadata=Base.metadata)
+            environment.run_migrations()
+
+
+async def close_db() -> None:
+    """Release pooled connections on shutdown"""
+    for replica in replicas:
+        await replica.async_engine.dispose()
+        replica.engine.dispose()
+    await async_engine.dispose()
+    engine.dispose()
@@ -1,12 +1,24 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 
 from app.config import settings
-from app.database import init_db
+from app.database import LAST_WRITE_COOKIE, close_db, init_db, start_replica_monitor
+from app.core.cache import cache_stats, close_async_redis, start_invalidation_listener
+from app.core.responses import ORJSONResponse
+from app.core.http_cache import apply_http_caching
+from app.core.compression import CompressionMiddleware
+from app.core import metrics
+from app.utils.file_upload import ensure_bucket
+from app.utils.images import shutdown_process_pool
+from app.core.security import shutdown_hash_pool
+from app.core.report_buffer import run_flusher
+from app.core.refresh_queue import run_refresher
+from app.core import accountability, clusters, invalidation, ledger, principals, scorecards, stats_rollup  # noqa: F401  (register session write hooks)
 
 # Configure logging
 logging.basicConfig(
@@ -31,10 +43,40 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Drop keys invalidated by other workers from this worker's local cache
+    start_invalidation_listener()
+    
+    # Local MinIO starts without the bucket
+    if settings.ENVIRONMENT == "development":
+        try:
+            ensure_bucket()
+        except Exception as e:
+            logger.warning(f"Object storage bucket check failed: {e}")
+    
+    # Keep replica lag current so reads can be routed away from the primary
+    start_replica_monitor()
+    
+    # Write buffered report submissions and upvotes in batches
+    flusher = asyncio.create_task(run_flusher())
+    
+    # Apply queued rollup/scorecard/cluster refreshes off the request path
+    refresher = asyncio.create_task(run_refresher())
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    for task in (flusher, refresher):
+        task.cancel()
+        try:
+            # Lets a flush or drain already running in its thread finish first
+            await task
+        except asyncio.CancelledError:
+            pass
+    shutdown_process_pool()
+    shutdown_hash_pool()
+    await close_async_redis()
+    await close_db()
 
 
 # Create FastAPI app
@@ -42,6 +84,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     description="Public Accountability Portal for Road Infrastructure",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -55,16 +98,59 @@ app.add_middleware(
 )
 
 
-# Request timing middleware
+# Request timing and instrumentation (latency, SQL statements, cache lookups per route)
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     start_time = time.time()
+    request_stats = metrics.start_request()
     response = await call_next(request)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    
+    # Templated path, so /projects/1 and /projects/2 share a series
+    route = request.scope.get("route")
+    metrics.finish_request(
+        request_stats,
+        request.method,
+        route.path if route else "unmatched",
+        response.status_code,
+        process_time
+    )
+    return response
+
+
+# Remember when a client last wrote, so its next reads only use replicas
+# that have already replayed that write
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=settings.READ_YOUR_WRITES_WINDOW,
+            httponly=True,
+            samesite="lax"
+        )
     return response
 
 
+# ETags, 304s and per-route Cache-Control for public reads
+@app.middleware("http")
+async def http_caching(request: Request, call_next):
+    response = await call_next(request)
+    return await apply_http_caching(request, response)
+
+
+# Outermost, so everything above sees uncompressed bodies
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -82,13 +168,14 @@ def health_check():
         "status": "healthy",
         "app": settings.APP_NAME,
         "version": settings.VERSION,
-        "environment": settings.ENVIRONMENT
+        "environment": settings.ENVIRONMENT,
+        "cache": cache_stats()
     }
 
 
 # Import and include routers
-from app.api.v1 import projects, reports, stats
-from app.api.v1.admin import auth, projects as admin_projects
+from app.api.v1 import projects, reports, stats, tiles, contractors, officials, roads, exports
+from app.api.v1.admin import auth, projects as admin_projects, upload as admin_upload, documents as admin_documents
 
 # Public API routes
 app.include_router(
@@ -109,6 +196,36 @@ app.include_router(
     tags=["statistics"]
 )
 
+app.include_router(
+    tiles.router,
+    prefix="/api/v1/tiles",
+    tags=["tiles"]
+)
+
+app.include_router(
+    contractors.router,
+    prefix="/api/v1/contractors",
+    tags=["contractors"]
+)
+
+app.include_router(
+    officials.router,
+    prefix="/api/v1/officials",
+    tags=["officials"]
+)
+
+app.include_router(
+    roads.router,
+    prefix="/api/v1/roads",
+    tags=["roads"]
+)
+
+app.include_router(
+    exports.router,
+    prefix="/api/v1/exports",
+    tags=["exports"]
+)
+
 # Admin API routes
 app.include_router(
     auth.router,
@@ -122,6 +239,24 @@ app.include_router(
     tags=["admin-projects"]
 )
 
+app.include_router(
+    admin_upload.router,
+    prefix="/api/v1/admin/upload",
+    tags=["admin-upload"]
+)
+
+app.include_router(
+    admin_documents.router,
+    prefix="/api/v1/admin/documents",
+    tags=["admin-documents"]
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = metrics.render_metrics()
+    return Response(content=body, media_type=content_type)
+
 
 # Root endpoint
 @app.get("/")
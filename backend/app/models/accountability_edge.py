@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+
+class NodeKind(str, enum.Enum):
+    """Roles a person or firm plays on a project; each maps to one Project foreign key"""
+    MINISTER = "minister"
+    OFFICIAL = "official"
+    CONTRACTOR = "contractor"
+    MAINTENANCE_FIRM = "maintenance_firm"
+
+
+class AccountabilityEdge(Base):
+    """
+    Two parties that appear on the same projects, with how often they do.
+
+    Stored in both directions so a node's neighbours are one index range scan,
+    already ordered by co-occurrence. Maintained by app.core.accountability.
+    """
+    __tablename__ = "accountability_edges"
+
+    source_kind = Column(String(20), primary_key=True)
+    source_id = Column(Integer, primary_key=True)
+    target_kind = Column(String(20), primary_key=True)
+    target_id = Column(Integer, primary_key=True)
+
+    project_count = Column(Integer, nullable=False, default=0)  # Projects both appear on
+    sanctioned_cost = Column(Numeric(18, 2), nullable=False, default=0)  # Of those projects
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_accountability_edges_neighbours",
+            "source_kind", "source_id", "target_kind", project_count.desc(), "target_id"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<AccountabilityEdge {self.source_kind}:{self.source_id} -> {self.target_kind}:{self.target_id}>"
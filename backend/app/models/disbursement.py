@@ -0,0 +1,94 @@
+from sqlalchemy import (
+    DDL, BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, Sequence, String, Text, event
+)
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+
+class Disbursement(Base):
+    """
+    One payment released to a project. Append-only: corrections are recorded
+    as a new entry with a negative amount that names the entry it reverses.
+
+    Range-partitioned by disbursement_date into Indian fiscal years
+    (April-March, see app.core.ledger), so the primary key includes the date.
+    """
+    __tablename__ = "disbursements"
+
+    id = Column(BigInteger, Sequence("disbursements_ledger_id_seq"), primary_key=True)
+    disbursement_date = Column(Date, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+
+    amount = Column(Numeric(18, 2), nullable=False)  # Negative for reversals
+    reference = Column(String(100))  # Sanction order / treasury transaction number
+    description = Column(Text)
+    reverses_id = Column(BigInteger)  # Entry this one corrects, if any
+
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_disbursements_project_date", "project_id", "disbursement_date"),
+        {"postgresql_partition_by": "RANGE (disbursement_date)"},
+    )
+
+    def __repr__(self):
+        return f"<Disbursement {self.id} project={self.project_id} {self.amount} on {self.disbursement_date}>"
+
+
+# Tables created outside Alembic (Base.metadata.create_all) still need somewhere to put rows
+event.listen(
+    Disbursement.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS disbursements_default PARTITION OF disbursements DEFAULT")
+)
+
+
+class ProjectLedger(Base):
+    """
+    Running total and most recent entry of each project's disbursements.
+
+    Updated in the transaction that appends the entry, so reads never sum
+    the ledger.
+    """
+    __tablename__ = "project_ledgers"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+
+    total_disbursed = Column(Numeric(18, 2), nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+
+    last_entry_id = Column(BigInteger)
+    last_amount = Column(Numeric(18, 2))
+    last_disbursement_date = Column(Date)
+    last_recorded_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<ProjectLedger project={self.project_id} total={self.total_disbursed}>"
+
+
+class SpendScope(str, enum.Enum):
+    """What a monthly spend series is aggregated over"""
+    PROJECT = "project"
+    DISTRICT = "district"
+    CONTRACTOR = "contractor"
+
+
+class MonthlySpend(Base):
+    """
+    Disbursed amount per month for a project, district or contractor.
+
+    scope_key is the project or firm id, or "state|district"; see
+    app.core.ledger for the helpers that build it.
+    """
+    __tablename__ = "spend_monthly"
+
+    scope = Column(String(20), primary_key=True)
+    scope_key = Column(String(220), primary_key=True)
+    month = Column(Date, primary_key=True)
+
+    amount = Column(Numeric(18, 2), nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<MonthlySpend {self.scope}:{self.scope_key} {self.month}>"
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, Numeric, Float, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class FirmScorecard(Base):
+    """
+    Delivery record of a contractor across the projects it was awarded.
+
+    One row per firm, maintained by app.core.scorecards, so profile pages and
+    leaderboards never aggregate projects at read time.
+    """
+    __tablename__ = "firm_scorecards"
+
+    firm_id = Column(Integer, ForeignKey("firms.id", ondelete="CASCADE"), primary_key=True)
+
+    project_count = Column(Integer, nullable=False, default=0, index=True)
+    active_projects = Column(Integer, nullable=False, default=0)
+    completed_projects = Column(Integer, nullable=False, default=0)
+    delayed_projects = Column(Integer, nullable=False, default=0)  # Status DELAYED
+
+    # Past their proposed end date: finished late, or still open after it
+    late_projects = Column(Integer, nullable=False, default=0)
+    avg_delay_days = Column(Float)  # Over late projects only
+    on_time_rate = Column(Float, index=True)  # Share of projects due by now that finished on time
+
+    sanctioned_cost = Column(Numeric(18, 2), nullable=False, default=0)
+    total_disbursed = Column(Numeric(18, 2), nullable=False, default=0)
+    overrun_projects = Column(Integer, nullable=False, default=0)  # Disbursed more than sanctioned
+    overrun_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    overrun_rate = Column(Float, index=True)  # overrun_amount / sanctioned_cost
+
+    report_count = Column(Integer, nullable=False, default=0)
+    open_report_count = Column(Integer, nullable=False, default=0)
+    reports_per_project = Column(Float, index=True)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    firm = relationship("Firm")
+
+    def __repr__(self):
+        return f"<FirmScorecard firm={self.firm_id} projects={self.project_count}>"
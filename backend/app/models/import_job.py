@@ -0,0 +1,61 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Text, JSON, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+
+class ImportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(Base):
+    """A bulk project import and its progress"""
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255), nullable=False)
+    file_type = Column(String(10), nullable=False)
+    status = Column(Enum(ImportJobStatus), default=ImportJobStatus.PENDING, nullable=False)
+
+    # Progress counters, updated after every chunk
+    total_rows = Column(Integer)  # Estimated from the file before loading starts
+    processed_rows = Column(Integer, default=0, nullable=False)
+    inserted_rows = Column(Integer, default=0, nullable=False)
+    updated_rows = Column(Integer, default=0, nullable=False)
+    error_count = Column(Integer, default=0, nullable=False)
+    error_message = Column(Text)  # Set when the whole job fails
+
+    created_by_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    # Relationships
+    row_errors = relationship("ImportRowError", back_populates="job", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<ImportJob {self.id} {self.filename} ({self.status})>"
+
+
+class ImportRowError(Base):
+    """Why one input row was rejected"""
+    __tablename__ = "import_row_errors"
+    __table_args__ = (
+        # Error reports are paged by row number within a job
+        Index("ix_import_row_errors_job_id", "job_id", "row_number"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("import_jobs.id", ondelete="CASCADE"), nullable=False)
+    row_number = Column(Integer, nullable=False)  # 1-based, header excluded
+    errors = Column(JSON, nullable=False)  # List of messages
+    raw = Column(JSON)  # The row as read, for correcting and re-uploading
+
+    job = relationship("ImportJob", back_populates="row_errors")
+
+    def __repr__(self):
+        return f"<ImportRowError job={self.job_id} row={self.row_number}>"
@@ -0,0 +1,60 @@
+from sqlalchemy import Column, Float, Index, Integer, Numeric, SmallInteger, String
+from geoalchemy2 import Geometry
+from app.database import Base
+
+
+class ProjectPoint(Base):
+    """
+    One representative point per project (on its road, not beside it) with
+    the attributes map clusters are filtered and summed by.
+
+    Also records exactly what each project last contributed to MapCluster,
+    so app.core.clusters can subtract it when the project changes. No foreign
+    key: a deleted project's row must outlive it until its counts are removed.
+    """
+    __tablename__ = "project_points"
+
+    project_id = Column(Integer, primary_key=True)
+    point = Column(Geometry(geometry_type="POINT", srid=4326), nullable=False)
+
+    # Web Mercator coordinates, which the cluster grid is laid out in
+    x = Column(Float, nullable=False)
+    y = Column(Float, nullable=False)
+
+    status = Column(String(30), nullable=False)
+    road_type = Column(String(30), nullable=False)
+    sanctioned_cost = Column(Numeric(18, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProjectPoint project={self.project_id}>"
+
+
+class MapCluster(Base):
+    """
+    Projects per grid cell, status and road type at one zoom level.
+
+    Cells are a Web Mercator grid a few cells to a map tile (see
+    app.core.clusters), kept for the coarse zooms where a view spans
+    thousands of projects. Coordinates are summed so merged cells still
+    yield their members' mean position.
+    """
+    __tablename__ = "map_clusters"
+
+    zoom = Column(SmallInteger, primary_key=True)
+    cell_x = Column(Integer, primary_key=True)
+    cell_y = Column(Integer, primary_key=True)
+    status = Column(String(30), primary_key=True)
+    road_type = Column(String(30), primary_key=True)
+
+    project_count = Column(Integer, nullable=False, default=0)
+    sanctioned_cost = Column(Numeric(18, 2), nullable=False, default=0)
+    sum_lon = Column(Float, nullable=False, default=0)
+    sum_lat = Column(Float, nullable=False, default=0)
+
+    __table_args__ = (
+        # Cells emptied by a delta update, found without scanning the table
+        Index("ix_map_clusters_empty", "zoom", postgresql_where=(project_count <= 0)),
+    )
+
+    def __repr__(self):
+        return f"<MapCluster z{self.zoom} {self.cell_x}/{self.cell_y} {self.status} {self.road_type}>"
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Enum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+
+class DocumentStatus(str, enum.Enum):
+    UPLOADING = "uploading"
+    AVAILABLE = "available"
+
+
+class ProjectDocument(Base):
+    """A tender, sanction order or other file attached to a project, stored in object storage"""
+    __tablename__ = "project_documents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    
+    title = Column(String(255), nullable=False)
+    document_type = Column(String(50))  # e.g. tender, sanction_order, inspection_report
+    filename = Column(String(255), nullable=False)  # Original name, used for downloads
+    content_type = Column(String(100), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    
+    # Object storage location; upload_id is set while a multipart upload is open
+    storage_key = Column(String(500), unique=True, nullable=False)
+    upload_id = Column(String(1024))
+    status = Column(Enum(DocumentStatus), default=DocumentStatus.UPLOADING, nullable=False)
+    
+    uploaded_by_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    uploaded_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    project = relationship("Project", back_populates="documents")
+    
+    def __repr__(self):
+        return f"<ProjectDocument {self.title} - Project {self.project_id}>"
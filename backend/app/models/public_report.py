@@ -0,0 +1,110 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from geoalchemy2 import Geometry
+from app.database import Base
+import enum
+
+
+class IssueType(str, enum.Enum):
+    POTHOLE = "pothole"
+    POOR_QUALITY = "poor_quality"
+    WATERLOGGING = "waterlogging"
+    CRACKS = "cracks"
+    DEBRIS = "debris"
+    SIGNAGE_ISSUE = "signage_issue"
+    DRAINAGE_PROBLEM = "drainage_problem"
+    SAFETY_HAZARD = "safety_hazard"
+    OTHER = "other"
+
+
+class ReportStatus(str, enum.Enum):
+    SUBMITTED = "submitted"
+    UNDER_REVIEW = "under_review"
+    ACKNOWLEDGED = "acknowledged"
+    IN_PROGRESS = "in_progress"
+    RESOLVED = "resolved"
+    REJECTED = "rejected"
+
+
+class PhotoStatus(str, enum.Enum):
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class PublicReport(Base):
+    """An issue reported by a citizen against a project"""
+    __tablename__ = "public_reports"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    submission_id = Column(String(36), unique=True)  # Queue id; makes batched inserts idempotent
+    
+    issue_type = Column(Enum(IssueType), nullable=False)
+    description = Column(Text, nullable=False)
+    location_description = Column(String(500))
+    location = Column(Geometry(geometry_type='POINT', srid=4326))  # Reporter's GPS position, if shared
+    road_segment_id = Column(Integer, ForeignKey("road_segments.id", ondelete="SET NULL"), index=True)  # Segment it was snapped to
+    reporter_name = Column(String(255))
+    reporter_contact = Column(String(255))
+    status = Column(Enum(ReportStatus), default=ReportStatus.SUBMITTED, nullable=False)
+    
+    photo_url = Column(String(500))  # Externally hosted photo, for reports predating photo uploads
+    photo_id = Column(Integer, ForeignKey("report_photos.id"), index=True)
+    upvotes_count = Column(Integer, default=0, nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    resolution_date = Column(DateTime(timezone=True))
+    
+    # Relationships
+    project = relationship("Project", back_populates="reports")
+    photo = relationship("ReportPhoto")
+    road_segment = relationship("RoadSegment")
+    
+    def __repr__(self):
+        return f"<PublicReport {self.id} {self.issue_type} - Project {self.project_id}>"
+
+
+class UpvoteFlush(Base):
+    """
+    A batch of buffered upvotes already added to upvotes_count.
+
+    Written in the transaction that applies the batch, so a retried flush
+    of the same batch is a no-op (see app.core.report_buffer).
+    """
+    __tablename__ = "upvote_flushes"
+
+    batch_id = Column(String(36), primary_key=True)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<UpvoteFlush {self.batch_id}>"
+
+
+class ReportPhoto(Base):
+    """
+    An uploaded photo and its derivatives, stored once per distinct content.
+
+    Reports uploading identical bytes share a row.
+    """
+    __tablename__ = "report_photos"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, nullable=False)  # Of the bytes as uploaded
+    status = Column(Enum(PhotoStatus), default=PhotoStatus.PROCESSING, nullable=False)
+    
+    # Object storage keys; the original is stored with EXIF removed
+    original_key = Column(String(500))
+    thumbnail_key = Column(String(500))
+    medium_key = Column(String(500))
+    width = Column(Integer)
+    height = Column(Integer)
+    error = Column(String(500))
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True))
+    
+    def __repr__(self):
+        return f"<ReportPhoto {self.sha256[:12]} ({self.status})>"
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, event, inspect
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from geoalchemy2 import Geometry
+from typing import Optional
 from app.database import Base
+from app.utils.geojson import build_lods
 
 
 class RoadSegment(Base):
@@ -15,6 +17,12 @@ class RoadSegment(Base):
     # SRID 4326 is WGS84 (standard for GPS coordinates)
     geometry = Column(Geometry(geometry_type='LINESTRING', srid=4326), nullable=False)
     
+    # Simplified copies of geometry, one per level in app.utils.geojson.LOD_LEVELS
+    # (coarsest first). Maintained automatically whenever geometry is written.
+    geometry_lod0 = Column(Geometry(geometry_type='LINESTRING', srid=4326))
+    geometry_lod1 = Column(Geometry(geometry_type='LINESTRING', srid=4326))
+    geometry_lod2 = Column(Geometry(geometry_type='LINESTRING', srid=4326))
+    
     # Additional metadata
     segment_name = Column(String(255))
     length_km = Column(Integer)  # Length in kilometers
@@ -27,5 +35,33 @@ class RoadSegment(Base):
     # Relationships
     project = relationship("Project", back_populates="road_segments")
     
+    @classmethod
+    def geometry_column(cls, level: Optional[int]):
+        """
+        Geometry column for a level of detail (None = full resolution).
+
+        Select it explicitly, with func.coalesce(..., geometry) where rows may
+        lack a simplified copy; reading levels off loaded instances would load
+        each segment's geometries one query at a time.
+        """
+        if level is None:
+            return cls.geometry
+        return getattr(cls, f"geometry_lod{level}")
+    
     def __repr__(self):
-        return f"<RoadSegment {self.segment_name} - Project {self.project_id}>"
\ No newline at end of file
+        return f"<RoadSegment {self.segment_name} - Project {self.project_id}>"
+
+
+@event.listens_for(RoadSegment, "before_insert")
+@event.listens_for(RoadSegment, "before_update")
+def _refresh_lods(mapper, connection, target):
+    """Recompute the simplified geometries when the full geometry changes"""
+    if target.geometry is None:
+        return
+
+    history = inspect(target).attrs.geometry.history
+    if inspect(target).persistent and not history.has_changes():
+        return
+
+    for level, geometry in build_lods(target.geometry).items():
+        setattr(target, f"geometry_lod{level}", geometry)
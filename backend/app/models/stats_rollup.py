@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+# state/district value meaning "all": rows exist at national (both empty),
+# state (district empty) and district level, so every read is a key lookup
+ALL = ""
+
+
+class StatsRollup(Base):
+    """Project totals per region, status and road type"""
+    __tablename__ = "stats_rollups"
+
+    state = Column(String(100), primary_key=True, default=ALL)
+    district = Column(String(100), primary_key=True, default=ALL)
+    status = Column(String(30), primary_key=True)
+    road_type = Column(String(30), primary_key=True)
+
+    project_count = Column(Integer, nullable=False, default=0)
+    sanctioned_cost = Column(Numeric(18, 2), nullable=False, default=0)
+    total_disbursed = Column(Numeric(18, 2), nullable=False, default=0)
+    report_count = Column(Integer, nullable=False, default=0)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<StatsRollup {self.state or '*'}/{self.district or '*'} {self.status} {self.road_type}>"
+
+
+class MonthlyStatsRollup(Base):
+    """Sanctioned projects per region, status, road type and approval month"""
+    __tablename__ = "stats_rollups_monthly"
+
+    state = Column(String(100), primary_key=True, default=ALL)
+    district = Column(String(100), primary_key=True, default=ALL)
+    month = Column(Date, primary_key=True)
+    status = Column(String(30), primary_key=True)
+    road_type = Column(String(30), primary_key=True)
+
+    project_count = Column(Integer, nullable=False, default=0)
+    sanctioned_cost = Column(Numeric(18, 2), nullable=False, default=0)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<MonthlyStatsRollup {self.state or '*'}/{self.district or '*'} {self.month}>"
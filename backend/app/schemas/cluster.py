@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class MapCell(BaseModel):
+    """Projects in one grid cell of a zoomed-out map"""
+    x: int
+    y: int
+    project_count: int
+    sanctioned_cost: float
+    by_status: Dict[str, int]
+    longitude: float  # Mean position of the cell's projects
+    latitude: float
+    bounds: List[float]  # [min_lon, min_lat, max_lon, max_lat] of the cell
+
+
+class MapClusters(BaseModel):
+    zoom: int
+    precomputed: bool
+    cells: List[MapCell]
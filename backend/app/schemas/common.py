@@ -14,6 +14,16 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total_pages: int
 
 
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Generic keyset-paginated response"""
+    items: List[T]
+    total: int
+    total_is_estimate: bool = False
+    page_size: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
 class MessageResponse(BaseModel):
     """Generic message response"""
     message: str
@@ -0,0 +1,58 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from app.models.project_document import DocumentStatus
+
+
+class DocumentUploadCreate(BaseModel):
+    """Start a direct-to-storage upload"""
+    project_id: int
+    title: str = Field(..., min_length=1, max_length=255)
+    document_type: Optional[str] = Field(None, max_length=50)
+    filename: str = Field(..., min_length=1, max_length=255)  # Its extension decides the stored content type
+    size_bytes: int = Field(..., gt=0)
+
+
+class UploadPartURL(BaseModel):
+    part_number: int
+    url: str
+
+
+class DocumentUploadResponse(BaseModel):
+    """Where to PUT each part; parts are size part_size except the last"""
+    document_id: int
+    upload_id: str
+    part_size: int
+    parts: List[UploadPartURL]
+    expires_in: int
+
+
+class UploadPartsRequest(BaseModel):
+    """Re-issue URLs for parts whose URLs expired"""
+    part_numbers: List[int] = Field(..., min_length=1)
+
+
+class CompletedPart(BaseModel):
+    part_number: int = Field(..., ge=1)
+    etag: str  # ETag header returned by storage for the part PUT
+
+
+class DocumentUploadComplete(BaseModel):
+    parts: List[CompletedPart] = Field(..., min_length=1)
+
+
+class DocumentResponse(BaseModel):
+    """Project document"""
+    id: int
+    project_id: int
+    title: str
+    document_type: Optional[str] = None
+    filename: str
+    content_type: str
+    size_bytes: int
+    status: DocumentStatus
+    created_at: datetime
+    uploaded_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+
+
+class ExportSnapshotFile(BaseModel):
+    """One format of the nightly full-dataset export"""
+    url: str
+    size: int
+    rows: int
+
+
+class ExportSnapshots(BaseModel):
+    """Latest nightly export; files are keyed by format"""
+    generated_at: Optional[datetime] = None
+    files: Dict[str, ExportSnapshotFile] = {}
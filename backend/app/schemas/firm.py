@@ -0,0 +1,67 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+
+class FirmListItem(BaseModel):
+    """Contractor / maintenance firm row in listings"""
+    id: int
+    name: str
+    registration_id: str
+    type: str
+    performance_rating: Optional[float] = None
+    is_blacklisted: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class LeaderboardMetric(str, Enum):
+    PROJECT_COUNT = "project_count"
+    COMPLETED_PROJECTS = "completed_projects"
+    LATE_PROJECTS = "late_projects"
+    AVG_DELAY_DAYS = "avg_delay_days"
+    ON_TIME_RATE = "on_time_rate"
+    SANCTIONED_COST = "sanctioned_cost"
+    OVERRUN_AMOUNT = "overrun_amount"
+    OVERRUN_RATE = "overrun_rate"
+    REPORT_COUNT = "report_count"
+    OPEN_REPORT_COUNT = "open_report_count"
+    REPORTS_PER_PROJECT = "reports_per_project"
+    PERFORMANCE_RATING = "performance_rating"
+
+
+class FirmScorecardResponse(BaseModel):
+    """Delivery record across the projects a firm was awarded as contractor"""
+    project_count: int
+    active_projects: int
+    completed_projects: int
+    delayed_projects: int
+    late_projects: int
+    avg_delay_days: Optional[float] = None
+    on_time_rate: Optional[float] = None
+    sanctioned_cost: float
+    total_disbursed: float
+    overrun_projects: int
+    overrun_amount: float
+    overrun_rate: Optional[float] = None
+    report_count: int
+    open_report_count: int
+    reports_per_project: Optional[float] = None
+    refreshed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FirmProfile(FirmListItem):
+    """Contractor profile page"""
+    scorecard: Optional[FirmScorecardResponse] = None  # None until the first refresh
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    firm: FirmListItem
+    scorecard: FirmScorecardResponse
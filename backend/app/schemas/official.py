@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.models.accountability_edge import NodeKind
+
+
+class OfficialListItem(BaseModel):
+    """Approving official row in listings"""
+    id: int
+    name: str
+    designation: str
+    department: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class GraphNode(BaseModel):
+    """A minister, official or firm in the accountability graph"""
+    kind: NodeKind
+    id: int
+    name: Optional[str] = None
+    hop: int = 1  # Edges from the queried node
+    project_count: int  # Projects shared with the node it was reached from
+    sanctioned_cost: Optional[float] = None  # Of those projects; direct neighbours only
+
+
+class SharedContractorOfficial(BaseModel):
+    """Another official who approved contracts for the same firms"""
+    id: int
+    name: Optional[str] = None
+    shared_contractors: int
+    shared_contractor_projects: int  # Projects the other official approved for those firms
+
+
+class GraphProject(BaseModel):
+    id: int
+    name: str
+    slug: str
+    status: str
+    district: Optional[str] = None
+    sanctioned_cost: Optional[float] = None
@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+from datetime import datetime
+from app.models.public_report import IssueType, ReportStatus
+
+
+class ReportPhotoURLs(BaseModel):
+    """Photo renditions; thumbnail and medium are WebP"""
+    thumbnail: str
+    medium: str
+    original: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class PublicReportResponse(BaseModel):
+    """Citizen report"""
+    id: int
+    project_id: int
+    issue_type: IssueType
+    description: str
+    location_description: Optional[str] = None
+    status: ReportStatus
+    photo_url: Optional[str] = None  # Medium rendition, or an externally hosted photo
+    photo: Optional[ReportPhotoURLs] = None  # None while the upload is still processing
+    upvotes_count: int
+    created_at: datetime
+    resolution_date: Optional[datetime] = None
+
+
+class ReportSubmissionResponse(BaseModel):
+    """A queued report; report_id is set once it has been written"""
+    submission_id: str
+    status: Literal["queued", "created"]
+    report_id: Optional[int] = None
+
+
+class UpvoteResponse(BaseModel):
+    report_id: int
+    counted: bool  # False if this device/IP had already upvoted
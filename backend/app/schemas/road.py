@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.config import settings
+
+
+class NearestRoad(BaseModel):
+    """A road segment and its project, with distance from the query point"""
+    segment_id: int
+    segment_name: Optional[str] = None
+    distance_m: float
+    project_id: int
+    project_name: str
+    project_slug: str
+    status: str
+    district: Optional[str] = None
+
+
+class SnapPoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+
+class SnapRequest(BaseModel):
+    points: List[SnapPoint] = Field(..., min_length=1, max_length=settings.SNAP_MAX_POINTS)
+    radius_m: float = Field(default=settings.REPORT_SNAP_RADIUS_M, gt=0, le=settings.NEAREST_MAX_RADIUS_M)
+
+
+class SnapResult(BaseModel):
+    """Nearest road for one input point; match is None if none is within radius_m"""
+    index: int
+    lat: float
+    lon: float
+    match: Optional[NearestRoad] = None
+
+
+class SnapResponse(BaseModel):
+    radius_m: float
+    matched: int
+    results: List[SnapResult]
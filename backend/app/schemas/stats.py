@@ -0,0 +1,52 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class ProjectStats(BaseModel):
+    """Dashboard totals for the nation, a state or a district"""
+    state: Optional[str] = None
+    district: Optional[str] = None
+    total_projects: int
+    total_cost: float
+    total_disbursed: float
+    completed_projects: int
+    active_projects: int
+    delayed_projects: int
+    total_reports: int
+    by_status: Dict[str, int]
+    by_road_type: Dict[str, int]
+    by_state: Optional[Dict[str, int]] = None
+    by_district: Optional[Dict[str, int]] = None
+
+
+class MonthlyStatsPoint(BaseModel):
+    """Projects sanctioned in one month"""
+    month: date
+    project_count: int
+    sanctioned_cost: float
+
+
+class MonthlyStats(BaseModel):
+    state: Optional[str] = None
+    district: Optional[str] = None
+    points: List[MonthlyStatsPoint]
+
+
+class SpendPoint(BaseModel):
+    """Disbursements in one month and the running total up to it"""
+    month: date
+    disbursed: float
+    entries: int
+    cumulative: float
+    share_of_sanctioned: Optional[float] = None  # cumulative / sanctioned_cost
+
+
+class SpendSeries(BaseModel):
+    """Cumulative spend against sanctioned cost for a project, district or contractor"""
+    scope: str
+    scope_key: str
+    sanctioned_cost: float
+    total_disbursed: float
+    overrun_amount: float  # Disbursed beyond the sanctioned cost
+    points: List[SpendPoint]
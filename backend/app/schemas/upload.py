@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from app.models.import_job import ImportJobStatus
+
+
+class ImportJobResponse(BaseModel):
+    """Bulk import status and progress"""
+    id: int
+    filename: str
+    file_type: str
+    status: ImportJobStatus
+    total_rows: Optional[int] = None
+    processed_rows: int
+    inserted_rows: int
+    updated_rows: int
+    error_count: int
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ImportRowErrorResponse(BaseModel):
+    """A rejected input row"""
+    row_number: int
+    errors: List[str]
+    raw: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ImportRowErrorPage(BaseModel):
+    """Row errors after a given row number"""
+    items: List[ImportRowErrorResponse]
+    next_after_row: Optional[int] = None
@@ -0,0 +1,584 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import csv
+import io
+import logging
+import os
+
+import pandas as pd
+import shapely
+from openpyxl import load_workbook
+from shapely import wkt
+from shapely.errors import ShapelyError
+from slugify import slugify
+from sqlalchemy import (
+    Column, Date, Integer, MetaData, Numeric, String, Table, Text,
+    cast, delete, func, insert, literal_column, select, update
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from geoalchemy2 import Geography
+
+from app.config import settings
+from app.database import engine
+from app.models import Project, RoadSegment, Firm, Minister, Official, ProjectStatus, RoadType
+from app.models.import_job import ImportJob, ImportJobStatus, ImportRowError
+from app.core.cache import invalidate_tags
+from app.core.invalidation import ALL_FIRMS, ALL_PROJECTS, project_tag, region_tag
+from app.core.accountability import Node, project_nodes, refresh_nodes
+from app.core.clusters import refresh_points
+from app.core.ledger import project_scopes, refresh_scopes
+from app.core.scorecards import refresh_projects
+from app.core.stats_rollup import refresh_regions
+from app.utils.geojson import LOD_LEVELS
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = (
+    "name", "district", "state", "status", "road_type",
+    "sanctioned_cost", "contractor_registration_id", "approving_official_id",
+)
+OPTIONAL_COLUMNS = (
+    "description", "city", "pincode", "contractor_name", "contractor_type", "minister_id",
+    "approval_date", "start_date", "proposed_end_date",
+    "segment_name", "geometry", "start_lat", "start_lon", "end_lat", "end_lon",
+)
+
+# Coordinates outside this lon/lat box are almost certainly swapped or mistyped
+INDIA_BOUNDS = (68.0, 6.0, 98.0, 38.0)
+
+# Firms created by an import without an explicit contractor_type
+DEFAULT_FIRM_TYPE = "contractor"
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y")
+
+# Per-transaction staging table that COPY loads into before the upserts
+staging = Table(
+    "import_staging",
+    MetaData(),
+    Column("row_number", Integer, nullable=False),
+    Column("slug", String(300), nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("description", Text),
+    Column("district", String(100), nullable=False),
+    Column("city", String(100)),
+    Column("state", String(100), nullable=False),
+    Column("pincode", String(10)),
+    Column("status", String(30), nullable=False),
+    Column("road_type", String(30), nullable=False),
+    Column("sanctioned_cost", Numeric(18, 2), nullable=False),
+    Column("contractor_registration_id", String(100), nullable=False),
+    Column("contractor_name", String(255)),
+    Column("contractor_type", String(50)),
+    Column("approving_official_id", Integer, nullable=False),
+    Column("minister_id", Integer),
+    Column("approval_date", Date),
+    Column("start_date", Date),
+    Column("proposed_end_date", Date),
+    Column("segment_name", String(255)),
+    Column("geometry", Text),  # WKT, SRID 4326
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+STAGING_COLUMNS = [column.name for column in staging.columns]
+
+Row = Tuple[int, Dict[str, Any]]  # (1-based row number, raw values by column)
+
+
+@dataclass
+class ChunkResult:
+    inserted: int = 0
+    updated: int = 0
+    rejected: List[Tuple[int, List[str], Dict[str, Any]]] = field(default_factory=list)
+    project_ids: Set[int] = field(default_factory=set)
+    regions: Set[Tuple[str, str]] = field(default_factory=set)  # Districts of loaded projects, before and after the upsert
+    previous_nodes: Set[Node] = field(default_factory=set)  # Parties on updated projects before the upsert
+
+
+def normalize_header(name: Any) -> str:
+    return slugify(str(name or ""), separator="_")
+
+
+def count_rows(path: str, file_type: str) -> Optional[int]:
+    """Cheap row estimate for progress reporting"""
+    if file_type == "xlsx":
+        workbook = load_workbook(path, read_only=True)
+        try:
+            max_row = workbook.active.max_row
+            return max_row - 1 if max_row else None
+        finally:
+            workbook.close()
+
+    with open(path, "rb") as f:
+        return max(sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b"")) - 1, 0)
+
+
+def iter_chunks(path: str, file_type: str, chunk_size: int) -> Iterator[List[Row]]:
+    """
+    Stream rows in chunks without loading the whole file
+    """
+    if file_type == "csv":
+        row_number = 0
+        for frame in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size):
+            frame.columns = [normalize_header(c) for c in frame.columns]
+            chunk = []
+            for record in frame.to_dict("records"):
+                row_number += 1
+                chunk.append((row_number, record))
+            yield chunk
+        return
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [normalize_header(c) for c in next(rows, ())]
+        chunk = []
+        for row_number, values in enumerate(rows, start=1):
+            if all(v is None or str(v).strip() == "" for v in values):
+                continue
+            chunk.append((row_number, {h: v for h, v in zip(header, values) if h}))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        workbook.close()
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date '{value}'")
+
+
+def _parse_enum(enum_cls, value: str):
+    """Accept the API value ('national_highway') or a human form ('National Highway')"""
+    try:
+        return enum_cls(slugify(value, separator="_"))
+    except ValueError:
+        allowed = ", ".join(member.value for member in enum_cls)
+        raise ValueError(f"must be one of {allowed}")
+
+
+def validate_row(raw: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Clean one row into staging columns, collecting every problem rather than the first
+    """
+    errors = []
+    values = {name: _text(raw.get(name)) for name in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+    clean: Dict[str, Any] = {
+        name: values[name]
+        for name in ("name", "description", "district", "city", "state",
+                     "contractor_registration_id", "contractor_name", "segment_name")
+    }
+    clean["contractor_type"] = (values["contractor_type"] or DEFAULT_FIRM_TYPE).lower()
+
+    for name in REQUIRED_COLUMNS:
+        if not values[name]:
+            errors.append(f"{name} is required")
+
+    # Enums are stored by name
+    for name, enum_cls in (("status", ProjectStatus), ("road_type", RoadType)):
+        if values[name]:
+            try:
+                clean[name] = _parse_enum(enum_cls, values[name]).name
+            except ValueError as e:
+                errors.append(f"{name} {e}")
+
+    if values["sanctioned_cost"]:
+        try:
+            cost = Decimal(values["sanctioned_cost"].replace(",", ""))
+            if cost < 0:
+                raise InvalidOperation
+            clean["sanctioned_cost"] = cost
+        except InvalidOperation:
+            errors.append("sanctioned_cost must be a non-negative number")
+
+    pincode = values["pincode"]
+    if pincode and not (len(pincode) == 6 and pincode.isdigit()):
+        errors.append("pincode must be 6 digits")
+    clean["pincode"] = pincode
+
+    for name in ("approving_official_id", "minister_id"):
+        try:
+            clean[name] = int(float(values[name])) if values[name] else None
+        except ValueError:
+            errors.append(f"{name} must be an integer")
+
+    for name in ("approval_date", "start_date", "proposed_end_date"):
+        try:
+            clean[name] = _parse_date(raw.get(name)) if values[name] else None
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+
+    if clean.get("name") and clean.get("district"):
+        clean["slug"] = slugify(f"{clean['name']}-{clean['district']}", max_length=300)
+
+    return clean, errors
+
+
+def resolve_geometries(rows: List[Tuple[int, Dict[str, Any], Dict[str, Any], List[str]]]) -> None:
+    """
+    Turn each row's WKT or start/end coordinates into a validated LINESTRING, in one batch.
+
+    Rows with coordinates are built with a single vectorized shapely call.
+    Rows with neither stay without a segment and can be mapped later.
+    """
+    coordinate_rows = []
+    coordinates = []
+
+    for _, raw, clean, errors in rows:
+        geometry = _text(raw.get("geometry"))
+        if geometry:
+            try:
+                shape = wkt.loads(geometry)
+                if shape.geom_type != "LineString":
+                    raise ShapelyError("not a LINESTRING")
+                clean["geometry"] = shape
+            except ShapelyError as e:
+                errors.append(f"geometry is not valid WKT LINESTRING ({e})")
+            continue
+
+        ends = [_text(raw.get(name)) for name in ("start_lon", "start_lat", "end_lon", "end_lat")]
+        if not any(ends):
+            clean["geometry"] = None
+            continue
+        try:
+            start_lon, start_lat, end_lon, end_lat = (float(v) for v in ends)
+        except (TypeError, ValueError):
+            errors.append("start_lat, start_lon, end_lat and end_lon must all be numbers")
+            continue
+        coordinate_rows.append(clean)
+        coordinates.append([[start_lon, start_lat], [end_lon, end_lat]])
+
+    if coordinates:
+        for clean, line in zip(coordinate_rows, shapely.linestrings(coordinates)):
+            clean["geometry"] = line
+
+    min_lon, min_lat, max_lon, max_lat = INDIA_BOUNDS
+    for _, _, clean, errors in rows:
+        shape = clean.get("geometry")
+        if shape is None:
+            continue
+        x0, y0, x1, y1 = shape.bounds
+        if x0 < min_lon or x1 > max_lon or y0 < min_lat or y1 > max_lat:
+            errors.append("coordinates fall outside India (check lat/lon order)")
+            clean["geometry"] = None
+        else:
+            clean["geometry"] = shape.wkt
+
+
+def validate_chunk(chunk: List[Row]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, List[str], Dict[str, Any]]]]:
+    """Validate and geocode a chunk; returns staging rows and rejected rows"""
+    checked = []
+    for row_number, raw in chunk:
+        clean, errors = validate_row(raw)
+        clean["row_number"] = row_number
+        checked.append((row_number, raw, clean, errors))
+
+    resolve_geometries(checked)
+
+    valid = [clean for _, _, clean, errors in checked if not errors]
+    rejected = [(row_number, errors, raw) for row_number, raw, _, errors in checked if errors]
+    return valid, rejected
+
+
+def _copy_to_staging(conn: Connection, rows: List[Dict[str, Any]]) -> None:
+    """Bulk-load rows with COPY, far faster than INSERTs"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row.get(name) is None else row[name] for name in STAGING_COLUMNS])
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def load_chunk(conn: Connection, rows: List[Dict[str, Any]]) -> ChunkResult:
+    """
+    Stage rows with COPY, then upsert firms, projects and road segments set-wise
+    """
+    result = ChunkResult()
+    if not rows:
+        return result
+
+    staging.create(conn)
+    _copy_to_staging(conn, rows)
+
+    # Firms: create unseen contractors by registration id
+    new_firms = (
+        select(
+            staging.c.contractor_registration_id,
+            func.max(staging.c.contractor_name),
+            func.max(staging.c.contractor_type),
+        )
+        .where(staging.c.contractor_name.is_not(None))
+        .group_by(staging.c.contractor_registration_id)
+    )
+    conn.execute(
+        pg_insert(Firm)
+        .from_select([Firm.registration_id, Firm.name, Firm.type], new_firms)
+        .on_conflict_do_nothing(index_elements=[Firm.registration_id])
+    )
+
+    # Rows naming a contractor we still don't know are rejected
+    orphans = conn.execute(
+        delete(staging)
+        .where(~select(Firm.id).where(Firm.registration_id == staging.c.contractor_registration_id).exists())
+        .returning(staging.c.row_number, staging.c.contractor_registration_id)
+    ).all()
+    for row_number, registration_id in orphans:
+        result.rejected.append((
+            row_number,
+            [f"unknown contractor '{registration_id}'; add contractor_name to create it"],
+            {"contractor_registration_id": registration_id}
+        ))
+
+    # Unknown officials/ministers would fail the whole upsert on a foreign key; reject just those rows
+    for column, model, label in (
+        (staging.c.approving_official_id, Official, "approving official"),
+        (staging.c.minister_id, Minister, "minister"),
+    ):
+        missing = conn.execute(
+            delete(staging)
+            .where(column.is_not(None), ~select(model.id).where(model.id == column).exists())
+            .returning(staging.c.row_number, column)
+        ).all()
+        for row_number, missing_id in missing:
+            result.rejected.append((row_number, [f"unknown {label} id {missing_id}"], {column.name: missing_id}))
+
+    # A re-import may move a project to another district or replace its
+    # contractor, official or minister; the district it leaves needs its rollup
+    # refreshed and the parties it drops lose graph edges, so note them while
+    # they are still there
+    existing = conn.execute(
+        select(Project.id, Project.state, Project.district).where(Project.slug.in_(select(staging.c.slug)))
+    ).all()
+    result.regions.update((state, district) for _, state, district in existing)
+    result.previous_nodes = project_nodes(conn, [project_id for project_id, _, _ in existing])
+
+    # Projects: one upsert per slug, the last row in the file wins
+    latest = (
+        select(staging)
+        .distinct(staging.c.slug)
+        .order_by(staging.c.slug, staging.c.row_number.desc())
+        .subquery()
+    )
+    source = (
+        select(
+            latest.c.slug,
+            latest.c.name,
+            latest.c.description,
+            latest.c.district,
+            latest.c.city,
+            latest.c.state,
+            latest.c.pincode,
+            cast(latest.c.status, Project.status.type),
+            cast(latest.c.road_type, Project.road_type.type),
+            latest.c.sanctioned_cost,
+            Firm.id,
+            latest.c.approving_official_id,
+            latest.c.minister_id,
+            latest.c.approval_date,
+            latest.c.start_date,
+            latest.c.proposed_end_date,
+        )
+        .join(Firm, Firm.registration_id == latest.c.contractor_registration_id)
+    )
+    upsert = pg_insert(Project).from_select(
+        [
+            Project.slug, Project.name, Project.description, Project.district, Project.city,
+            Project.state, Project.pincode, Project.status, Project.road_type,
+            Project.sanctioned_cost, Project.contractor_id, Project.approving_official_id,
+            Project.minister_id, Project.approval_date, Project.start_date, Project.proposed_end_date,
+        ],
+        source
+    )
+    excluded = upsert.excluded
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[Project.slug],
+        set_={
+            "name": excluded.name,
+            "description": func.coalesce(excluded.description, Project.description),
+            "district": excluded.district,
+            "city": excluded.city,
+            "state": excluded.state,
+            "pincode": excluded.pincode,
+            "status": excluded.status,
+            "road_type": excluded.road_type,
+            "sanctioned_cost": excluded.sanctioned_cost,
+            "contractor_id": excluded.contractor_id,
+            "approving_official_id": excluded.approving_official_id,
+            "minister_id": func.coalesce(excluded.minister_id, Project.minister_id),
+            "approval_date": func.coalesce(excluded.approval_date, Project.approval_date),
+            "start_date": func.coalesce(excluded.start_date, Project.start_date),
+            "proposed_end_date": func.coalesce(excluded.proposed_end_date, Project.proposed_end_date),
+            "updated_at": func.now(),
+        }
+    ).returning(Project.id, Project.state, Project.district, literal_column("xmax = 0").label("inserted"))
+
+    for project_id, state, district, inserted in conn.execute(upsert):
+        result.project_ids.add(project_id)
+        result.regions.add((state, district))
+        if inserted:
+            result.inserted += 1
+        else:
+            result.updated += 1
+
+    # Road segments: re-importing a row replaces its segment instead of duplicating it
+    with_geometry = staging.c.geometry.is_not(None)
+    conn.execute(
+        delete(RoadSegment)
+        .where(
+            RoadSegment.project_id == Project.id,
+            Project.slug == staging.c.slug,
+            RoadSegment.segment_name.is_not_distinct_from(staging.c.segment_name),
+            with_geometry
+        )
+    )
+
+    geometry = func.ST_GeomFromText(staging.c.geometry, 4326)
+    conn.execute(
+        insert(RoadSegment).from_select(
+            [
+                RoadSegment.project_id,
+                RoadSegment.segment_name,
+                RoadSegment.length_km,
+                RoadSegment.geometry,
+                *[RoadSegment.geometry_column(level) for level in range(len(LOD_LEVELS))],
+            ],
+            select(
+                Project.id,
+                staging.c.segment_name,
+                cast(func.round(func.ST_Length(cast(geometry, Geography)) / 1000), Integer),
+                geometry,
+                *[func.ST_SimplifyPreserveTopology(geometry, tolerance) for tolerance, _ in LOD_LEVELS],
+            )
+            .join(Project, Project.slug == staging.c.slug)
+            .where(with_geometry)
+        )
+    )
+
+    return result
+
+
+def _record_progress(conn: Connection, job_id: int, processed: int, result: ChunkResult) -> None:
+    if result.rejected:
+        conn.execute(insert(ImportRowError), [
+            {
+                "job_id": job_id,
+                "row_number": row_number,
+                "errors": errors,
+                "raw": {k: None if v is None else str(v) for k, v in raw.items()},
+            }
+            for row_number, errors, raw in result.rejected
+        ])
+    conn.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(
+            processed_rows=ImportJob.processed_rows + processed,
+            inserted_rows=ImportJob.inserted_rows + result.inserted,
+            updated_rows=ImportJob.updated_rows + result.updated,
+            error_count=ImportJob.error_count + len(result.rejected),
+        )
+    )
+
+
+def _set_status(job_id: int, status: ImportJobStatus, **values) -> None:
+    with engine.begin() as conn:
+        conn.execute(update(ImportJob).where(ImportJob.id == job_id).values(status=status, **values))
+
+
+def run_import(job_id: int, path: str, file_type: str) -> None:
+    """
+    Background job: stream the file chunk by chunk, one transaction per chunk.
+
+    Progress and row errors are committed with each chunk, so the status
+    endpoint reflects them while the import runs.
+    """
+    touched_projects: Set[int] = set()
+    touched_regions: Set[Tuple[str, str]] = set()
+    previous_nodes: Set[Node] = set()
+
+    try:
+        _set_status(job_id, ImportJobStatus.RUNNING, started_at=func.now(), total_rows=count_rows(path, file_type))
+
+        for chunk in iter_chunks(path, file_type, settings.IMPORT_CHUNK_SIZE):
+            valid, rejected = validate_chunk(chunk)
+            with engine.begin() as conn:
+                result = load_chunk(conn, valid)
+                result.rejected = rejected + result.rejected
+                _record_progress(conn, job_id, len(chunk), result)
+            touched_projects |= result.project_ids
+            touched_regions |= result.regions
+            previous_nodes |= result.previous_nodes
+
+        _set_status(job_id, ImportJobStatus.COMPLETED, finished_at=func.now())
+        logger.info(f"Import {job_id} completed: {len(touched_projects)} projects")
+    except Exception as e:
+        logger.exception(f"Import {job_id} failed")
+        _set_status(job_id, ImportJobStatus.FAILED, finished_at=func.now(), error_message=str(e))
+    finally:
+        os.remove(path)
+
+    if not touched_projects:
+        return
+
+    # COPY bypasses the ORM session hooks, so invalidate and roll up explicitly
+    invalidate_tags(
+        {ALL_PROJECTS, ALL_FIRMS}
+        | {project_tag(project_id) for project_id in touched_projects}
+        | {region_tag(district) for _, district in touched_regions}
+    )
+    try:
+        with engine.begin() as conn:
+            refresh_regions(conn, touched_regions)
+    except Exception as e:
+        logger.error(f"Stats rollup refresh after import {job_id} failed: {e}")
+    try:
+        # Firms that lost a contract to a re-import are caught by the nightly rebuild
+        with engine.begin() as conn:
+            refresh_projects(conn, touched_projects)
+    except Exception as e:
+        logger.error(f"Scorecard refresh after import {job_id} failed: {e}")
+    try:
+        with engine.begin() as conn:
+            refresh_nodes(conn, previous_nodes | project_nodes(conn, touched_projects))
+    except Exception as e:
+        logger.error(f"Accountability graph refresh after import {job_id} failed: {e}")
+    try:
+        # Spend series of districts/firms a project left are caught by the nightly rebuild
+        with engine.begin() as conn:
+            refresh_scopes(conn, project_scopes(conn, touched_projects))
+    except Exception as e:
+        logger.error(f"Spend series refresh after import {job_id} failed: {e}")
+    try:
+        with engine.begin() as conn:
+            refresh_points(conn, touched_projects)
+    except Exception as e:
+        logger.error(f"Map cluster refresh after import {job_id} failed: {e}")
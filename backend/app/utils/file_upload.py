@@ -0,0 +1,235 @@
+from fastapi import HTTPException, UploadFile
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+from pathlib import Path
+from urllib.parse import quote
+from uuid import uuid4
+import os
+import boto3
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+from app.config import settings
+
+# Read uploads in 1MB pieces so large files never sit in memory whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Stored files are served with the type of their extension, never one a client
+# supplied, and only these types are shown inline; anything else downloads
+CONTENT_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "pdf": "application/pdf",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+INLINE_CONTENT_TYPES = {"image/jpeg", "image/png", "application/pdf"}
+
+
+def get_extension(filename: Optional[str]) -> str:
+    """Lower-case extension without the dot"""
+    return Path(filename or "").suffix.lower().lstrip(".")
+
+
+def validate_extension(filename: Optional[str], allowed: Optional[List[str]] = None) -> str:
+    """Reject files whose extension isn't allowed; returns the extension"""
+    allowed = allowed or settings.ALLOWED_EXTENSIONS
+    extension = get_extension(filename)
+    if extension not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(allowed)}"
+        )
+    return extension
+
+
+def content_type_for(extension: str) -> str:
+    """Content type a file with this extension is stored and served as"""
+    content_type = CONTENT_TYPES.get(extension)
+    if content_type is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {extension}")
+    return content_type
+
+
+def save_upload(file: UploadFile, subdir: str, max_size: Optional[int] = None) -> Path:
+    """
+    Copy an upload to UPLOAD_DIR/subdir under a random name, enforcing max_size
+    """
+    max_size = max_size or settings.MAX_UPLOAD_SIZE
+    directory = Path(settings.UPLOAD_DIR) / subdir
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{uuid4().hex}.{get_extension(file.filename)}"
+
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {max_size // (1024 * 1024)}MB"
+                    )
+                out.write(chunk)
+    except BaseException:
+        if path.exists():
+            os.remove(path)
+        raise
+
+    return path
+
+
+# S3 allows at most this many parts per multipart upload
+MAX_UPLOAD_PARTS = 10000
+
+
+def _storage_endpoint(public: bool) -> str:
+    if settings.R2_ACCESS_KEY_ID:
+        return f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
+    scheme = "https" if settings.MINIO_USE_SSL else "http"
+    host = (public and settings.MINIO_PUBLIC_ENDPOINT) or settings.MINIO_ENDPOINT
+    return f"{scheme}://{host}"
+
+
+@lru_cache(maxsize=2)
+def get_s3_client(public: bool = False):
+    """
+    S3 client for R2 in production or MinIO locally.
+
+    Presigned URLs embed the host they were signed for, so public=True signs
+    against the endpoint clients can reach (MINIO_PUBLIC_ENDPOINT).
+    """
+    if not settings.use_s3:
+        raise HTTPException(status_code=503, detail="Object storage is not configured")
+
+    if settings.R2_ACCESS_KEY_ID:
+        access_key, secret_key = settings.R2_ACCESS_KEY_ID, settings.R2_SECRET_ACCESS_KEY
+    else:
+        access_key, secret_key = settings.MINIO_ACCESS_KEY, settings.MINIO_SECRET_KEY
+
+    return boto3.client(
+        "s3",
+        endpoint_url=_storage_endpoint(public),
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name="auto" if settings.R2_ACCESS_KEY_ID else "us-east-1",
+        config=BotoConfig(signature_version="s3v4", s3={"addressing_style": "path"}),
+    )
+
+
+def get_bucket() -> str:
+    return settings.R2_BUCKET if settings.R2_ACCESS_KEY_ID else settings.MINIO_BUCKET
+
+
+def ensure_bucket() -> None:
+    """Create the bucket if missing (local MinIO)"""
+    client = get_s3_client()
+    try:
+        client.head_bucket(Bucket=get_bucket())
+    except ClientError:
+        client.create_bucket(Bucket=get_bucket())
+
+
+def part_count(size: int) -> int:
+    return max(1, -(-size // settings.UPLOAD_PART_SIZE))
+
+
+def start_multipart_upload(key: str, content_type: str) -> str:
+    """Open a multipart upload; returns its upload id"""
+    response = get_s3_client().create_multipart_upload(
+        Bucket=get_bucket(),
+        Key=key,
+        ContentType=content_type
+    )
+    return response["UploadId"]
+
+
+def presign_upload_parts(key: str, upload_id: str, part_numbers: Iterable[int]) -> List[Dict[str, Any]]:
+    """PUT URLs the client uploads each part to directly"""
+    client = get_s3_client(public=True)
+    return [
+        {
+            "part_number": number,
+            "url": client.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": get_bucket(), "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=settings.PRESIGNED_URL_EXPIRY
+            )
+        }
+        for number in part_numbers
+    ]
+
+
+def complete_multipart_upload(key: str, upload_id: str, parts: List[Dict[str, Any]]) -> int:
+    """Assemble the uploaded parts; returns the stored object's size"""
+    client = get_s3_client()
+    client.complete_multipart_upload(
+        Bucket=get_bucket(),
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                for part in sorted(parts, key=lambda part: part["part_number"])
+            ]
+        }
+    )
+    return client.head_object(Bucket=get_bucket(), Key=key)["ContentLength"]
+
+
+def abort_multipart_upload(key: str, upload_id: str) -> None:
+    get_s3_client().abort_multipart_upload(Bucket=get_bucket(), Key=key, UploadId=upload_id)
+
+
+def delete_object(key: str) -> None:
+    get_s3_client().delete_object(Bucket=get_bucket(), Key=key)
+
+
+def presign_download(key: str, filename: str) -> str:
+    """
+    Short-lived GET URL. Storage serves the bytes and honours Range requests,
+    so large PDFs can be viewed page by page without touching the API.
+
+    The content type comes from the key's extension; only PDFs and images
+    open inline, so an uploaded HTML or SVG payload can't run in a browser.
+    """
+    content_type = CONTENT_TYPES.get(get_extension(key), "application/octet-stream")
+    disposition = "inline" if content_type in INLINE_CONTENT_TYPES else "attachment"
+    return get_s3_client(public=True).generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": get_bucket(),
+            "Key": key,
+            "ResponseContentType": content_type,
+            "ResponseContentDisposition": f"{disposition}; filename*=UTF-8''{quote(filename)}",
+        },
+        ExpiresIn=settings.PRESIGNED_URL_EXPIRY
+    )
+
+
+def put_object(key: str, data: bytes, content_type: str, cache_control: Optional[str] = None) -> None:
+    """Upload a small object in one request"""
+    extra = {"CacheControl": cache_control} if cache_control else {}
+    get_s3_client().put_object(Bucket=get_bucket(), Key=key, Body=data, ContentType=content_type, **extra)
+
+
+def upload_file(key: str, path: str, content_type: str, cache_control: Optional[str] = None) -> None:
+    """Upload a local file; boto3 switches to multipart for large ones"""
+    extra = {"ContentType": content_type}
+    if cache_control:
+        extra["CacheControl"] = cache_control
+    get_s3_client().upload_file(path, get_bucket(), key, ExtraArgs=extra)
+
+
+def public_url(key: str) -> str:
+    """
+    URL for a publicly readable object: the CDN/public bucket domain when
+    configured, else a presigned URL
+    """
+    if settings.PUBLIC_MEDIA_URL:
+        return f"{settings.PUBLIC_MEDIA_URL.rstrip('/')}/{key}"
+    return get_s3_client(public=True).generate_presigned_url(
+        "get_object",
+        Params={"Bucket": get_bucket(), "Key": key},
+        ExpiresIn=settings.PRESIGNED_URL_EXPIRY
+    )
@@ -0,0 +1,172 @@
+from itertools import chain
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
+from sqlalchemy import JSON, Float, String, Text, cast, func, literal_column
+from sqlalchemy.sql.elements import ColumnElement, Label
+from shapely import wkt
+from shapely.geometry import mapping
+from shapely.geometry.base import BaseGeometry
+from geoalchemy2.elements import WKBElement, WKTElement
+from geoalchemy2.shape import to_shape, from_shape
+
+# Precomputed simplification levels for road geometries, coarsest first.
+# Each entry is (tolerance in degrees, highest map zoom it is used for).
+# At SRID 4326, 0.01° is ~1.1 km, 0.001° ~110 m and 0.0001° ~11 m.
+LOD_LEVELS = (
+    (0.01, 6),
+    (0.001, 10),
+    (0.0001, 13),
+)
+
+GeometryValue = Union[BaseGeometry, WKBElement, WKTElement, str]
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+
+# 6 decimal places is ~0.1 m at the equator, plenty for road centrelines
+DEFAULT_PRECISION = 6
+
+# Streamed responses are flushed in chunks of roughly this many bytes
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def select_level(zoom: Optional[int] = None, tolerance: Optional[float] = None) -> Optional[int]:
+    """
+    Pick the coarsest precomputed level that is still detailed enough.
+
+    An explicit tolerance wins over zoom. Returns None when the caller needs
+    the full-resolution geometry.
+    """
+    if tolerance is not None:
+        for level, (level_tolerance, _) in enumerate(LOD_LEVELS):
+            if level_tolerance <= tolerance:
+                return level
+        return None
+
+    if zoom is not None:
+        for level, (_, max_zoom) in enumerate(LOD_LEVELS):
+            if zoom <= max_zoom:
+                return level
+
+    return None
+
+
+def to_shapely(geometry: GeometryValue) -> BaseGeometry:
+    """Convert a PostGIS element or WKT string to a shapely geometry"""
+    if isinstance(geometry, BaseGeometry):
+        return geometry
+    if isinstance(geometry, str):
+        return wkt.loads(geometry.split(";", 1)[-1])  # Strip an optional "SRID=4326;" prefix
+    return to_shape(geometry)
+
+
+def simplify_geometry(geometry: GeometryValue, tolerance: float) -> BaseGeometry:
+    """Simplify a geometry without letting it collapse or self-intersect"""
+    return to_shapely(geometry).simplify(tolerance, preserve_topology=True)
+
+
+def build_lods(geometry: GeometryValue, srid: int = 4326) -> Dict[int, WKBElement]:
+    """Compute every precomputed level of a geometry, ready to store"""
+    shape = to_shapely(geometry)
+    return {
+        level: from_shape(simplify_geometry(shape, tolerance), srid=srid)
+        for level, (tolerance, _) in enumerate(LOD_LEVELS)
+    }
+
+
+def to_geojson_geometry(geometry: GeometryValue) -> dict:
+    """Convert a stored geometry to a GeoJSON geometry dict"""
+    return mapping(to_shapely(geometry))
+
+
+def _sql_string(value: str) -> ColumnElement:
+    """Inline a trusted constant so json_build_object never sees untyped parameters"""
+    return literal_column("'" + value.replace("'", "''") + "'")
+
+
+def feature_json(
+    feature_id: ColumnElement,
+    geometry: ColumnElement,
+    properties: List[Label],
+    precision: int = DEFAULT_PRECISION
+) -> ColumnElement:
+    """
+    SQL expression rendering one GeoJSON Feature as text inside PostGIS.
+
+    Properties are labelled columns; each label becomes a property name.
+    """
+    return cast(
+        func.json_build_object(
+            _sql_string("type"), _sql_string("Feature"),
+            _sql_string("id"), feature_id,
+            _sql_string("geometry"), cast(func.ST_AsGeoJSON(geometry, precision), JSON),
+            _sql_string("properties"), func.json_build_object(
+                *chain.from_iterable((_sql_string(column.name), column.element) for column in properties)
+            )
+        ),
+        Text
+    )
+
+
+def feature_property_columns() -> List[Label]:
+    """
+    Columns exposed as map feature properties, shared by the GeoJSON feed and vector tiles
+    """
+    from app.models import Firm, Project, RoadSegment  # The models import this module
+
+    return [
+        Project.id.label("project_id"),
+        Project.name.label("project_name"),
+        # Enums are stored by name; emit the lower-case values clients expect
+        func.lower(cast(Project.status, String)).label("status"),
+        func.lower(cast(Project.road_type, String)).label("road_type"),
+        Project.district.label("district"),
+        Project.city.label("city"),
+        Firm.name.label("contractor"),
+        cast(Project.sanctioned_cost, Float).label("sanctioned_cost"),
+        RoadSegment.segment_name.label("segment_name")
+    ]
+
+
+class FeatureCollectionWriter:
+    """Joins pre-serialized Feature strings into a FeatureCollection, in bounded chunks"""
+
+    def __init__(self):
+        self._buffer = [b'{"type":"FeatureCollection","features":[']
+        self._size = len(self._buffer[0])
+        self._separator = b""
+
+    def add(self, feature: str) -> Optional[bytes]:
+        """Append a feature; returns a chunk once STREAM_CHUNK_SIZE is reached"""
+        encoded = feature.encode()
+        self._buffer.append(self._separator)
+        self._buffer.append(encoded)
+        self._size += len(encoded) + 1
+        self._separator = b","
+
+        if self._size < STREAM_CHUNK_SIZE:
+            return None
+        chunk = b"".join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        return chunk
+
+    def close(self) -> bytes:
+        self._buffer.append(b"]}")
+        return b"".join(self._buffer)
+
+
+def iter_feature_collection(features: Iterable[str]) -> Iterator[bytes]:
+    writer = FeatureCollectionWriter()
+    for feature in features:
+        chunk = writer.add(feature)
+        if chunk:
+            yield chunk
+    yield writer.close()
+
+
+async def aiter_feature_collection(features: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    writer = FeatureCollectionWriter()
+    async for feature in features:
+        chunk = writer.add(feature)
+        if chunk:
+            yield chunk
+    yield writer.close()
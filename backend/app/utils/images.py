@@ -0,0 +1,195 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from hashlib import sha256
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+import asyncio
+import io
+import logging
+
+from PIL import Image, ImageOps
+from anyio import to_thread
+from redis import RedisError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+
+from app.config import settings
+from app.core.cache import get_redis
+from app.database import AsyncSessionLocal
+from app.models.public_report import PhotoStatus, ReportPhoto
+from app.utils.file_upload import put_object
+
+logger = logging.getLogger(__name__)
+
+# Derivatives never change for a given key, so clients and CDNs may keep them forever
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Seconds one worker owns processing of a given content hash
+PROCESSING_CLAIM_TTL = 600
+
+# Upload formats we accept; anything else Pillow can open is rejected
+ACCEPTED_FORMATS = {"JPEG", "MPO", "PNG", "WEBP"}
+
+
+class Rendition(NamedTuple):
+    data: bytes
+    content_type: str
+    extension: str
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _init_worker(max_pixels: int) -> None:
+    Image.MAX_IMAGE_PIXELS = max_pixels
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared pool so CPU-bound decoding never blocks the event loop or GIL-bound threads"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            initializer=_init_worker,
+            initargs=(settings.PHOTO_MAX_PIXELS,)
+        )
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def content_hash(data: bytes) -> str:
+    return sha256(data).hexdigest()
+
+
+def _encode_webp(image: Image.Image, size: int, quality: int) -> bytes:
+    copy = image.copy()
+    copy.thumbnail((size, size), Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    copy.save(out, "WEBP", quality=quality, method=4, exif=b"")
+    return out.getvalue()
+
+
+def render_derivatives(
+    data: bytes,
+    thumbnail_size: int,
+    medium_size: int,
+    quality: int
+) -> Tuple[Dict[str, Rendition], Tuple[int, int]]:
+    """
+    Decode an upload and produce EXIF-free renditions. Runs in a pool process.
+
+    Orientation is applied to the pixels first, so dropping EXIF (and with it
+    the phone's GPS position and device details) doesn't rotate the photo.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        if source.format not in ACCEPTED_FORMATS:
+            raise ValueError(f"Unsupported image format {source.format}")
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    # Keep only the colour profile; EXIF, XMP and comments are dropped
+    icc_profile = image.info.get("icc_profile")
+    image.info = {"icc_profile": icc_profile} if icc_profile else {}
+
+    original = io.BytesIO()
+    if has_alpha:
+        image.save(original, "PNG", optimize=True)
+        rendition = Rendition(original.getvalue(), "image/png", "png")
+    else:
+        image.save(original, "JPEG", quality=90, optimize=True, exif=b"")
+        rendition = Rendition(original.getvalue(), "image/jpeg", "jpg")
+
+    return {
+        "original": rendition,
+        "thumbnail": Rendition(_encode_webp(image, thumbnail_size, quality), "image/webp", "webp"),
+        "medium": Rendition(_encode_webp(image, medium_size, quality), "image/webp", "webp"),
+    }, image.size
+
+
+def photo_rows(conn: Connection, digests: Iterable[str]) -> Dict[str, int]:
+    """
+    Photo ids for content hashes, creating placeholder rows for new ones.
+
+    Reports uploading identical bytes share a row, so a pothole photographed
+    and shared by many people is stored once.
+    """
+    digests = sorted(set(digests))
+    if not digests:
+        return {}
+    conn.execute(
+        pg_insert(ReportPhoto)
+        .values([{"sha256": digest, "status": PhotoStatus.PROCESSING} for digest in digests])
+        .on_conflict_do_nothing(index_elements=[ReportPhoto.sha256])
+    )
+    return dict(conn.execute(
+        select(ReportPhoto.sha256, ReportPhoto.id).where(ReportPhoto.sha256.in_(digests))
+    ).all())
+
+
+async def process_photo(digest: str, data: bytes) -> None:
+    """
+    Background task: render derivatives in the process pool, store them next
+    to the original and record them against the content hash.
+
+    Skipped when the same bytes are already stored or being processed.
+    """
+    claim = f"photo:processing:{digest}"
+    try:
+        if not await to_thread.run_sync(lambda: get_redis().set(claim, 1, nx=True, ex=PROCESSING_CLAIM_TTL)):
+            return
+    except RedisError as e:
+        logger.warning(f"Photo claim for {digest} failed, processing anyway: {e}")
+
+    async with AsyncSessionLocal() as db:
+        status = (await db.execute(
+            select(ReportPhoto.status).where(ReportPhoto.sha256 == digest)
+        )).scalar()
+    if status == PhotoStatus.READY:
+        return
+
+    values = {"processed_at": datetime.now(timezone.utc), "error": None}
+    try:
+        renditions, (width, height) = await asyncio.get_running_loop().run_in_executor(
+            get_process_pool(),
+            render_derivatives,
+            data,
+            settings.PHOTO_THUMBNAIL_SIZE,
+            settings.PHOTO_MEDIUM_SIZE,
+            settings.PHOTO_WEBP_QUALITY
+        )
+
+        prefix = f"photos/{digest[:2]}/{digest}"
+        for name, rendition in renditions.items():
+            key = f"{prefix}/{name}.{rendition.extension}"
+            await to_thread.run_sync(put_object, key, rendition.data, rendition.content_type, IMMUTABLE)
+            values[f"{name}_key"] = key
+
+        values.update(status=PhotoStatus.READY, width=width, height=height)
+    except Exception as e:
+        logger.warning(f"Photo {digest} processing failed: {e}")
+        values.update(status=PhotoStatus.FAILED, error=str(e)[:500])
+
+    # The report referencing this photo may not be inserted yet, so upsert by hash
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            pg_insert(ReportPhoto)
+            .values(sha256=digest, **values)
+            .on_conflict_do_update(index_elements=[ReportPhoto.sha256], set_=values)
+        )
+        await db.commit()
+
+    if values["status"] == PhotoStatus.FAILED:
+        # Let a later upload of the same bytes retry
+        try:
+            await to_thread.run_sync(get_redis().delete, claim)
+        except RedisError:
+            pass
@@ -0,0 +1,327 @@
+"""
+Fill a local PostGIS database with a synthetic, national-scale dataset.
+
+Generates ministers, officials, firms, projects, road segment linestrings,
+citizen reports and disbursements with COPY, then builds the derived tables
+(LODs, stats rollups, firm scorecards, accountability graph, map clusters)
+and ANALYZEs.
+District and contractor popularity follow Zipf distributions, so a few
+districts and firms hold most projects, as in the real data.
+
+Output is deterministic for a given --seed, which load_test.py relies on to
+pick realistic query terms.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/generate_dataset.py --truncate
+    python benchmarks/generate_dataset.py --projects 50000 --segments-per-project 4 --truncate
+"""
+import argparse
+import csv
+import io
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+STATES = [
+    ("Uttar Pradesh", 75), ("Maharashtra", 36), ("Bihar", 38), ("West Bengal", 23),
+    ("Madhya Pradesh", 52), ("Tamil Nadu", 38), ("Rajasthan", 33), ("Karnataka", 31),
+    ("Gujarat", 33), ("Andhra Pradesh", 26), ("Odisha", 30), ("Telangana", 33),
+    ("Kerala", 14), ("Jharkhand", 24), ("Assam", 35), ("Punjab", 23),
+    ("Chhattisgarh", 33), ("Haryana", 22), ("Uttarakhand", 13), ("Himachal Pradesh", 12),
+]
+# Real district/city names so search benchmarks hit realistic text
+NAMED_DISTRICTS = [
+    ("Nagpur", "Nagpur", "Maharashtra"), ("Pune", "Pimpri-Chinchwad", "Maharashtra"),
+    ("Lucknow", "Lucknow", "Uttar Pradesh"), ("Varanasi", "Varanasi", "Uttar Pradesh"),
+    ("Patna", "Patna", "Bihar"), ("Jaipur", "Jaipur", "Rajasthan"),
+    ("Ahmedabad", "Ahmedabad", "Gujarat"), ("Bengaluru Urban", "Bengaluru", "Karnataka"),
+    ("Ernakulam", "Kochi", "Kerala"), ("Visakhapatnam", "Visakhapatnam", "Andhra Pradesh"),
+    ("Tiruchirappalli", "Tiruchirappalli", "Tamil Nadu"), ("Kamrup Metropolitan", "Guwahati", "Assam"),
+    ("Ludhiana", "Ludhiana", "Punjab"), ("Khordha", "Bhubaneswar", "Odisha"),
+]
+ROAD_WORDS = ["Ring Road", "Bypass", "Highway", "Link Road", "Flyover", "Main Road", "Expressway", "Marg"]
+
+# Enums are stored by name
+STATUSES = [("ACTIVE", 30), ("COMPLETED", 35), ("DELAYED", 12), ("APPROVED", 8),
+            ("PENDING", 5), ("MAINTENANCE", 7), ("CANCELLED", 3)]
+ROAD_TYPES = [("RURAL_ROAD", 40), ("DISTRICT_ROAD", 25), ("CITY_ROAD", 15), ("STATE_HIGHWAY", 12),
+              ("NATIONAL_HIGHWAY", 6), ("EXPRESSWAY", 2)]
+ISSUE_TYPES = ["POTHOLE", "POOR_QUALITY", "WATERLOGGING", "CRACKS", "DEBRIS",
+               "SIGNAGE_ISSUE", "DRAINAGE_PROBLEM", "SAFETY_HAZARD", "OTHER"]
+REPORT_STATUSES = [("SUBMITTED", 40), ("UNDER_REVIEW", 20), ("ACKNOWLEDGED", 15),
+                   ("IN_PROGRESS", 10), ("RESOLVED", 12), ("REJECTED", 3)]
+
+COPY_BATCH = 50_000
+EPOCH = date(2015, 4, 1)
+
+
+def districts(seed: int) -> list:
+    """(district, city, state, lon, lat) for every district, most populous first"""
+    rng = random.Random(seed)
+    found = [(d, c, s) for d, c, s in NAMED_DISTRICTS]
+    for state, count in STATES:
+        for n in range(1, count + 1):
+            name = f"{state.split()[0]} District {n:02d}"
+            found.append((name, f"{name} Town", state))
+    rng.shuffle(found)
+    return [(d, c, s, rng.uniform(70.0, 92.0), rng.uniform(9.0, 31.0)) for d, c, s in found]
+
+
+def zipf_weights(n: int, skew: float) -> list:
+    """Cumulative weights for rank-frequency 1/rank^skew (skew 0 = uniform)"""
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+def weighted(options: list) -> tuple:
+    values, weights = zip(*options)
+    return values, list(itertools.accumulate(weights))
+
+
+def copy_rows(conn, table: str, columns: list, rows) -> int:
+    """COPY rows into table in batches; returns the row count"""
+    cursor = conn.connection.cursor()
+    total = 0
+    for batch in iter(lambda: list(itertools.islice(rows, COPY_BATCH)), []):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(batch)
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer
+        )
+        total += len(batch)
+    return total
+
+
+def linestring(rng: random.Random, lon: float, lat: float) -> str:
+    """A wandering road of 8-60 vertices near (lon, lat), as EWKT"""
+    lon += rng.gauss(0, 0.15)
+    lat += rng.gauss(0, 0.15)
+    heading = rng.uniform(0, 2 * math.pi)
+    points = []
+    for _ in range(rng.randint(8, 60)):
+        heading += rng.gauss(0, 0.3)
+        lon += math.cos(heading) * 0.0015
+        lat += math.sin(heading) * 0.0015
+        points.append(f"{lon:.6f} {lat:.6f}")
+    return f"SRID=4326;LINESTRING({', '.join(points)})"
+
+
+def random_date(rng: random.Random, start: date, days: int) -> date:
+    return start + timedelta(days=rng.randint(0, days))
+
+
+def people(rng: random.Random, args) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "ministers": (
+            ["id", "name", "party", "portfolio"],
+            ((i, f"Minister {i}", rng.choice(["Party A", "Party B", "Party C", "Independent"]),
+              "Public Works") for i in range(1, args.ministers + 1))
+        ),
+        "officials": (
+            ["id", "name", "designation", "department", "created_at"],
+            ((i, f"Official {i}", rng.choice(["Executive Engineer", "Superintending Engineer", "Chief Engineer"]),
+              rng.choice(["PWD", "Rural Development", "NHAI", "Urban Development"]), now)
+             for i in range(1, args.officials + 1))
+        ),
+        "firms": (
+            ["id", "name", "registration_id", "type", "performance_rating", "is_blacklisted", "created_at"],
+            ((i, f"Firm {i} Infrastructure Pvt Ltd", f"REG-{i:07d}",
+              "maintenance" if i % 5 == 0 else "contractor", round(rng.uniform(1, 5), 1),
+              "t" if rng.random() < 0.01 else "f", now)
+             for i in range(1, args.firms + 1))
+        ),
+    }
+
+
+def generate(conn, args) -> None:
+    rng = random.Random(args.seed)
+    places = districts(args.seed)
+    place_weights = zipf_weights(len(places), args.district_skew)
+    firm_weights = zipf_weights(args.firms, args.contractor_skew)
+    official_weights = zipf_weights(args.officials, args.contractor_skew)
+    statuses, status_weights = weighted(STATUSES)
+    road_types, road_type_weights = weighted(ROAD_TYPES)
+    report_statuses, report_status_weights = weighted(REPORT_STATUSES)
+    today = date.today()
+
+    from app.core.ledger import ensure_partitions, fiscal_year
+    ensure_partitions(conn, fiscal_year(EPOCH))
+
+    for table, (columns, rows) in people(rng, args).items():
+        started = time.perf_counter()
+        count = copy_rows(conn, table, columns, rows)
+        print(f"{table:<18} {count:>10} rows {time.perf_counter() - started:>7.1f}s")
+
+    project_columns = [
+        "id", "name", "slug", "description", "status", "road_type", "district", "city", "state", "pincode",
+        "sanctioned_cost", "total_disbursed", "approval_date", "start_date", "proposed_end_date",
+        "actual_end_date", "minister_id", "approving_official_id", "contractor_id", "maintenance_firm_id",
+        "created_at",
+    ]
+    segment_columns = ["project_id", "geometry", "segment_name", "length_km", "start_point", "end_point", "created_at"]
+    disbursement_columns = ["project_id", "amount", "disbursement_date"]
+    segments, disbursements = [], []
+
+    def projects():
+        firm_ids = range(1, args.firms + 1)
+        official_ids = range(1, args.officials + 1)
+        for project_id in range(1, args.projects + 1):
+            district, city, state, lon, lat = rng.choices(places, cum_weights=place_weights)[0]
+            status = rng.choices(statuses, cum_weights=status_weights)[0]
+            approved = random_date(rng, EPOCH, (today - EPOCH).days)
+            start = approved + timedelta(days=rng.randint(30, 180))
+            proposed_end = start + timedelta(days=rng.randint(180, 1400))
+            actual_end = None
+            if status in ("COMPLETED", "MAINTENANCE"):
+                actual_end = max(start + timedelta(days=30), proposed_end + timedelta(days=int(rng.gauss(60, 120))))
+            sanctioned = round(rng.lognormvariate(17.5, 1.0), 2)  # Median ~4 crore
+
+            spent = 0.0
+            paid_until = min(today, actual_end or today)
+            for _ in range(rng.randint(0, args.disbursements_per_project * 2)):
+                if paid_until <= start:
+                    break
+                amount = round(sanctioned * rng.uniform(0.03, 0.2), 2)
+                spent += amount
+                disbursements.append((project_id, f"{amount:.2f}", random_date(rng, start, (paid_until - start).days)))
+
+            for n in range(max(1, int(rng.gauss(args.segments_per_project, 1.5)))):
+                segments.append((
+                    project_id, linestring(rng, lon, lat), f"Segment {n + 1}", rng.randint(1, 25),
+                    f"Km {n * 5}", f"Km {n * 5 + 5}", approved.isoformat()
+                ))
+
+            road = rng.choice(ROAD_WORDS)
+            yield (
+                project_id, f"{city} {road} Phase {project_id % 9 + 1}", f"{city}-{road}-{project_id}".lower().replace(" ", "-"),
+                f"Construction of {road.lower()} in {district}, {state}", status,
+                rng.choices(road_types, cum_weights=road_type_weights)[0], district, city, state,
+                str(rng.randint(110001, 855999)), f"{sanctioned:.2f}", f"{spent:.2f}",
+                approved, start, proposed_end, actual_end,
+                rng.randint(1, args.ministers) if rng.random() < 0.8 else None,
+                rng.choices(official_ids, cum_weights=official_weights)[0],
+                rng.choices(firm_ids, cum_weights=firm_weights)[0],
+                rng.choices(firm_ids, cum_weights=firm_weights)[0] if status in ("COMPLETED", "MAINTENANCE") else None,
+                datetime.combine(approved, datetime.min.time(), timezone.utc).isoformat(),
+            )
+
+    # Segments and disbursements are produced alongside projects and flushed per batch
+    started = time.perf_counter()
+    counts = {"projects": 0, "road_segments": 0, "disbursements": 0}
+    project_rows = projects()
+    for batch in iter(lambda: list(itertools.islice(project_rows, COPY_BATCH)), []):
+        counts["projects"] += copy_rows(conn, "projects", project_columns, iter(batch))
+        counts["road_segments"] += copy_rows(conn, "road_segments", segment_columns, iter(segments))
+        counts["disbursements"] += copy_rows(conn, "disbursements", disbursement_columns, iter(disbursements))
+        segments.clear()
+        disbursements.clear()
+    for table, count in counts.items():
+        print(f"{table:<18} {count:>10} rows")
+    print(f"{'':<18} {'':>10} {time.perf_counter() - started:>12.1f}s")
+
+    # A few projects attract most complaints
+    report_weights = zipf_weights(args.projects, 1.0)
+    project_ids = range(1, args.projects + 1)
+
+    def reports():
+        now = datetime.now(timezone.utc)
+        for _ in range(args.reports):
+            created = now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+            yield (
+                rng.choices(project_ids, cum_weights=report_weights)[0], rng.choice(ISSUE_TYPES),
+                "Large potholes after the monsoon, two-wheelers are skidding", "Near the bus stand",
+                rng.choices(report_statuses, cum_weights=report_status_weights)[0],
+                int(rng.paretovariate(1.5)) - 1, created.isoformat(),
+            )
+
+    started = time.perf_counter()
+    count = copy_rows(
+        conn, "public_reports",
+        ["project_id", "issue_type", "description", "location_description", "status", "upvotes_count", "created_at"],
+        reports()
+    )
+    print(f"{'public_reports':<18} {count:>10} rows {time.perf_counter() - started:>7.1f}s")
+
+
+def build_derived(conn) -> None:
+    """Everything normally maintained on write"""
+    from app.core import accountability, clusters, ledger, scorecards, stats_rollup
+    from app.utils.geojson import LOD_LEVELS
+
+    steps = [
+        ("sequences", lambda: [
+            conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 1)) FROM {table}"))
+            for table in ("ministers", "officials", "firms", "projects")
+        ]),
+        ("segment LODs", lambda: conn.execute(text(
+            "UPDATE road_segments SET " + ", ".join(
+                f"geometry_lod{level} = ST_SimplifyPreserveTopology(geometry, {tolerance})"
+                for level, (tolerance, _) in enumerate(LOD_LEVELS)
+            )
+        ))),
+        ("ledger snapshots", lambda: ledger.refresh_all(conn)),
+        ("stats rollups", lambda: stats_rollup.refresh_all(conn)),
+        ("firm scorecards", lambda: scorecards.refresh_all(conn)),
+        ("accountability graph", lambda: accountability.refresh_all(conn)),
+        ("map clusters", lambda: clusters.refresh_all(conn)),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        print(f"{name:<22} {time.perf_counter() - started:>7.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--projects", type=int, default=500_000)
+    parser.add_argument("--segments-per-project", type=float, default=4.0, help="Mean; 4 gives ~2M segments")
+    parser.add_argument("--firms", type=int, default=25_000)
+    parser.add_argument("--officials", type=int, default=15_000)
+    parser.add_argument("--ministers", type=int, default=400)
+    parser.add_argument("--reports", type=int, default=1_000_000)
+    parser.add_argument("--disbursements-per-project", type=int, default=4, help="Mean")
+    parser.add_argument("--district-skew", type=float, default=1.0, help="Zipf exponent; 0 is uniform")
+    parser.add_argument("--contractor-skew", type=float, default=1.1, help="Zipf exponent for firms and officials")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables first")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    engine = create_engine(args.database_url)
+    with engine.begin() as conn:
+        if args.truncate:
+            conn.execute(text(
+                "TRUNCATE public_reports, report_photos, disbursements, project_documents, road_segments, "
+                "projects, firms, officials, ministers, stats_rollups, stats_rollups_monthly, "
+                "firm_scorecards, accountability_edges, project_ledgers, spend_monthly, project_points, map_clusters "
+                "RESTART IDENTITY CASCADE"
+            ))
+        elif conn.execute(text("SELECT exists (SELECT 1 FROM projects)")).scalar():
+            parser.error("projects is not empty; pass --truncate to replace its contents")
+
+        generate(conn, args)
+        build_derived(conn)
+
+    # Fresh statistics, so the benchmarks see the plans production would
+    with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as conn:
+        started = time.perf_counter()
+        conn.execute(text("ANALYZE"))
+        print(f"{'analyze':<22} {time.perf_counter() - started:>7.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Load-test the hot read endpoints at fixed concurrency and compare with a baseline.
+
+Drives search_projects, get_project_detail, list_projects (deep offset pages
+and cursor walks), map clusters and the stats endpoints against a running API, one scenario
+at a time, and reports p50/p95/p99 latency and throughput. Point it at a
+database filled by generate_dataset.py with the same --projects and --seed so
+requests hit real ids and districts.
+
+Save a baseline on a known-good build, then compare later runs against it;
+the exit status is 1 when any scenario regresses by more than --tolerance.
+
+Usage:
+    python benchmarks/load_test.py --base-url http://localhost:8000 --save-baseline benchmarks/baseline.json
+    python benchmarks/load_test.py --concurrency 64 --duration 30 --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+import httpx
+
+from generate_dataset import ROAD_WORDS, districts, zipf_weights
+
+SCENARIOS = ("search", "detail", "list_offset", "list_cursor", "clusters", "stats")
+
+# Share of detail requests for the hottest projects, like a viral news story
+HOT_DETAIL_SHARE = 0.8
+
+
+class Workload:
+    """Builds request paths for each scenario from the generated vocabulary"""
+
+    def __init__(self, args):
+        self.rng = random.Random(args.seed)
+        self.places = districts(args.seed)
+        self.place_weights = zipf_weights(len(self.places), args.district_skew)
+        self.project_ids = range(1, args.projects + 1)
+        self.hot_weights = zipf_weights(args.projects, 1.0)
+        self.page_size = args.page_size
+        self.deep_pages = max(1, args.projects // args.page_size)
+
+    def place(self):
+        return self.rng.choices(self.places, cum_weights=self.place_weights)[0]
+
+    def search(self):
+        district, city, state, _, _ = self.place()
+        params = self.rng.choice([
+            {"district": district},
+            {"q": city.lower()},
+            {"q": f"{city} {self.rng.choice(ROAD_WORDS)}".lower()},
+            {"state": state, "zoom": self.rng.choice([6, 9, 12])},
+        ])
+        return "/api/v1/projects/search", {**params, "limit": 100}
+
+    def detail(self):
+        if self.rng.random() < HOT_DETAIL_SHARE:
+            project_id = self.rng.choices(self.project_ids, cum_weights=self.hot_weights)[0]
+        else:
+            project_id = self.rng.choice(self.project_ids)
+        return f"/api/v1/projects/{project_id}", {}
+
+    def list_offset(self):
+        # The last tenth of the listing, where OFFSET costs the most
+        page = self.rng.randint(max(1, self.deep_pages * 9 // 10), self.deep_pages)
+        return "/api/v1/projects/", {"page": page, "page_size": self.page_size}
+
+    def list_cursor(self, cursor=None):
+        params = {"page_size": self.page_size}
+        params.update({"cursor": cursor} if cursor else {"paginate": "cursor"})
+        return "/api/v1/projects/", params
+
+    def clusters(self):
+        # Viewports of a 1600x900 map: the whole country, a state, a city
+        _, _, _, lon, lat = self.place()
+        zoom = self.rng.choice([4, 5, 7, 10])
+        half_width, half_height = 800 * 360 / (256 * 2 ** zoom), 450 * 180 / (256 * 2 ** zoom)
+        params = {
+            "zoom": zoom,
+            "min_lon": max(-180, lon - half_width), "min_lat": max(-85, lat - half_height),
+            "max_lon": min(180, lon + half_width), "max_lat": min(85, lat + half_height),
+        }
+        if self.rng.random() < 0.3:
+            params["status"] = self.rng.choice(["active", "delayed", "completed"])
+        return "/api/v1/projects/clusters", params
+
+    def stats(self):
+        district, _, state, _, _ = self.place()
+        return self.rng.choice([
+            ("/api/v1/stats/", {}),
+            (f"/api/v1/stats/states/{quote(state)}", {}),
+            (f"/api/v1/stats/states/{quote(state)}/districts/{quote(district)}", {}),
+            ("/api/v1/stats/monthly", {"state": state}),
+        ])
+
+
+async def worker(client, workload, scenario, deadline, record_from, latencies, errors, cursor_pages) -> None:
+    cursor, walked = None, 0
+    while time.perf_counter() < deadline:
+        if scenario == "list_cursor":
+            path, params = workload.list_cursor(cursor)
+        else:
+            path, params = getattr(workload, scenario)()
+
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            await response.aread()
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            response, failed = None, True
+        elapsed = time.perf_counter() - started
+
+        if started >= record_from:
+            latencies.append(elapsed * 1000)
+            errors[0] += failed
+
+        if scenario == "list_cursor":
+            walked += 1
+            cursor = None
+            if response is not None and not failed and walked < cursor_pages:
+                cursor = response.json().get("next_cursor")
+            if cursor is None:
+                walked = 0
+
+
+async def run_scenario(args, workload, scenario) -> dict:
+    latencies, errors = [], [0]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        started = time.perf_counter()
+        record_from = started + args.warmup
+        deadline = record_from + args.duration
+        await asyncio.gather(*(
+            worker(client, workload, scenario, deadline, record_from, latencies, errors, args.cursor_pages)
+            for _ in range(args.concurrency)
+        ))
+
+    if len(latencies) < 2:
+        return {"requests": len(latencies), "errors": errors[0], "p50": None, "p95": None, "p99": None, "rps": 0.0}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "p50": round(statistics.median(latencies), 2),
+        "p95": round(cuts[94], 2),
+        "p99": round(cuts[98], 2),
+        "rps": round(len(latencies) / args.duration, 1),
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> dict:
+    """scenario -> reasons it is worse than the baseline by more than tolerance"""
+    found = {}
+    for scenario, result in results.items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if not before or result["p50"] is None:
+            continue
+        reasons = [
+            f"{metric} {before[metric]:.1f} -> {result[metric]:.1f}ms"
+            for metric in ("p50", "p95", "p99")
+            if before.get(metric) and result[metric] > before[metric] * (1 + tolerance)
+        ]
+        if before.get("rps") and result["rps"] < before["rps"] * (1 - tolerance):
+            reasons.append(f"rps {before['rps']:.1f} -> {result['rps']:.1f}")
+        if result["errors"] > before.get("errors", 0):
+            reasons.append(f"errors {before.get('errors', 0)} -> {result['errors']}")
+        if reasons:
+            found[scenario] = reasons
+    return found
+
+
+def print_table(results: dict, baseline: dict) -> None:
+    print(f"\n{'scenario':<12} {'requests':>9} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>8} {'vs base p95':>12}")
+    for scenario, result in results.items():
+        before = baseline.get("scenarios", {}).get(scenario, {}) if baseline else {}
+        change = ""
+        if before.get("p95") and result["p95"] is not None:
+            change = f"{(result['p95'] / before['p95'] - 1) * 100:+.0f}%"
+        latency = [f"{result[m]:>7.1f}ms" if result[m] is not None else f"{'-':>9}" for m in ("p50", "p95", "p99")]
+        print(
+            f"{scenario:<12} {result['requests']:>9} {result['errors']:>7} {' '.join(latency)} "
+            f"{result['rps']:>8.1f} {change:>12}"
+        )
+
+
+async def run(args) -> dict:
+    workload = Workload(args)
+    results = {}
+    for scenario in args.scenarios:
+        print(f"{scenario}: {args.concurrency} clients, {args.warmup:g}s warmup + {args.duration:g}s", flush=True)
+        results[scenario] = await run_scenario(args, workload, scenario)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds per scenario")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--cursor-pages", type=int, default=200, help="Pages per cursor walk before restarting")
+    parser.add_argument("--projects", type=int, default=500_000, help="As passed to generate_dataset.py")
+    parser.add_argument("--district-skew", type=float, default=1.0, help="As passed to generate_dataset.py")
+    parser.add_argument("--seed", type=int, default=42, help="As passed to generate_dataset.py")
+    parser.add_argument("--baseline", type=Path, help="Compare with this saved run")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown")
+    parser.add_argument("--save-baseline", type=Path, help="Write this run's results here")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    results = asyncio.run(run(args))
+    print_table(results, baseline)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps({
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "projects": args.projects,
+            "scenarios": results,
+        }, indent=2) + "\n")
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if baseline:
+        if baseline.get("concurrency") != args.concurrency:
+            print(f"\nNote: baseline was recorded at concurrency {baseline.get('concurrency')}")
+        found = regressions(results, baseline, args.tolerance)
+        for scenario, reasons in found.items():
+            print(f"REGRESSION {scenario}: {'; '.join(reasons)}")
+        if found:
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
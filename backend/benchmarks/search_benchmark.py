@@ -0,0 +1,164 @@
+"""
+Compare project search latency: leading-wildcard ILIKE vs full-text + trigram.
+
+Builds a throwaway ``bench_projects`` table shaped like ``projects`` (same
+generated search columns and indexes as alembic revision 0002), fills it
+with synthetic rows and times both query shapes with EXPLAIN ANALYZE.
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/search_benchmark.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, text
+
+PLACES = [
+    ("Visakhapatnam", "Visakhapatnam", "Andhra Pradesh"),
+    ("Thiruvananthapuram", "Thiruvananthapuram", "Kerala"),
+    ("Bengaluru Urban", "Bengaluru", "Karnataka"),
+    ("Pune", "Pimpri-Chinchwad", "Maharashtra"),
+    ("Nagpur", "Nagpur", "Maharashtra"),
+    ("Lucknow", "Lucknow", "Uttar Pradesh"),
+    ("Varanasi", "Varanasi", "Uttar Pradesh"),
+    ("Kamrup Metropolitan", "Guwahati", "Assam"),
+    ("Ernakulam", "Kochi", "Kerala"),
+    ("Tiruchirappalli", "Tiruchirappalli", "Tamil Nadu"),
+    ("Jaipur", "Jaipur", "Rajasthan"),
+    ("Ahmedabad", "Ahmedabad", "Gujarat"),
+    ("Bhubaneswar", "Khordha", "Odisha"),
+    ("Patna", "Patna", "Bihar"),
+    ("Ludhiana", "Ludhiana", "Punjab"),
+]
+ROAD_WORDS = ["Ring Road", "Bypass", "Highway", "Link Road", "Flyover", "Main Road", "Expressway", "Marg"]
+
+# (query, description) - the second half are typos and transliteration variants
+QUERIES = [
+    ("nagpur", "exact district"),
+    ("ring road", "common words"),
+    ("kochi bypass", "multi-word"),
+    ("4110", "pincode prefix"),
+    ("vishakhapatnam", "transliteration variant"),
+    ("ahmadabad", "transliteration variant"),
+    ("benguluru", "typo"),
+    ("tiruchirapalli", "dropped letter"),
+]
+
+SEARCH_SOURCE = (
+    "coalesce(name, '') || ' ' || coalesce(district, '') || ' ' || "
+    "coalesce(city, '') || ' ' || coalesce(state, '') || ' ' || coalesce(pincode, '')"
+)
+
+ILIKE_QUERY = """
+    SELECT id FROM bench_projects
+    WHERE name ILIKE :pattern OR district ILIKE :pattern OR city ILIKE :pattern OR pincode ILIKE :pattern
+    LIMIT 100
+"""
+
+RANKED_QUERY = """
+    SELECT id FROM bench_projects
+    WHERE search_document @@ websearch_to_tsquery('simple'::regconfig, :term)
+       OR search_text %> :term
+       OR pincode LIKE :prefix
+    ORDER BY ts_rank_cd(search_document, websearch_to_tsquery('simple'::regconfig, :term))
+             + 0.5 * word_similarity(:term, search_text) DESC, id
+    LIMIT 100
+"""
+
+
+def setup(conn, rows: int) -> None:
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text("DROP TABLE IF EXISTS bench_projects"))
+    conn.execute(text(f"""
+        CREATE TABLE bench_projects (
+            id serial PRIMARY KEY,
+            name varchar(255) NOT NULL,
+            district varchar(100) NOT NULL,
+            city varchar(100),
+            state varchar(100) NOT NULL,
+            pincode varchar(10),
+            search_document tsvector GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {SEARCH_SOURCE})) STORED,
+            search_text text GENERATED ALWAYS AS (lower({SEARCH_SOURCE})) STORED
+        )
+    """))
+
+    random.seed(42)
+    batch = []
+    for i in range(rows):
+        district, city, state = random.choice(PLACES)
+        batch.append({
+            "name": f"{city} {random.choice(ROAD_WORDS)} Phase {i % 7 + 1}",
+            "district": district,
+            "city": city,
+            "state": state,
+            "pincode": str(random.randint(110001, 855999)),
+        })
+        if len(batch) == 5000:
+            conn.execute(text(
+                "INSERT INTO bench_projects (name, district, city, state, pincode) "
+                "VALUES (:name, :district, :city, :state, :pincode)"
+            ), batch)
+            batch = []
+    if batch:
+        conn.execute(text(
+            "INSERT INTO bench_projects (name, district, city, state, pincode) "
+            "VALUES (:name, :district, :city, :state, :pincode)"
+        ), batch)
+
+    conn.execute(text("CREATE INDEX ON bench_projects USING GIN (search_document)"))
+    conn.execute(text("CREATE INDEX ON bench_projects USING GIN (search_text gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX ON bench_projects (pincode text_pattern_ops)"))
+    conn.execute(text("ANALYZE bench_projects"))
+
+
+def time_query(conn, sql: str, params: dict, repeat: int) -> list:
+    """Server-side execution times in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()
+        timings.append(plan[0]["Execution Time"])
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Keep bench_projects afterwards")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    engine = create_engine(args.database_url)
+    with engine.begin() as conn:
+        started = time.perf_counter()
+        setup(conn, args.rows)
+        print(f"Loaded {args.rows} rows in {time.perf_counter() - started:.1f}s\n")
+
+    print(f"{'query':<18} {'kind':<24} {'ilike p50':>10} {'ranked p50':>11} {'speedup':>8} {'ilike n':>8} {'ranked n':>9}")
+    with engine.connect() as conn:
+        for term, kind in QUERIES:
+            ilike = time_query(conn, ILIKE_QUERY, {"pattern": f"%{term}%"}, args.repeat)
+            ranked = time_query(conn, RANKED_QUERY, {"term": term, "prefix": f"{term}%"}, args.repeat)
+            ilike_hits = len(conn.execute(text(ILIKE_QUERY), {"pattern": f"%{term}%"}).all())
+            ranked_hits = len(conn.execute(text(RANKED_QUERY), {"term": term, "prefix": f"{term}%"}).all())
+
+            ilike_p50 = statistics.median(ilike)
+            ranked_p50 = statistics.median(ranked)
+            print(
+                f"{term:<18} {kind:<24} {ilike_p50:>8.2f}ms {ranked_p50:>9.2f}ms "
+                f"{ilike_p50 / ranked_p50:>7.1f}x {ilike_hits:>8} {ranked_hits:>9}"
+            )
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS bench_projects"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Compare response serialization for project detail and search, before and after
+caching encoded bytes and encoding with orjson.
+
+No database needed: builds synthetic payloads shaped like real responses and
+times only the work FastAPI does between the handler returning and bytes
+reaching the server.
+
+  before, cache hit   cached dict -> response_model validation -> stdlib json
+  after,  cache hit   cached bytes sent as-is
+  before, fresh       model -> response_model validation -> stdlib json
+  after,  fresh       model -> orjson (bytes then cached)
+
+Usage:
+    python benchmarks/serialization_benchmark.py --segments 40 --points 200 --features 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.core.responses import EncodedJSONResponse, ORJSONResponse, dumps, encode_model  # noqa: E402
+from app.schemas.project import ProjectDetailResponse, ProjectSearchResult  # noqa: E402
+
+
+def linestring(points: int) -> dict:
+    lon, lat = random.uniform(72, 88), random.uniform(10, 30)
+    coordinates = []
+    for _ in range(points):
+        lon += random.uniform(-0.001, 0.001)
+        lat += random.uniform(-0.001, 0.001)
+        coordinates.append([round(lon, 6), round(lat, 6)])
+    return {"type": "LineString", "coordinates": coordinates}
+
+
+def detail_payload(segments: int, points: int) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": 1,
+        "name": "Nagpur Ring Road Phase 3",
+        "slug": "nagpur-ring-road-phase-3",
+        "description": "Four-lane widening with service roads and drainage. " * 4,
+        "status": "active",
+        "road_type": "state_highway",
+        "district": "Nagpur",
+        "city": "Nagpur",
+        "state": "Maharashtra",
+        "pincode": "440001",
+        "sanctioned_cost": Decimal("1250000000.50"),
+        "total_disbursed": Decimal("730000000.00"),
+        "approval_date": date(2024, 4, 1),
+        "start_date": date(2024, 6, 15),
+        "proposed_end_date": date(2026, 3, 31),
+        "actual_end_date": None,
+        "minister": {"id": 3, "name": "A. Minister", "party": "Party", "portfolio": "Public Works"},
+        "approving_official": {"id": 7, "name": "B. Official", "designation": "Chief Engineer", "department": "PWD"},
+        "contractor": {
+            "id": 11, "name": "Example Infra Ltd", "registration_id": "REG-0011",
+            "type": "contractor", "performance_rating": 3.8, "is_blacklisted": False, "created_at": now,
+        },
+        "maintenance_firm": None,
+        "created_at": now,
+        "updated_at": now,
+        "road_segments": [
+            {
+                "id": i, "segment_name": f"Segment {i}", "length_km": 3,
+                "start_point": "Km 0", "end_point": "Km 3", "geometry": linestring(points),
+            }
+            for i in range(segments)
+        ],
+        "reports_count": 42,
+        "disbursements_count": 12,
+        "documents_count": 5,
+    }
+
+
+def search_payload(features: int, points: int) -> dict:
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": i,
+                "geometry": linestring(points),
+                "properties": {
+                    "project_id": i, "project_name": f"Project {i}", "status": "active",
+                    "road_type": "district_road", "district": "Pune", "city": "Pune",
+                    "contractor": "Example Infra Ltd", "sanctioned_cost": 12500000.5, "segment_name": None,
+                },
+            }
+            for i in range(features)
+        ],
+    }
+
+
+async def stdlib_path(field, content) -> bytes:
+    """What FastAPI did before: validate against response_model, then json.dumps"""
+    encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(encoded).body
+
+
+async def orjson_path(field, content) -> bytes:
+    encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return ORJSONResponse(encoded).body
+
+
+def timed(run, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, before: list, after: list, size: int) -> None:
+    before_p50, after_p50 = statistics.median(before), statistics.median(after)
+    print(f"{name:<24} {before_p50:>9.3f}ms {after_p50:>9.3f}ms {before_p50 / after_p50:>8.1f}x {size / 1024:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=40, help="Road segments in the project detail")
+    parser.add_argument("--features", type=int, default=2000, help="Features in the search response")
+    parser.add_argument("--points", type=int, default=200, help="Vertices per linestring")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(42)
+    loop = asyncio.new_event_loop()
+
+    detail_field = create_response_field(name="Response_detail", type_=ProjectDetailResponse)
+    detail = ProjectDetailResponse(**detail_payload(args.segments, args.points))
+    cached_dict = detail.model_dump()  # What the cache used to hold
+    cached_bytes = encode_model(detail)  # What it holds now
+
+    search_field = create_response_field(name="Response_search", type_=ProjectSearchResult)
+    search = search_payload(args.features, args.points)
+    search_bytes = dumps(search)
+
+    # Both encoders must agree on the document, Decimal and datetimes included
+    assert json.loads(cached_bytes)["sanctioned_cost"] == 1250000000.5
+    assert json.loads(cached_bytes)["created_at"] == cached_dict["created_at"].isoformat()
+
+    print(f"{'case':<24} {'before p50':>11} {'after p50':>11} {'speedup':>9} {'size KiB':>9}")
+    report(
+        "detail, cache hit",
+        timed(lambda: loop.run_until_complete(stdlib_path(detail_field, cached_dict)), args.repeat),
+        timed(lambda: EncodedJSONResponse(cached_bytes), args.repeat),
+        len(cached_bytes)
+    )
+    report(
+        "detail, fresh",
+        timed(lambda: loop.run_until_complete(stdlib_path(detail_field, detail)), args.repeat),
+        timed(lambda: encode_model(detail), args.repeat),
+        len(cached_bytes)
+    )
+    report(
+        "search, cache hit",
+        timed(lambda: loop.run_until_complete(stdlib_path(search_field, search)), args.repeat),
+        timed(lambda: EncodedJSONResponse(search_bytes), args.repeat),
+        len(search_bytes)
+    )
+    report(
+        "search, fresh",
+        timed(lambda: loop.run_until_complete(stdlib_path(search_field, search)), args.repeat),
+        timed(lambda: loop.run_until_complete(orjson_path(search_field, search)), args.repeat),
+        len(search_bytes)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("app.utils.bulk_import", exc_type=ImportError)
+
+from app.models import ProjectStatus, RoadType
+from app.utils.bulk_import import REQUIRED_COLUMNS, validate_row
+
+ROAD_TYPE = next(iter(RoadType))
+
+
+def valid_row(**overrides):
+    row = {
+        "name": "Ring Road Phase 2",
+        "district": "Pune",
+        "state": "Maharashtra",
+        "status": ProjectStatus.ACTIVE.value,
+        # Human-typed form, e.g. "National Highway"
+        "road_type": ROAD_TYPE.value.replace("_", " ").title(),
+        "sanctioned_cost": "1,25,000.50",
+        "contractor_registration_id": " REG-001 ",
+        "approving_official_id": "7",
+        "minister_id": "3.0",
+        "pincode": "411001",
+        "approval_date": "15/01/2024",
+        "start_date": "2024-02-01",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_valid_row_is_cleaned_into_staging_values():
+    clean, errors = validate_row(valid_row())
+
+    assert errors == []
+    assert clean["status"] == ProjectStatus.ACTIVE.name  # Enums are stored by name
+    assert clean["road_type"] == ROAD_TYPE.name
+    assert clean["sanctioned_cost"] == Decimal("125000.50")
+    assert clean["contractor_registration_id"] == "REG-001"
+    assert clean["contractor_type"] == "contractor"
+    assert clean["approving_official_id"] == 7
+    assert clean["minister_id"] == 3
+    assert clean["approval_date"] == date(2024, 1, 15)
+    assert clean["start_date"] == date(2024, 2, 1)
+    assert clean["proposed_end_date"] is None
+    assert clean["slug"] == "ring-road-phase-2-pune"
+
+
+def test_every_missing_required_column_is_reported():
+    _, errors = validate_row({})
+
+    assert errors == [f"{name} is required" for name in REQUIRED_COLUMNS]
+
+
+def test_blank_cells_count_as_missing():
+    _, errors = validate_row(valid_row(name="   ", district=None))
+
+    assert "name is required" in errors
+    assert "district is required" in errors
+
+
+@pytest.mark.parametrize("overrides, error", [
+    ({"status": "paused"}, "status must be one of"),
+    ({"road_type": "dirt track"}, "road_type must be one of"),
+    ({"sanctioned_cost": "-5"}, "sanctioned_cost must be a non-negative number"),
+    ({"sanctioned_cost": "lots"}, "sanctioned_cost must be a non-negative number"),
+    ({"pincode": "4110"}, "pincode must be 6 digits"),
+    ({"pincode": "41100A"}, "pincode must be 6 digits"),
+    ({"approving_official_id": "seven"}, "approving_official_id must be an integer"),
+    ({"minister_id": "n/a"}, "minister_id must be an integer"),
+    ({"start_date": "31/31/2024"}, "start_date: unrecognised date"),
+])
+def test_invalid_values_are_reported(overrides, error):
+    _, errors = validate_row(valid_row(**overrides))
+
+    assert len(errors) == 1
+    assert errors[0].startswith(error)
+
+
+def test_all_problems_in_a_row_are_collected():
+    _, errors = validate_row(valid_row(status="paused", pincode="1", sanctioned_cost="-1"))
+
+    assert len(errors) == 3
+
+
+@pytest.mark.parametrize("value", ["2024-01-15", "15/01/2024", "15-01-2024", "15.01.2024", date(2024, 1, 15)])
+def test_accepted_date_formats(value):
+    clean, errors = validate_row(valid_row(approval_date=value))
+
+    assert errors == []
+    assert clean["approval_date"] == date(2024, 1, 15)
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("app.core.clusters", exc_type=ImportError)
+
+from app.core.clusters import (
+    CELL_ZOOM_OFFSET,
+    cell_bounds,
+    cell_range,
+    cells_per_side,
+    fold_cells,
+    from_mercator,
+    to_mercator,
+)
+
+
+def test_cells_are_tiles_cell_zoom_offset_levels_deeper():
+    assert cells_per_side(0) == 2 ** CELL_ZOOM_OFFSET
+    assert cells_per_side(3) == 2 ** (3 + CELL_ZOOM_OFFSET)
+
+
+@pytest.mark.parametrize("lon, lat", [(0, 0), (77.2, 28.6), (-122.4, 37.8), (151.2, -33.9)])
+def test_mercator_round_trip(lon, lat):
+    assert from_mercator(*to_mercator(lon, lat)) == pytest.approx((lon, lat))
+
+
+def test_world_bounds_cover_every_cell():
+    last = cells_per_side(2) - 1
+
+    assert cell_range(2, (-180, -90, 180, 90)) == (0, last, 0, last)
+
+
+def test_cell_range_contains_the_cell_of_each_corner():
+    zoom = 6
+    min_x, max_x, min_y, max_y = cell_range(zoom, (72.8, 18.9, 73.0, 19.1))
+    west, south, east, north = cell_bounds(zoom, min_x, max_y)
+
+    assert west <= 72.8 < east and south <= 18.9 < north
+    assert min_x <= max_x and min_y <= max_y
+
+
+def test_cell_bounds_tile_the_map_without_gaps():
+    left = cell_bounds(5, 10, 7)
+    right = cell_bounds(5, 11, 7)
+    below = cell_bounds(5, 10, 8)
+
+    assert left[2] == pytest.approx(right[0])
+    assert left[1] == pytest.approx(below[3])
+
+
+def test_fold_cells_merges_statuses_into_one_cell():
+    rows = [
+        (1, 2, "active", 2, Decimal("10.5"), 146.0, 40.0),
+        (1, 2, "completed", 1, Decimal("4.5"), 73.5, 19.0),
+        (0, 0, "active", 1, Decimal("1"), 10.0, 50.0),
+    ]
+
+    busiest, quiet = fold_cells(3, rows)
+
+    assert busiest == {
+        "x": 1,
+        "y": 2,
+        "project_count": 3,
+        "sanctioned_cost": 15.0,
+        "by_status": {"active": 2, "completed": 1},
+        "longitude": pytest.approx(219.5 / 3),
+        "latitude": pytest.approx(59.0 / 3),
+        "bounds": cell_bounds(3, 1, 2),
+    }
+    assert (quiet["x"], quiet["y"], quiet["project_count"]) == (0, 0, 1)
+
+
+def test_fold_cells_orders_busiest_first():
+    rows = [(x, 0, "active", count, 0, 0.0, 0.0) for x, count in enumerate([1, 5, 3])]
+
+    assert [cell["project_count"] for cell in fold_cells(4, rows)] == [5, 3, 1]
+
+
+def test_fold_cells_of_nothing_is_empty():
+    assert fold_cells(4, []) == []
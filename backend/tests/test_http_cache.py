@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("app.core.http_cache", exc_type=ImportError)
+
+from starlette.requests import Request
+
+from app.core.http_cache import (
+    AFTER_WRITE_POLICY,
+    CACHE_POLICIES,
+    apply_http_caching,
+    cache_control_for,
+    cached_body_response,
+    if_none_match,
+    versioned,
+)
+from app.database import LAST_WRITE_COOKIE
+
+
+def make_request(path, method="GET", headers=()):
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+    })
+
+
+def policy_of(prefix):
+    return dict(CACHE_POLICIES)[prefix]
+
+
+@pytest.mark.parametrize("path, prefix", [
+    ("/api/v1/admin/projects", "/api/v1/admin"),
+    ("/api/v1/reports/submissions/5b7e", "/api/v1/reports/submissions"),
+    ("/api/v1/reports/12", "/api/v1/reports"),
+    ("/api/v1/projects/search", "/api/v1/projects/search"),
+    ("/api/v1/projects/42", "/api/v1/projects"),
+    ("/api/v1/tiles/5/10/12.mvt", "/api/v1/tiles"),
+    ("/api/v1/contractors/3", "/api/v1/"),
+])
+def test_longest_matching_prefix_decides_the_policy(path, prefix):
+    assert cache_control_for(make_request(path)) == policy_of(prefix)
+
+
+def test_no_prefix_is_shadowed_by_an_earlier_shorter_one():
+    prefixes = [prefix for prefix, _ in CACHE_POLICIES]
+    for i, prefix in enumerate(prefixes):
+        assert not any(prefix.startswith(earlier) for earlier in prefixes[:i]), prefix
+
+
+def test_submission_status_is_never_stored():
+    assert "no-store" in cache_control_for(make_request("/api/v1/reports/submissions/5b7e"))
+
+
+def test_writes_and_unknown_paths_get_no_policy():
+    assert cache_control_for(make_request("/api/v1/projects/42", method="POST")) is None
+    assert cache_control_for(make_request("/health")) is None
+
+
+def test_recent_writers_bypass_shared_caches():
+    request = make_request("/api/v1/projects/42", headers=[("Cookie", f"{LAST_WRITE_COOKIE}=1700000000")])
+
+    assert cache_control_for(request) == AFTER_WRITE_POLICY
+
+
+@pytest.mark.parametrize("header, held", [
+    ('"abc"', '"abc"'),
+    ('"abc-br"', '"abc-br"'),
+    ('W/"abc-gzip"', 'W/"abc-gzip"'),
+    ('"old", "abc-gzip"', '"abc-gzip"'),
+    ("*", '"abc"'),
+    ('"other"', None),
+    (None, None),
+])
+def test_if_none_match_returns_the_tag_the_client_holds(header, held):
+    headers = [("If-None-Match", header)] if header else []
+
+    assert if_none_match(make_request("/api/v1/projects/42", headers=headers), '"abc"') == held
+
+
+def test_route_level_304_carries_the_cache_policy():
+    entry = versioned(b'{"id": 42}')
+    request = make_request("/api/v1/projects/42", headers=[("If-None-Match", entry[0])])
+
+    response = asyncio.run(apply_http_caching(request, cached_body_response(request, entry, "application/json")))
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == entry[0]
+    assert response.headers["cache-control"] == policy_of("/api/v1/projects")
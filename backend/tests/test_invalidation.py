@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("app.core.invalidation", exc_type=ImportError)
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.invalidation import (
+    ALL_FIRMS,
+    ALL_OFFICIALS,
+    ALL_PROJECTS,
+    ALL_REPORTS,
+    firm_tag,
+    official_tag,
+    project_tag,
+    region_tag,
+    tags_for,
+)
+from app.models import Firm, Official, Project, PublicReport, RoadSegment
+
+
+def loaded(obj):
+    """obj as if read from the database: attribute changes from here on have history"""
+    make_transient_to_detached(obj)
+    return obj
+
+
+def test_project_write_drops_its_detail_listings_and_district():
+    project = loaded(Project(id=1, district="Pune"))
+
+    assert tags_for(project) == {project_tag(1), ALL_PROJECTS, region_tag("Pune")}
+
+
+def test_project_moved_between_districts_drops_both():
+    project = loaded(Project(id=1, district="Pune"))
+    project.district = "Mumbai"
+
+    assert tags_for(project) == {project_tag(1), ALL_PROJECTS, region_tag("Pune"), region_tag("Mumbai")}
+
+
+def test_region_tags_ignore_case_and_spacing():
+    assert region_tag(" Pune ") == region_tag("pune")
+
+
+def test_segment_moved_between_projects_drops_both():
+    segment = loaded(RoadSegment(id=5, project_id=1))
+    segment.project_id = 2
+
+    assert tags_for(segment) == {ALL_PROJECTS, project_tag(1), project_tag(2)}
+
+
+def test_report_drops_report_listings_and_its_project():
+    assert tags_for(PublicReport(project_id=4)) == {ALL_REPORTS, project_tag(4)}
+
+
+def test_firm_rename_drops_project_payloads_embedding_the_name():
+    firm = loaded(Firm(id=3, name="Old Name Infra"))
+    firm.name = "New Name Infra"
+
+    assert tags_for(firm) == {firm_tag(3), ALL_FIRMS, ALL_PROJECTS}
+
+
+def test_firm_write_without_rename_keeps_project_payloads():
+    firm = loaded(Firm(id=3, name="Same Name Infra"))
+
+    assert tags_for(firm) == {firm_tag(3), ALL_FIRMS}
+
+
+def test_official_write():
+    assert tags_for(loaded(Official(id=8))) == {official_tag(8), ALL_OFFICIALS}
+
+
+def test_unrelated_objects_have_no_tags():
+    assert tags_for(object()) == set()
@@ -0,0 +1,83 @@
+import pytest
+
+login_throttle = pytest.importorskip("app.core.login_throttle", exc_type=ImportError)
+
+import redis
+
+from app.config import settings
+
+
+@pytest.fixture
+def client(fake_redis, monkeypatch):
+    monkeypatch.setattr(login_throttle, "get_redis", lambda: fake_redis)
+    return fake_redis
+
+
+def fail(email, ip, times):
+    for _ in range(times):
+        login_throttle.record_failure(email, ip)
+
+
+def test_allows_logins_under_the_account_limit(client):
+    fail("admin@example.com", "10.0.0.1", settings.LOGIN_MAX_FAILURES_PER_ACCOUNT - 1)
+
+    assert login_throttle.retry_after("admin@example.com", "10.0.0.1") is None
+
+
+def test_throttles_an_account_for_the_rest_of_the_window(client):
+    fail("admin@example.com", "10.0.0.1", settings.LOGIN_MAX_FAILURES_PER_ACCOUNT)
+    client.now += 100
+
+    wait = login_throttle.retry_after("admin@example.com", "10.0.0.2")
+
+    assert wait == settings.LOGIN_THROTTLE_WINDOW - 100
+
+
+def test_window_starts_at_the_first_failure(client):
+    login_throttle.record_failure("admin@example.com", "10.0.0.1")
+    client.now += settings.LOGIN_THROTTLE_WINDOW - 1
+    fail("admin@example.com", "10.0.0.1", settings.LOGIN_MAX_FAILURES_PER_ACCOUNT - 1)
+    assert login_throttle.retry_after("admin@example.com", "10.0.0.1") == 1
+
+    client.now += 1
+
+    assert login_throttle.retry_after("admin@example.com", "10.0.0.1") is None
+
+
+def test_accounts_are_matched_case_and_space_insensitively(client):
+    fail(" Admin@Example.com ", "10.0.0.1", settings.LOGIN_MAX_FAILURES_PER_ACCOUNT)
+
+    assert login_throttle.retry_after("admin@example.com", "10.0.0.9") is not None
+
+
+def test_throttles_an_ip_spraying_many_accounts(client):
+    for n in range(settings.LOGIN_MAX_FAILURES_PER_IP):
+        login_throttle.record_failure(f"user{n}@example.com", "10.0.0.1")
+
+    assert login_throttle.retry_after("someone-else@example.com", "10.0.0.1") is not None
+    assert login_throttle.retry_after("someone-else@example.com", "10.0.0.2") is None
+
+
+def test_success_clears_the_account_but_not_the_ip(client):
+    fail("admin@example.com", "10.0.0.1", settings.LOGIN_MAX_FAILURES_PER_ACCOUNT)
+
+    login_throttle.clear_failures("admin@example.com")
+
+    assert login_throttle.retry_after("admin@example.com", "10.0.0.1") is None
+    assert client.get(login_throttle._ip_key("10.0.0.1")) == str(settings.LOGIN_MAX_FAILURES_PER_ACCOUNT).encode()
+
+
+def test_redis_keys_never_hold_the_attempted_address(client):
+    login_throttle.record_failure("admin@example.com", "10.0.0.1")
+
+    assert not any("admin" in key or "10.0.0.1" in key for key in client.values)
+
+
+def test_fails_open_when_redis_is_down(monkeypatch):
+    def unavailable():
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(login_throttle, "get_redis", unavailable)
+
+    login_throttle.record_failure("admin@example.com", "10.0.0.1")
+    assert login_throttle.retry_after("admin@example.com", "10.0.0.1") is None
@@ -0,0 +1,20 @@
+import pytest
+
+sa = pytest.importorskip("sqlalchemy")
+pagination = pytest.importorskip("app.core.pagination", exc_type=ImportError)
+
+from sqlalchemy.dialects import postgresql
+
+
+projects = sa.table("projects", sa.column("id"), sa.column("search_text"))
+
+
+def test_explain_keeps_search_terms_as_bind_parameters():
+    term = "%pune :north%"
+    stmt = sa.select(projects.c.id).where(projects.c.search_text.ilike(term))
+
+    compiled = pagination.Explain(stmt).compile(dialect=postgresql.psycopg2.dialect())
+
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "north" not in str(compiled)
+    assert term in compiled.params.values()
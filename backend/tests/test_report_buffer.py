@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+report_buffer = pytest.importorskip("app.core.report_buffer", exc_type=ImportError)
+
+import redis
+
+from app.core.report_buffer import UPVOTE_SCRIPT, UnknownReport, record_upvote, voter_ids
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+def test_voter_ids_are_stable_and_opaque():
+    ip_voter, device_voter = voter_ids("203.0.113.7", "device-1")
+
+    assert (ip_voter, device_voter) == voter_ids("203.0.113.7", "device-1")
+    assert "203.0.113.7" not in ip_voter and "device-1" not in device_voter
+
+
+def test_ip_identity_does_not_depend_on_the_device():
+    assert voter_ids("203.0.113.7", "device-1")[0] == voter_ids("203.0.113.7", "device-2")[0]
+    assert voter_ids("203.0.113.7", None)[0] == voter_ids("203.0.113.7", "device-1")[0]
+
+
+def test_ip_and_device_namespaces_never_collide():
+    ip_voter, device_voter = voter_ids("same-value", "same-value")
+
+    assert ip_voter != device_voter
+
+
+def test_missing_device_has_no_device_identity():
+    assert voter_ids("203.0.113.7", None)[1] is None
+    assert voter_ids("203.0.113.7", "")[1] is None
+
+
+def test_upvotes_for_unknown_reports_are_refused(monkeypatch):
+    monkeypatch.setattr(report_buffer, "report_exists", lambda report_id: False)
+
+    with pytest.raises(UnknownReport):
+        record_upvote(999999, "203.0.113.7", "device-1")
+
+
+@pytest.mark.skipif(not TEST_REDIS_URL, reason="needs TEST_REDIS_URL (a scratch Redis database)")
+def test_upvote_script_counts_a_vote_only_from_an_unseen_ip_and_device():
+    client = redis.Redis.from_url(TEST_REDIS_URL)
+    keys = ["test:upvoters:1:ip", "test:upvoters:1:device", "test:pending_upvotes"]
+    client.delete(*keys)
+    script = client.register_script(UPVOTE_SCRIPT)
+
+    def upvote(ip, device):
+        ip_voter, device_voter = voter_ids(ip, device)
+        return script(keys=keys, args=[ip_voter, device_voter or "", 1, 60]) != -1
+
+    try:
+        assert upvote("203.0.113.7", "device-1")
+        assert not upvote("203.0.113.7", "device-2")  # Fresh device ids don't reset the IP
+        assert not upvote("198.51.100.4", "device-1")  # Nor does moving the device to another IP
+        assert not upvote("203.0.113.7", None)
+        assert upvote("198.51.100.4", None)
+        assert upvote("192.0.2.9", "device-3")
+        assert int(client.hget(keys[2], 1)) == 3
+    finally:
+        client.delete(*keys)
@@ -0,0 +1,44 @@
+"""
+Migration 0010 fills firm_scorecards from a frozen SQL copy of
+app.core.scorecards._scorecard_source. Run against a migrated database
+with projects in it to check the two still agree.
+"""
+from decimal import Decimal
+from pathlib import Path
+import importlib.util
+import os
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+MIGRATION = Path(__file__).resolve().parent.parent / "alembic" / "versions" / "0010_firm_scorecards.py"
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="needs TEST_DATABASE_URL (a migrated PostGIS database)")
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("firm_scorecards_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def normalized(row):
+    return [float(value) if isinstance(value, Decimal) else value for value in row]
+
+
+def test_migration_fill_matches_scorecard_source():
+    from sqlalchemy import create_engine, text
+    from app.core.scorecards import _scorecard_source
+
+    engine = create_engine(TEST_DATABASE_URL)
+    try:
+        with engine.connect() as conn:
+            frozen = conn.execute(text(load_migration().SCORECARD_SELECT + " ORDER BY f.id")).all()
+            shared = conn.execute(_scorecard_source(())).all()
+    finally:
+        engine.dispose()
+
+    assert len(frozen) == len(shared)
+    for frozen_row, shared_row in zip(frozen, shared):
+        assert normalized(frozen_row) == pytest.approx(normalized(shared_row))